@@ -25,6 +25,18 @@ def _get_injector_solver(content):
     return _injector.resolve_bibliography(content)
 
 
+def _discard_untranslated(generators):
+    from .generator import PybtexGenerator
+
+    for generator in generators:
+        if isinstance(generator, PybtexGenerator):
+            _injector.discard_untranslated(generator)
+
+
+def _finalize(pelican_object):
+    return _injector.finalize(pelican_object.settings)
+
+
 def register():
     """Register this plugin to pelican."""
 
@@ -38,3 +50,9 @@ def register():
     # Per-content (articles, pages) biobliography injector
     signals.pybtex_generator_init.connect(_get_injector_init)
     pelican.plugins.signals.content_object_init.connect(_get_injector_solver)
+
+    # Drops cached bibliographies that will not be reused, once contents are read
+    pelican.plugins.signals.all_generators_finalized.connect(_discard_untranslated)
+
+    # Releases resources (e.g. SQLite connections) once the build is finished
+    pelican.plugins.signals.finalized.connect(_finalize)
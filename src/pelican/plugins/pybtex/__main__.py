@@ -0,0 +1,9 @@
+# SPDX-FileCopyrightText: Copyright © 2024 André Anjos <andre.dos.anjos@gmail.com>
+# SPDX-License-Identifier: MIT
+"""Allow running the command-line interface with ``python -m``."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,310 @@
+# SPDX-FileCopyrightText: Copyright © 2024 André Anjos <andre.dos.anjos@gmail.com>
+# SPDX-License-Identifier: MIT
+"""Command-line utilities for this plugin."""
+
+import argparse
+import contextlib
+import cProfile
+import io
+import logging
+import pathlib
+import pstats
+import time
+import tracemalloc
+import typing
+
+import pybtex.database
+
+from . import compiled, store, utils
+
+logger = logging.getLogger(__name__)
+
+
+def _compile(args: argparse.Namespace) -> int:
+    """Compile a bibliography database into binary format.
+
+    Parameters
+    ----------
+    args
+        Parsed command-line arguments.
+
+    Returns
+    -------
+        The program exit status.
+    """
+
+    source: pathlib.Path = args.source
+    output: pathlib.Path = args.output or source.with_suffix(compiled.SUFFIX)
+
+    if output.suffix != compiled.SUFFIX:
+        logger.error(f"Output file `{output}` must have suffix `{compiled.SUFFIX}`")
+        return 1
+
+    try:
+        bibdata = utils.load([str(source)], [pathlib.Path.cwd()])
+    except pybtex.database.PybtexError:
+        logger.exception(f"Cannot parse `{source}`")
+        return 1
+
+    if not bibdata:
+        return 1
+
+    compiled.dump(bibdata[0], output, source)
+    logger.info(
+        f"Compiled {len(bibdata[0].entries)} entries from `{source}` into `{output}`"
+    )
+    return 0
+
+
+def _import(args: argparse.Namespace) -> int:
+    """Import bibliography databases into a SQLite store.
+
+    Parameters
+    ----------
+    args
+        Parsed command-line arguments.
+
+    Returns
+    -------
+        The program exit status.
+    """
+
+    bibdata = utils.load([str(k) for k in args.sources], [pathlib.Path.cwd()])
+    if len(bibdata) != len(args.sources):
+        return 1
+
+    for source, database in zip(args.sources, bibdata):
+        changed = store.import_bibdata(args.output, database)
+        logger.info(
+            f"Imported {changed} new or modified entries (out of "
+            f"{len(database.entries)}) from `{source}` into `{args.output}`"
+        )
+
+    return 0
+
+
+@contextlib.contextmanager
+def _phase(name: str, args: argparse.Namespace) -> typing.Iterator[None]:
+    """Time, and optionally profile, a phase of the plugin pipeline.
+
+    Parameters
+    ----------
+    name
+        The name of the phase, for reporting.
+    args
+        Parsed command-line arguments, controlling if :py:mod:`cProfile` and/or
+        :py:mod:`tracemalloc` should be used.
+
+    Yields
+    ------
+        Nothing, the phase to be measured runs within the context.
+    """
+
+    profiler = cProfile.Profile() if args.cprofile else None
+    if args.tracemalloc:
+        tracemalloc.reset_peak()
+
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        elapsed = time.perf_counter() - start
+
+        message = f"Phase `{name}`: {elapsed:.3f} s"
+        if args.tracemalloc:
+            _, peak = tracemalloc.get_traced_memory()
+            message += f", peak memory {peak / 2**20:.1f} MiB"
+        logger.info(message)
+
+        if profiler is not None:
+            stream = io.StringIO()
+            stats = pstats.Stats(profiler, stream=stream)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(args.top)
+            logger.info(stream.getvalue().rstrip())
+
+
+def _profile(args: argparse.Namespace) -> int:
+    """Profile the plugin pipeline against a real site, without writing output.
+
+    Parameters
+    ----------
+    args
+        Parsed command-line arguments.
+
+    Returns
+    -------
+        The program exit status.
+    """
+
+    import pelican.contents
+    import pelican.settings
+
+    from .generator import PybtexGenerator
+    from .injector import PybtexInjector
+
+    settings = pelican.settings.read_settings(str(args.settings))
+    context = settings.copy()
+    context.update(
+        {
+            "generated_content": {},
+            "static_links": set(),
+            "static_content": {},
+            "localsiteurl": settings["SITEURL"],
+        }
+    )
+
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    try:
+        with _phase("load", args):
+            generator = PybtexGenerator(
+                context=context,
+                settings=settings,
+                path=settings["PATH"],
+                theme=settings["THEME"],
+                output_path=settings["OUTPUT_PATH"],
+            )
+
+        with _phase("context", args):
+            generator.generate_context()
+
+        # publications are formatted on demand, so formatting is forced here
+        with _phase("format", args):
+            for _ in generator.context.get("publications", []):
+                pass
+
+        injector = PybtexInjector()
+        injector.init(generator)
+
+        contents: list[pelican.contents.Content] = []
+        for paths, excludes, content_class in (
+            ("ARTICLE_PATHS", "ARTICLE_EXCLUDES", pelican.contents.Article),
+            ("PAGE_PATHS", "PAGE_EXCLUDES", pelican.contents.Page),
+        ):
+            for f in sorted(
+                generator.get_files(
+                    settings[paths],
+                    exclude=settings[excludes],
+                    extensions=generator.readers.extensions,
+                )
+            ):
+                contents.append(
+                    generator.readers.read_file(
+                        base_path=settings["PATH"],
+                        path=f,
+                        content_class=content_class,
+                        context=context,
+                    )
+                )
+
+        with _phase("inject", args):
+            for content in contents:
+                injector.resolve_bibliography(content)
+
+    finally:
+        if args.tracemalloc:
+            tracemalloc.stop()
+
+    logger.info(
+        f"Profiled {sum(len(k.entries) for k in generator.bibdata)} global entries "
+        f"and {len(contents)} content object(s)"
+    )
+
+    return 0
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    """Run the ``pelican-pybtex`` command-line interface.
+
+    Parameters
+    ----------
+    argv
+        Command-line arguments (excluding the program name).  If not set, use
+        :py:data:`sys.argv`.
+
+    Returns
+    -------
+        The program exit status.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="pelican-pybtex", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Increase output verbosity."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compile_parser = subparsers.add_parser(
+        "compile",
+        help="Compile a BibTeX file into a binary format that loads faster.",
+    )
+    compile_parser.add_argument(
+        "source", type=pathlib.Path, help="The BibTeX file to compile."
+    )
+    compile_parser.add_argument(
+        "-o",
+        "--output",
+        type=pathlib.Path,
+        help=f"The output file (defaults to the source with suffix {compiled.SUFFIX}).",
+    )
+    compile_parser.set_defaults(func=_compile)
+
+    import_parser = subparsers.add_parser(
+        "import",
+        help="Import (or update) BibTeX files into a SQLite store.",
+    )
+    import_parser.add_argument(
+        "sources", type=pathlib.Path, nargs="+", help="The BibTeX files to import."
+    )
+    import_parser.add_argument(
+        "-o",
+        "--output",
+        type=pathlib.Path,
+        required=True,
+        help="The SQLite store to create or update.",
+    )
+    import_parser.set_defaults(func=_import)
+
+    profile_parser = subparsers.add_parser(
+        "profile",
+        help="Profile the plugin pipeline on a site, without writing output.",
+    )
+    profile_parser.add_argument(
+        "-s",
+        "--settings",
+        type=pathlib.Path,
+        default=pathlib.Path("pelicanconf.py"),
+        help="The Pelican settings file of the site (defaults to %(default)s).",
+    )
+    profile_parser.add_argument(
+        "--cprofile",
+        action="store_true",
+        help="Report the top hot spots of each phase using cProfile.",
+    )
+    profile_parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="Report the peak memory usage of each phase using tracemalloc.",
+    )
+    profile_parser.add_argument(
+        "--top",
+        type=int,
+        default=20,
+        help="Number of hot spots to report per phase (defaults to %(default)s).",
+    )
+    profile_parser.set_defaults(func=_profile)
+
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO, format="%(message)s"
+    )
+
+    return args.func(args)
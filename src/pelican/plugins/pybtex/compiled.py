@@ -0,0 +1,443 @@
+# SPDX-FileCopyrightText: Copyright © 2024 André Anjos <andre.dos.anjos@gmail.com>
+# SPDX-License-Identifier: MIT
+"""Read and write pre-compiled (binary) bibliography databases.
+
+The compiled format is a compact, position-independent representation of a parsed
+:py:class:`pybtex.database.BibliographyData` object.  It is organised as follows
+(all integers are little-endian):
+
+* A fixed-size header (see :py:data:`_HEADER`), containing a magic number, the format
+  version, the SHA-256 digest of the original source, the size of the source path,
+  the number of strings in the string table, and the number of words in the record
+  section.
+* The UTF-8 encoded path of the original source, relative to the compiled file.  It
+  is stored right after the header, so the source can still be found (and parsed
+  instead) if the rest of the file is corrupted.
+* The string table offsets: ``n_strings + 1`` unsigned 32-bit integers, pointing
+  to the start and end of each string inside the string blob.
+* The record section: a sequence of unsigned 32-bit integers, encoding the preamble,
+  and then all entries with their fields and persons, all as indexes on the string
+  table.
+* The string blob: all unique UTF-8 encoded strings, concatenated.
+
+Loading a compiled file requires no text parsing: the file is memory-mapped and
+entries are rebuilt directly from the integer records.  All offsets and counts read
+from the file are checked against its size, so that truncated or corrupted files are
+reported with a :py:class:`CompiledFormatError`.
+"""
+
+import array
+import hashlib
+import logging
+import mmap
+import os
+import pathlib
+import struct
+import sys
+import typing
+
+import pybtex.database
+
+logger = logging.getLogger(__name__)
+
+SUFFIX = ".pybtexc"
+"""File name suffix for compiled bibliography databases."""
+
+_MAGIC = b"PYBTEXC\x00"
+_VERSION = 2
+
+# magic, version, source digest (sha256), source path size, number of strings, number
+# of words
+_HEADER = struct.Struct("<8sI32sIII")
+
+_NAME_PARTS = (
+    "first_names",
+    "middle_names",
+    "prelast_names",
+    "last_names",
+    "lineage_names",
+)
+
+
+class CompiledFormatError(pybtex.database.PybtexError):
+    """Raised when a file is not a valid compiled bibliography database.
+
+    Parameters
+    ----------
+    reason
+        A short description of the problem.
+    """
+
+    def __init__(self, reason: str):
+        super().__init__(f"invalid compiled bibliography database ({reason})")
+
+
+class _StringTable:
+    """Collect unique strings, and assign each an index."""
+
+    def __init__(self):
+        self.index: dict[str, int] = {}
+
+    def __call__(self, value: str) -> int:
+        if value not in self.index:
+            self.index[value] = len(self.index)
+        return self.index[value]
+
+
+def _to_little_endian(words: array.array) -> array.array:
+    """Make sure an array of words is represented in little-endian order.
+
+    Parameters
+    ----------
+    words
+        The array of words to convert.
+
+    Returns
+    -------
+        The (possibly byte-swapped) array.
+    """
+
+    if sys.byteorder != "little":
+        words = array.array(words.typecode, words)
+        words.byteswap()
+    return words
+
+
+def dump(
+    bibdata: pybtex.database.BibliographyData,
+    path: pathlib.Path,
+    source: pathlib.Path,
+) -> None:
+    """Write a bibliography database in compiled format.
+
+    Parameters
+    ----------
+    bibdata
+        The parsed bibliography database to write.
+    path
+        The path of the compiled file to write.
+    source
+        The path of the source file ``bibdata`` was parsed from.  A digest of its
+        contents is recorded so that stale compiled files can be detected.
+    """
+
+    strings = _StringTable()
+    words = array.array("I")
+
+    preamble = bibdata.preamble_list
+    words.append(len(preamble))
+    words.extend(strings(k) for k in preamble)
+
+    words.append(len(bibdata.entries))
+    for key, entry in bibdata.entries.items():
+        assert entry.fields is not None
+        assert entry.persons is not None
+        words.extend((strings(key), strings(entry.type), len(entry.fields)))
+        for name, value in entry.fields.items():
+            words.extend((strings(name), strings(value)))
+        words.append(len(entry.persons))
+        for role, persons in entry.persons.items():
+            words.extend((strings(role), len(persons)))
+            for person in persons:
+                for part in _NAME_PARTS:
+                    names = getattr(person, part)
+                    words.append(len(names))
+                    words.extend(strings(k) for k in names)
+
+    encoded = [k.encode("utf-8") for k in strings.index]
+    offsets = array.array("I", [0])
+    for k in encoded:
+        offsets.append(offsets[-1] + len(k))
+
+    relpath = os.path.relpath(source.resolve(), path.resolve().parent).encode("utf-8")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as f:
+        f.write(
+            _HEADER.pack(
+                _MAGIC,
+                _VERSION,
+                _digest(source),
+                len(relpath),
+                len(encoded),
+                len(words),
+            )
+        )
+        f.write(relpath)
+        f.write(_to_little_endian(offsets).tobytes())
+        f.write(_to_little_endian(words).tobytes())
+        f.write(b"".join(encoded))
+
+
+class _Records:
+    """Read the record section of a compiled file, checking its bounds.
+
+    Parameters
+    ----------
+    words
+        The words of the record section.
+    string
+        A function returning the string at a given index of the string table.
+    """
+
+    def __init__(self, words: array.array, string: typing.Callable[[int], str]):
+        self.words = words
+        self.string = string
+        self.position = 0
+
+    def take(self, count: int) -> array.array:
+        """Read the next ``count`` words."""
+
+        end = self.position + count
+        if end > len(self.words):
+            raise CompiledFormatError("truncated-records")
+        retval = self.words[self.position : end]
+        self.position = end
+        return retval
+
+    def count(self) -> int:
+        """Read the next word, a count of items."""
+
+        return self.take(1)[0]
+
+    def strings(self, count: int) -> list[str]:
+        """Read the next ``count`` words, as strings from the string table."""
+
+        return [self.string(k) for k in self.take(count)]
+
+
+def _digest(source: pathlib.Path) -> bytes:
+    """Compute the digest of the contents of a source file.
+
+    Parameters
+    ----------
+    source
+        The path of the source file.
+
+    Returns
+    -------
+        The SHA-256 digest of the file contents.
+    """
+
+    retval = hashlib.sha256()
+    with source.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            retval.update(chunk)
+    return retval.digest()
+
+
+def _read_header(buffer: bytes) -> tuple[bytes, int, int, int]:
+    """Validate and decode the header of a compiled file.
+
+    Parameters
+    ----------
+    buffer
+        The contents of the compiled file (at least its header).
+
+    Returns
+    -------
+        A tuple containing the source digest, the size of the source path, the number
+        of strings, and the number of record words.
+
+    Raises
+    ------
+    CompiledFormatError
+        In case the buffer is not a compiled bibliography database, or has an
+        unsupported version.
+    """
+
+    if len(buffer) < _HEADER.size:
+        raise CompiledFormatError("truncated")
+
+    magic, version, digest, n_source, n_strings, n_words = _HEADER.unpack_from(buffer)
+    if magic != _MAGIC:
+        raise CompiledFormatError("bad-magic")
+    if version != _VERSION:
+        raise CompiledFormatError(f"version-{version}")
+    return digest, n_source, n_strings, n_words
+
+
+def _words(buffer: mmap.mmap, offset: int, count: int) -> array.array:
+    """Read ``count`` unsigned 32-bit integers at ``offset``.
+
+    Integers are copied out of the memory map, so no views on it outlive a (possibly
+    failed) load.
+
+    Parameters
+    ----------
+    buffer
+        The memory-mapped compiled file.
+    offset
+        The byte offset where the integers start.
+    count
+        The number of integers to read.
+
+    Returns
+    -------
+        An array of integers.
+    """
+
+    words = array.array("I")
+    words.frombytes(buffer[offset : offset + 4 * count])
+    if sys.byteorder != "little":
+        words.byteswap()
+    return words
+
+
+def _read_source(path: pathlib.Path) -> tuple[pathlib.Path, bytes]:
+    """Read the path and digest of the source of a compiled file.
+
+    Parameters
+    ----------
+    path
+        The path of the compiled file.
+
+    Returns
+    -------
+        The path to the original source file (that may no longer exist), and the
+        digest of its contents at compilation time.
+
+    Raises
+    ------
+    CompiledFormatError
+        In case the file is not a valid compiled bibliography database.
+    """
+
+    with path.open("rb") as f:
+        digest, n_source, _, _ = _read_header(f.read(_HEADER.size))
+        encoded = f.read(n_source)
+
+    if len(encoded) < n_source:
+        raise CompiledFormatError("truncated")
+    try:
+        name = encoded.decode("utf-8")
+    except UnicodeDecodeError as e:
+        raise CompiledFormatError("bad-string") from e
+
+    return path.parent / name, digest
+
+
+def source(path: pathlib.Path) -> pathlib.Path:
+    """Read the path of the source a compiled file was created from.
+
+    Parameters
+    ----------
+    path
+        The path of the compiled file.
+
+    Returns
+    -------
+        The path to the original source file.  It may no longer exist.
+
+    Raises
+    ------
+    CompiledFormatError
+        In case the file is not a valid compiled bibliography database.
+    """
+
+    return _read_source(path)[0]
+
+
+def stale_source(path: pathlib.Path) -> typing.Optional[pathlib.Path]:
+    """Check if the source of a compiled file changed since it was compiled.
+
+    Sources are compared by contents, so that touching (or checking out) a source
+    does not make its compiled file stale.
+
+    Parameters
+    ----------
+    path
+        The path of the compiled file.
+
+    Returns
+    -------
+        The path to the original source file, if it still exists and its contents
+        changed after compilation.  ``None`` otherwise.
+
+    Raises
+    ------
+    CompiledFormatError
+        In case the file is not a valid compiled bibliography database.
+    """
+
+    source, digest = _read_source(path)
+
+    if not source.is_file():
+        return None
+
+    if _digest(source) != digest:
+        return source
+
+    return None
+
+
+def load(path: pathlib.Path) -> pybtex.database.BibliographyData:
+    """Load a compiled bibliography database.
+
+    Parameters
+    ----------
+    path
+        The path of the compiled file to load.
+
+    Returns
+    -------
+        The bibliography database.
+
+    Raises
+    ------
+    CompiledFormatError
+        In case the file is not a valid compiled bibliography database, for example
+        if it was truncated.
+    """
+
+    with path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        _, n_source, n_strings, n_words = _read_header(f.read(_HEADER.size))
+        start = _HEADER.size + n_source
+        blob = start + 4 * (n_strings + 1 + n_words)
+        if blob > size:
+            raise CompiledFormatError("truncated")
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            offsets = _words(buffer, start, n_strings + 1).tolist()
+            words = _words(buffer, start + 4 * (n_strings + 1), n_words)
+            if offsets[0] != 0 or offsets[-1] != size - blob:
+                raise CompiledFormatError("bad-offsets")
+
+            decoded: list[typing.Optional[str]] = [None] * n_strings
+
+            def _string(index: int) -> str:
+                if index >= n_strings:
+                    raise CompiledFormatError("bad-string")
+                value = decoded[index]
+                if value is None:
+                    start, end = offsets[index], offsets[index + 1]
+                    if start > end:
+                        raise CompiledFormatError("bad-offsets")
+                    try:
+                        value = str(buffer[blob + start : blob + end], "utf-8")
+                    except UnicodeDecodeError as e:
+                        raise CompiledFormatError("bad-string") from e
+                    decoded[index] = value
+                return value
+
+            records = _Records(words, _string)
+            preamble = records.strings(records.count())
+
+            entries: dict[str, pybtex.database.Entry] = {}
+            for _ in range(records.count()):
+                key, type_ = records.strings(2)
+                fields = records.strings(2 * records.count())
+                persons: dict[str, list[pybtex.database.Person]] = {}
+                for _ in range(records.count()):
+                    people = persons[records.strings(1)[0]] = []
+                    for _ in range(records.count()):
+                        person = pybtex.database.Person()
+                        for part in _NAME_PARTS:
+                            setattr(person, part, records.strings(records.count()))
+                        people.append(person)
+
+                entries[key] = pybtex.database.Entry(
+                    type_, fields=list(zip(fields[::2], fields[1::2])), persons=persons
+                )
+
+    return pybtex.database.BibliographyData(entries=entries, preamble=preamble)
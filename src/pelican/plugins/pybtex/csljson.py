@@ -0,0 +1,249 @@
+# SPDX-FileCopyrightText: Copyright © 2024 André Anjos <andre.dos.anjos@gmail.com>
+# SPDX-License-Identifier: MIT
+"""Read bibliography databases in CSL-JSON format.
+
+CSL-JSON is the format used by citeproc processors, and is exported by most
+reference managers.  It is a JSON list of items, each with an identifier, a type,
+(plain text) variables, lists of names, and dates.  Items are converted into
+:py:class:`pybtex.database.Entry` objects, with BibTeX types and fields, so they are
+formatted like any other entry.
+
+JSON is decoded with `orjson <https://github.com/ijl/orjson>`_, if installed, and
+with the standard library otherwise.
+"""
+
+import json
+import logging
+import re
+import typing
+
+import pybtex.database
+
+try:
+    import orjson
+
+    _loads: typing.Callable[[str], typing.Any] = orjson.loads
+except ImportError:  # pragma: no cover - orjson is an optional dependency
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+
+class CslJsonError(pybtex.database.PybtexError):
+    """Raised when a document is not a valid CSL-JSON database.
+
+    Parameters
+    ----------
+    reason
+        A short description of the problem.
+    """
+
+    def __init__(self, reason: str):
+        super().__init__(f"invalid CSL-JSON database ({reason})")
+
+
+# CSL item types, and their BibTeX counterpart (anything else is a "misc" entry)
+_TYPES = {
+    "article-journal": "article",
+    "article-magazine": "article",
+    "article-newspaper": "article",
+    "book": "book",
+    "chapter": "incollection",
+    "manuscript": "unpublished",
+    "paper-conference": "inproceedings",
+    "patent": "patent",
+    "report": "techreport",
+    "thesis": "phdthesis",
+}
+
+# CSL variables copied (escaped) into BibTeX fields
+_FIELDS = {
+    "DOI": "doi",
+    "ISBN": "isbn",
+    "ISSN": "issn",
+    "URL": "url",
+    "abstract": "abstract",
+    "collection-title": "series",
+    "edition": "edition",
+    "issue": "number",
+    "language": "language",
+    "note": "note",
+    "number": "number",
+    "publisher": "publisher",
+    "publisher-place": "address",
+    "volume": "volume",
+}
+
+# BibTeX field holding the CSL container title, for each BibTeX entry type
+_CONTAINER_FIELDS = {
+    "article": "journal",
+    "incollection": "booktitle",
+    "inproceedings": "booktitle",
+}
+
+# BibTeX field holding the CSL publisher, for entry types requiring another field
+_PUBLISHER_FIELDS = {
+    "mastersthesis": "school",
+    "phdthesis": "school",
+    "techreport": "institution",
+}
+
+_ROLES = ("author", "editor")
+
+_SPECIAL_CHARS_RE = re.compile(r"([\\{}$%&#_])")
+
+_YEAR_RE = re.compile(r"\d{4}")
+
+
+def escape(value: typing.Any) -> str:
+    """Escape a plain-text CSL value for use as a BibTeX field.
+
+    Parameters
+    ----------
+    value
+        The value to escape.
+
+    Returns
+    -------
+        The value converted to a string, with LaTeX special characters escaped.
+    """
+
+    return _SPECIAL_CHARS_RE.sub(r"\\\1", str(value))
+
+
+def _person(name: dict[str, typing.Any]) -> pybtex.database.Person:
+    """Convert a CSL name into a person.
+
+    Literal names (e.g. of institutions) are protected with braces, so they are not
+    split into parts.
+    """
+
+    if "literal" in name:
+        return pybtex.database.Person(last="{" + escape(name["literal"]) + "}")
+
+    return pybtex.database.Person(
+        first=escape(name.get("given", "")),
+        prelast=escape(
+            " ".join(
+                name[k]
+                for k in ("dropping-particle", "non-dropping-particle")
+                if k in name
+            )
+        ),
+        last=escape(name.get("family", "")),
+        lineage=escape(name.get("suffix", "")),
+    )
+
+
+def _date(value: dict[str, typing.Any]) -> tuple[str, str]:
+    """Extract the year and month of a CSL date.
+
+    Returns
+    -------
+        The year and month of the date, as strings (empty, if not available).
+    """
+
+    parts = value.get("date-parts")
+    if parts and parts[0]:
+        first = [str(k) for k in parts[0]]
+        return first[0], first[1] if len(first) > 1 else ""
+
+    match = _YEAR_RE.search(str(value.get("raw", value.get("literal", ""))))
+    return (match.group(0) if match else ""), ""
+
+
+def to_entry(item: dict[str, typing.Any]) -> tuple[str, pybtex.database.Entry]:
+    """Convert a CSL-JSON item into a bibliography entry.
+
+    Parameters
+    ----------
+    item
+        The CSL-JSON item.
+
+    Returns
+    -------
+        The key of the entry (the ``citation-key`` of the item, if set, or its
+        ``id`` otherwise), and the entry itself.
+
+    Raises
+    ------
+    CslJsonError
+        If the item has no identifier.
+    """
+
+    key = item.get("citation-key", item.get("id"))
+    if key is None or key == "":
+        raise CslJsonError("missing-id")
+
+    entry_type = _TYPES.get(item.get("type", ""), "misc")
+    if entry_type == "phdthesis" and "master" in item.get("genre", "").casefold():
+        entry_type = "mastersthesis"
+
+    fields: dict[str, str] = {}
+    if "title" in item:
+        # titles are kept as written, instead of being case-converted by styles
+        fields["title"] = "{" + escape(item["title"]) + "}"
+    if "container-title" in item:
+        fields[_CONTAINER_FIELDS.get(entry_type, "howpublished")] = escape(
+            item["container-title"]
+        )
+    if "publisher" in item and entry_type in _PUBLISHER_FIELDS:
+        fields[_PUBLISHER_FIELDS[entry_type]] = escape(item["publisher"])
+    for variable, field in _FIELDS.items():
+        if variable in item and field not in fields:
+            fields[field] = escape(item[variable])
+    if "page" in item:
+        fields["pages"] = escape(item["page"]).replace("-", "--").replace("----", "--")
+    if "keyword" in item:
+        fields["keywords"] = escape(item["keyword"])
+    if "issued" in item:
+        year, month = _date(item["issued"])
+        if year:
+            fields["year"] = year
+        if month:
+            fields["month"] = month
+
+    persons = {
+        role: [_person(k) for k in item[role]] for role in _ROLES if item.get(role)
+    }
+
+    return str(key), pybtex.database.Entry(entry_type, fields=fields, persons=persons)
+
+
+def parse_string(text: str) -> pybtex.database.BibliographyData:
+    """Parse a CSL-JSON database.
+
+    Parameters
+    ----------
+    text
+        The CSL-JSON document, a list of items.
+
+    Returns
+    -------
+        The parsed bibliography database, with one entry for each item, in order.
+
+    Raises
+    ------
+    CslJsonError
+        If the document is not a valid CSL-JSON database.
+    """
+
+    try:
+        items = _loads(text)
+    except ValueError as e:
+        raise CslJsonError(str(e)) from e
+
+    if not isinstance(items, list):
+        raise CslJsonError("not-a-list")
+
+    retval = pybtex.database.BibliographyData()
+    for item in items:
+        if not isinstance(item, dict):
+            raise CslJsonError("not-an-object")
+        key, entry = to_entry(item)
+        if key in retval.entries:
+            logger.warning(f"Ignoring repeated CSL-JSON item `{key}`")
+            continue
+        retval.add_entry(key, entry)
+
+    return retval
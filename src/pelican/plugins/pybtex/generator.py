@@ -2,21 +2,84 @@
 # SPDX-License-Identifier: MIT
 """Populate generation context with a list of formatted citations."""
 
+import contextlib
 import datetime
-import locale
+import json
 import logging
 import pathlib
+import time
 import typing
 
 import jinja2
+import jinja2.bccache
+import jinja2.meta
+import pygments.formatters
 
+import pelican.contents
 import pelican.generators
 import pelican.utils
+import pybtex.database
 
-from . import utils
+from . import output, query, search, shared, store, utils
 
 logger = logging.getLogger(__name__)
 
+# kinds of publication group pages, and the index buckets they are built from
+_GROUP_KINDS = {"author": "author", "type": "type", "tag": "keyword"}
+
+
+class _BytecodeCache(jinja2.FileSystemBytecodeCache):
+    """A bytecode cache that counts templates loaded without compilation.
+
+    The time spent compiling each template is recorded next to its bytecode, so that
+    the compilation time saved by later builds can be reported.
+
+    Parameters
+    ----------
+    directory
+        The directory where bytecode is stored.
+    load
+        If compiled templates should be loaded from the directory.
+    dump
+        If compiled templates should be written to the directory.
+    """
+
+    def __init__(self, directory: pathlib.Path, load: bool = True, dump: bool = True):
+        super().__init__(str(directory))
+        self.load = load
+        self.dump = dump
+        self.hits = 0
+        self.misses = 0
+        self.compile_time = 0.0
+        self.saved_time = 0.0
+        self._started: dict[str, float] = {}
+
+    def _timing(self, bucket: jinja2.bccache.Bucket) -> pathlib.Path:
+        return pathlib.Path(self.directory) / f"{bucket.key}.time"
+
+    def load_bytecode(self, bucket: jinja2.bccache.Bucket) -> None:
+        if self.load and pathlib.Path(self.directory).exists():
+            super().load_bytecode(bucket)
+        if bucket.code is not None:
+            self.hits += 1
+            with contextlib.suppress(OSError, ValueError):
+                self.saved_time += float(self._timing(bucket).read_text())
+            return
+        # the template is compiled next, before its bytecode is dumped
+        self.misses += 1
+        self._started[bucket.key] = time.perf_counter()
+
+    def dump_bytecode(self, bucket: jinja2.bccache.Bucket) -> None:
+        elapsed = time.perf_counter() - self._started.pop(
+            bucket.key, time.perf_counter()
+        )
+        self.compile_time += elapsed
+        if not self.dump:
+            return
+        pathlib.Path(self.directory).mkdir(parents=True, exist_ok=True)
+        super().dump_bytecode(bucket)
+        self._timing(bucket).write_text(repr(elapsed))
+
 
 class PybtexGenerator(pelican.generators.Generator):
     """Populate context with a list of BibTeX publications.
@@ -33,18 +96,71 @@ class PybtexGenerator(pelican.generators.Generator):
         super().__init__(*args, **kwargs)
 
         # overrides template loder for **this generator** so that we can correctly
-        # resolve overrides
+        # resolve overrides.  The overlay keeps Pelican's configured extensions,
+        # filters, globals and tests, and compiled templates are cached across builds
+        # following Pelican's content caching settings.
         pelican_loader = typing.cast(jinja2.ChoiceLoader, self.env.loader)
         own_loader = jinja2.PackageLoader(__name__, "templates")
-        self.env = jinja2.Environment(
+        self.bytecode_cache = _BytecodeCache(
+            pathlib.Path(self.settings["CACHE_PATH"]) / "pybtex" / "templates",
+            load=bool(self.settings.get("LOAD_CONTENT_CACHE", False)),
+            dump=bool(self.settings.get("CACHE_CONTENT", False)),
+        )
+        self.env = self.env.overlay(
             loader=jinja2.ChoiceLoader(
                 loaders=[
                     *pelican_loader.loaders,
                     own_loader,
                     jinja2.PrefixLoader({"!pybtex": own_loader}),
                 ]
-            )
+            ),
+            bytecode_cache=self.bytecode_cache,
         )
+        self.template_load_time = 0.0
+        self._template_digests: dict[str, str] = {}
+
+        # build-scoped cache for source lookups (also used by the injector)
+        self.resolver = utils.SourceResolver()
+
+        # entries to be written as static BibTeX files, by output file name
+        self.bibtex_files: dict[str, pybtex.database.Entry] = {}
+
+        # contents citing each entry, by key
+        self.citations: dict[str, list[pelican.contents.Content]] = {}
+
+        # bibliographies to be written as static fragments, by output file name
+        self.bibliography_fragments: dict[str, str] = {}
+
+        # cache shared with other processes on the same host (opt-in)
+        self.shared_cache: typing.Optional[shared.SharedCache] = None
+        self.sources_digest = ""
+        if kwargs["settings"].get("PYBTEX_SHARED_CACHE_PATH"):
+            self.shared_cache = shared.SharedCache(
+                pathlib.Path(kwargs["settings"]["PYBTEX_SHARED_CACHE_PATH"]),
+                kwargs["settings"].get(
+                    "PYBTEX_SHARED_CACHE_MAX_AGE", shared.DEFAULT_MAX_AGE
+                ),
+            )
+
+        # bounded cache for formatted entries and local sources (opt-in)
+        self.memory_cache: typing.Optional[utils.ProcessCache] = None
+        if kwargs["settings"].get("PYBTEX_MEMORY_BUDGET"):
+            try:
+                self.memory_cache = utils.ProcessCache(
+                    utils.parse_size(kwargs["settings"]["PYBTEX_MEMORY_BUDGET"]),
+                    name="pybtex",
+                )
+            except ValueError:
+                logger.exception(
+                    f"Cannot parse `PYBTEX_MEMORY_BUDGET` "
+                    f"({kwargs['settings']['PYBTEX_MEMORY_BUDGET']!r}), ignoring it"
+                )
+
+        # SQLite stores, queried by the injector for citations not loaded globally
+        self.stores: list[store.SqliteStore] = []
+
+        # keys of merged duplicate entries, mapped to their canonical entry key
+        self.aliases: dict[str, str] = {}
 
         # validates pybtex sources
         if not isinstance(kwargs["settings"].get("PYBTEX_SOURCES", []), (list, tuple)):
@@ -54,66 +170,918 @@ class PybtexGenerator(pelican.generators.Generator):
             )
             self.bibdata = []
         else:
-            self.bibdata = utils.load(
-                kwargs["settings"].get("PYBTEX_SOURCES", []), [kwargs["path"]]
+            start = time.perf_counter()
+            self.bibdata = self._load_sources()
+
+            self.stores = utils.open_stores(
+                kwargs["settings"].get("PYBTEX_SOURCES", []),
+                [kwargs["path"]],
+                self.resolver,
             )
 
+            sources = len(self.bibdata)
+            entries = sum([len(k.entries) for k in self.bibdata])
             if not self.bibdata:
                 logger.info("`pybtex` (generator) plugin detected no entries.")
             else:
-                sources = len(self.bibdata)
-                entries = sum([len(k.entries) for k in self.bibdata])
                 logger.info(
                     f"`pybtex` plugin detected {entries} entries spread across "
                     f"{sources} source file(s)."
                 )
 
+            from .signals import pybtex_sources_loaded
+
+            pybtex_sources_loaded.send(
+                self,
+                bibdata=self.bibdata,
+                sources=sources,
+                entries=entries,
+                elapsed=time.perf_counter() - start,
+            )
+
+        # labels of global entries, shared with generators loading the same sources
+        version = tuple(id(k) for k in self.bibdata)
+        cached = utils.process_cache.get(("labels",), version)
+        if cached is None:
+            cached = (list(self.bibdata), utils.LabelService(self.bibdata))
+            utils.process_cache.put(("labels",), version, cached)
+        self.labels: utils.LabelService = cached[1]
+
+        # numbering of citations on bibliographies of articles and pages
+        self.citation_numbering = kwargs["settings"].get(
+            "PYBTEX_CITATION_NUMBERING", "local"
+        )
+        if self.citation_numbering not in utils.CITATION_NUMBERINGS:
+            logger.error(
+                f"Unsupported `PYBTEX_CITATION_NUMBERING` "
+                f"({self.citation_numbering!r}), defaulting to `local`"
+            )
+            self.citation_numbering = "local"
+
         # signals other interested parties on the same configuration
         from .signals import pybtex_generator_init
 
         pybtex_generator_init.send(self)
 
+    def close(self) -> None:
+        """Close SQLite stores opened for ``sqlite:`` sources."""
+
+        for db in self.stores:
+            db.close()
+        self.stores = []
+
+    def get_template(self, name: str) -> jinja2.Template:
+        """Return a template by name, loading it once per build.
+
+        Parameters
+        ----------
+        name
+            The name of the template, without extension.
+
+        Returns
+        -------
+            The loaded template.
+        """
+
+        if name in self._templates:
+            return self._templates[name]
+
+        start = time.perf_counter()
+        try:
+            return super().get_template(name)
+        finally:
+            self.template_load_time += time.perf_counter() - start
+
+    def _load_sources(self) -> list[pybtex.database.BibliographyData]:
+        """Load all global sources, possibly from the shared cache.
+
+        If ``PYBTEX_DEDUPLICATE`` is set, duplicate entries are merged, and their
+        keys are recorded on :py:attr:`aliases`.
+
+        Returns
+        -------
+            A list of loaded databases.
+        """
+
+        sources = self.settings.get("PYBTEX_SOURCES", [])
+        select = self.settings.get("PYBTEX_SQLITE_SELECT")
+
+        def _load() -> list[pybtex.database.BibliographyData]:
+            return utils.load(sources, [self.path], self.resolver, select)
+
+        if self.shared_cache is None:
+            bibdata = _load()
+        else:
+            self.sources_digest = utils.sources_digest(
+                sources, [self.path], self.resolver, select
+            )
+            bibdata = self.shared_cache.get_or_compute(
+                f"bibdata-{self.sources_digest}", _load
+            )
+
+        if not self.settings.get("PYBTEX_DEDUPLICATE", False):
+            return bibdata
+
+        # the digest identifies loaded databases, which now depend on deduplication
+        if self.sources_digest:
+            self.sources_digest = output.digest(self.sources_digest + "\0deduplicate")
+
+        # deduplicated databases are shared with generators loading the same sources
+        version = tuple(id(k) for k in bibdata)
+        cached = utils.process_cache.get(("deduplicate",), version)
+        if cached is None:
+            cached = (bibdata, *utils.deduplicate(bibdata))
+            utils.process_cache.put(("deduplicate",), version, cached)
+        self.aliases = cached[2]
+        return cached[1]
+
+    def html_formatter_options(self) -> dict[str, typing.Any]:
+        """Return the options for highlighting BibTeX sources with pygments.
+
+        Options are taken from ``PYGMENTS_RST_OPTIONS``.  If ``PYBTEX_MINIFY_HTML``
+        is set, class-based highlighting is enforced, so that styles are defined once,
+        on a shared stylesheet, instead of inline on every token.
+
+        Returns
+        -------
+            Options for :py:class:`pygments.formatters.HtmlFormatter`.
+        """
+
+        retval = dict(self.settings.get("PYGMENTS_RST_OPTIONS", {}))
+        if self.settings.get("PYBTEX_MINIFY_HTML", False):
+            retval["noclasses"] = False
+        return retval
+
+    def minify(self, name: str, html: str) -> str:
+        """Minify rendered HTML, if ``PYBTEX_MINIFY_HTML`` is set.
+
+        Parameters
+        ----------
+        name
+            The name of the page (or content source) being minified, for reporting.
+        html
+            The rendered HTML.
+
+        Returns
+        -------
+            The (possibly) minified HTML.
+        """
+
+        if not self.settings.get("PYBTEX_MINIFY_HTML", False):
+            return html
+
+        retval = output.minify_html(html)
+        before = len(html.encode("utf-8"))
+        after = len(retval.encode("utf-8"))
+        logger.info(
+            f"Minified `{name}`: {before} -> {after} bytes "
+            f"({before - after} bytes saved)"
+        )
+        return retval
+
+    def stylesheet_url(self) -> typing.Optional[str]:
+        """Return the URL of the pygments stylesheet, if ``PYBTEX_MINIFY_HTML`` is set.
+
+        Returns
+        -------
+            The stylesheet URL (relative to ``SITEURL``), or ``None``, if BibTeX
+            sources are highlighted as configured by ``PYGMENTS_RST_OPTIONS``.
+        """
+
+        if not self.settings.get("PYBTEX_MINIFY_HTML", False):
+            return None
+
+        return f"{self.settings['THEME_STATIC_DIR']}/css/pybtex.css"
+
+    def bibtex_url(self) -> typing.Optional[str]:
+        """Return the URL pattern for static BibTeX files of entries.
+
+        Returns
+        -------
+            The URL pattern (with ``{key}`` and ``{slug}`` placeholders) set by
+            ``PYBTEX_BIBTEX_URL`` (defaults to ``PYBTEX_BIBTEX_SAVE_AS``), or ``None``
+            if static BibTeX files are disabled.
+        """
+
+        save_as = self.settings.get("PYBTEX_BIBTEX_SAVE_AS", "")
+        if not save_as:
+            return None
+        return self.settings.get("PYBTEX_BIBTEX_URL", save_as)
+
+    def add_bibtex_files(self, entries: typing.Iterable[pybtex.database.Entry]):
+        """Schedule static BibTeX files to be written for a set of entries.
+
+        This is a no-op if static BibTeX files are disabled.
+
+        Parameters
+        ----------
+        entries
+            The entries to write static BibTeX files for.
+        """
+
+        save_as = self.settings.get("PYBTEX_BIBTEX_SAVE_AS", "")
+        if not save_as:
+            return
+
+        for entry in entries:
+            name = save_as.format(key=entry.key, slug=utils.key_slug(entry.key))
+            previous = self.bibtex_files.get(name)
+            if previous is not None and previous != entry:
+                logger.warning(
+                    f"Different entries with key `{entry.key}` are written to the "
+                    f"same file `{name}` - using the last one"
+                )
+            self.bibtex_files[name] = entry
+
+    def add_bibliography_fragment(self, html: str) -> typing.Optional[str]:
+        """Schedule a rendered bibliography to be written as a static fragment.
+
+        Fragments are named after a digest of their contents, so that pages linking
+        to them never use stale copies.
+
+        Parameters
+        ----------
+        html
+            The rendered bibliography.
+
+        Returns
+        -------
+            The URL of the fragment, set by ``PYBTEX_BIBLIOGRAPHY_URL`` (defaults to
+            ``PYBTEX_BIBLIOGRAPHY_SAVE_AS``), or ``None`` if bibliography fragments
+            are disabled.
+        """
+
+        save_as = self.settings.get("PYBTEX_BIBLIOGRAPHY_SAVE_AS", "")
+        if not save_as:
+            return None
+
+        digest = output.digest(html)[:16]
+        self.bibliography_fragments[save_as.format(digest=digest)] = html
+        return self.settings.get("PYBTEX_BIBLIOGRAPHY_URL", save_as).format(
+            digest=digest
+        )
+
+    def add_citations(
+        self, content: pelican.contents.Content, keys: typing.Iterable[str]
+    ):
+        """Record that a content object cites a set of entries.
+
+        Parameters
+        ----------
+        content
+            The content object citing entries.
+        keys
+            Keys of the entries cited by ``content``.
+        """
+
+        for key in keys:
+            citing = self.citations.setdefault(key, [])
+            if content not in citing:
+                citing.append(content)
+
+    def _permalink(self, key: str) -> typing.Optional[str]:
+        """Return the URL of the page of an entry.
+
+        Parameters
+        ----------
+        key
+            The key of the entry.
+
+        Returns
+        -------
+            The URL of the page of the entry, or ``None``, if publication pages are
+            disabled.
+        """
+
+        save_as = self.settings.get("PUBLICATION_SAVE_AS", "")
+        if not save_as:
+            return None
+        url = self.settings.get("PUBLICATION_URL", save_as)
+        return url.format(key=key, slug=utils.key_slug(key))
+
+    def _add_permalink(self, item: dict[str, typing.Union[str, int]]) -> None:
+        """Add the URL of its own page to a formatted entry, if enabled.
+
+        Parameters
+        ----------
+        item
+            The formatted entry to update.
+        """
+
+        permalink = self._permalink(str(item["key"]))
+        if permalink is not None:
+            item["permalink"] = permalink
+
+    def _format_publications(
+        self,
+    ) -> typing.Sequence[dict[str, typing.Union[str, int]]]:
+        """Prepare all global entries for formatting, reusing other generators' work.
+
+        Entries are formatted on demand, so that nothing is formatted unless a
+        template (or another plugin) actually accesses them (see
+        :py:class:`.utils.PublicationList`).  Formatted entries are cached
+        process-wide, keyed by the loaded sources and formatting parameters, so that
+        other Pelican instances in the same process (e.g. translated sub-sites)
+        building with the same sources and parameters do not have to format them
+        again.
+
+        If ``PYBTEX_SHARED_CACHE_PATH`` is set, all entries are instead formatted at
+        once, and shared with other processes on the same host.  If
+        ``PYBTEX_MEMORY_BUDGET`` is set, formatted entries are kept on a bounded
+        cache, and are not shared with other generators.
+
+        Returns
+        -------
+            A sequence of formatted entries (see :py:func:`.utils.generate_context`).
+        """
+
+        style = self.settings.get("PYBTEX_FORMAT_STYLE", "plain")
+        extra_fields = self.settings.get("PYBTEX_ADD_ENTRY_FIELDS", [])
+        html_formatter_options = self.html_formatter_options()
+        bibtex_url = self.bibtex_url()
+        max_authors = self.settings.get("PYBTEX_MAX_AUTHORS")
+
+        if self.memory_cache is not None:
+            return utils.PublicationList(
+                self.bibdata,
+                style,
+                extra_fields,
+                html_formatter_options,
+                bibtex_url,
+                cache=self.memory_cache,
+                transform=self._add_permalink,
+                labels=self.labels,
+                max_authors=max_authors,
+            )
+
+        slot = (
+            "publications",
+            json.dumps(
+                [
+                    style,
+                    extra_fields,
+                    html_formatter_options,
+                    bibtex_url,
+                    max_authors,
+                    self.settings.get("PYBTEX_DEDUPLICATE", False),
+                ],
+                sort_keys=True,
+                default=str,
+            ),
+        )
+        # databases are shared through the process cache while sources do not change
+        # (see utils.load()), and are kept alive by the cached value itself
+        version = tuple(id(k) for k in self.bibdata)
+
+        cached = utils.process_cache.get(slot, version)
+        if cached is not None:
+            logger.debug("Reusing formatted entries from another generator")
+        elif self.shared_cache is None:
+            cached = (
+                list(self.bibdata),
+                utils.PublicationList(
+                    self.bibdata,
+                    style,
+                    extra_fields,
+                    html_formatter_options,
+                    bibtex_url,
+                    labels=self.labels,
+                    max_authors=max_authors,
+                ),
+            )
+            utils.process_cache.put(slot, version, cached)
+        else:
+            publications = self.shared_cache.get_or_compute(
+                "publications-" + output.digest(self.sources_digest + slot[1]),
+                lambda: utils.generate_context(
+                    self.bibdata,
+                    style,
+                    extra_fields,
+                    html_formatter_options,
+                    bibtex_url,
+                    labels=self.labels.global_labels(style),
+                    max_authors=max_authors,
+                ),
+            )
+            cached = (list(self.bibdata), publications)
+            utils.process_cache.put(slot, version, cached)
+
+        if isinstance(cached[1], utils.PublicationList):
+            return cached[1].with_transform(self._add_permalink)
+
+        # entries are shallow-copied, as they may be modified by this generator
+        retval = [dict(k) for k in cached[1]]
+        for item in retval:
+            self._add_permalink(item)
+        return retval
+
     def generate_context(self):
         """Populate context with a list of BibTeX publications.
 
         The generator context is modified to add a ``publications`` entry containing a
-        list dictionaries, each corresponding to a BibTeX entry (in the declared order),
-        with at least the following keys:
+        sequence of dictionaries, each corresponding to a BibTeX entry (in the declared
+        order), with at least the following keys:
 
         * ``key``: The BibTeX database key
         * ``year``: The year of the entry
         * ``html``: An HTML-formatted version of the entry
         * ``bibtex``: An HTML-ready (pygments-highlighted) BibTeX-formatted version of
-          the entry
+          the entry, or ``bibtex_url``: the URL of a static BibTeX file with the entry,
+          if ``PYBTEX_BIBTEX_SAVE_AS`` is set
 
         More keys as defined by ``PYBTEX_ADD_ENTRY_FIELDS`` may also be present in case
         they are found in the original database entry.  These fields are copied
         verbatim to this dictionary.
+
+        If ``PUBLICATION_SAVE_AS`` is set, each entry also contains a ``permalink``
+        key, with the URL of its own page.
+
+        Entries are only formatted when accessed, so that sites that do not render
+        ``publications`` (e.g. with ``PUBLICATIONS_SAVE_AS = ""``) do not pay for
+        formatting all entries.  Unless ``PYBTEX_SHARED_CACHE_PATH`` is set,
+        ``publications`` is therefore not a :py:class:`list`.
+
+        If ``PYBTEX_BIBTEX_ALL_SAVE_AS`` is set, the context also contains a
+        ``publications_bibtex_url`` entry, with the URL of a static BibTeX file
+        containing all entries.
+
+        The context also contains a ``publications_query`` entry, a function to
+        select publications using indexes built once per build (see
+        :py:meth:`.query.PublicationIndex.query`).
+
+        The context also contains a ``publications_groups`` entry, mapping each kind
+        of enabled group pages (``author``, ``type`` or ``tag``) to a list of groups,
+        each with a ``name``, ``slug``, ``url`` and ``count`` of entries.
+
+        If ``PYBTEX_MINIFY_HTML`` is set, the context also contains a
+        ``pybtex_stylesheet_url`` entry, with the URL of the pygments stylesheet for
+        highlighted BibTeX sources.
         """
 
-        self.context["publications"] = utils.generate_context(
-            self.bibdata,
-            self.settings.get("PYBTEX_FORMAT_STYLE", "plain"),
+        start = time.perf_counter()
+        self.context["publications"] = self._format_publications()
+        self.add_bibtex_files(e for db in self.bibdata for e in db.entries.values())
+
+        if self.stylesheet_url() is not None:
+            self.context["pybtex_stylesheet_url"] = self.stylesheet_url()
+
+        self.index = query.PublicationIndex(
+            self.context["publications"],
+            [e for db in self.bibdata for e in db.entries.values()],
             self.settings.get("PYBTEX_ADD_ENTRY_FIELDS", []),
-            self.settings.get("PYGMENTS_RST_OPTIONS", {}),
         )
+        self.context["publications_query"] = self.index.query
+
+        self.context["publications_groups"] = {
+            kind: [
+                {"name": name, "slug": slug, "url": url, "count": len(positions)}
+                for slug, name, _, url, positions in self._groups(kind)
+            ]
+            for kind in _GROUP_KINDS
+            if self.settings.get(f"PUBLICATIONS_{kind.upper()}_SAVE_AS", "")
+        }
+
+        all_save_as = self.settings.get("PYBTEX_BIBTEX_ALL_SAVE_AS", "")
+        if all_save_as and self.bibdata:
+            self.context["publications_bibtex_url"] = self.settings.get(
+                "PYBTEX_BIBTEX_ALL_URL", all_save_as
+            )
 
         # get the right formatting for the date
         default_timezone = self.settings.get("TIMEZONE", "UTC")
         timezone = getattr(self, "timezone", default_timezone)
         date = pelican.utils.set_date_tzinfo(datetime.datetime.now(), timezone)
         date_format = self.settings["DEFAULT_DATE_FORMAT"]
+        locale_string = None
         if isinstance(date_format, tuple):
-            locale_string = date_format[0]
-            locale.setlocale(locale.LC_ALL, locale_string)
-            date_format = date_format[1]
-        locale_date = date.strftime(date_format)
+            locale_string, date_format = date_format
+        # formats the date without changing the process locale (thread-safe)
+        self.context["locale_date"] = utils.format_date(
+            date, date_format, locale_string
+        )
+
+        from .signals import pybtex_context_ready
 
-        self.context["locale_date"] = locale_date
+        pybtex_context_ready.send(
+            self,
+            context=self.context,
+            entries=len(self.labels.entries),
+            elapsed=time.perf_counter() - start,
+        )
+
+    def _write_bibtex_files(self):
+        """Write static BibTeX files, skipping those with unchanged contents."""
+
+        for name, entry in self.bibtex_files.items():
+            output.write_if_changed(
+                pathlib.Path(self.output_path), name, utils.format_bibtex(entry)
+            )
+
+        all_save_as = self.settings.get("PYBTEX_BIBTEX_ALL_SAVE_AS", "")
+        if all_save_as and self.bibdata:
+            entries = {k: v for db in self.bibdata for k, v in db.entries.items()}
+            output.write_if_changed(
+                pathlib.Path(self.output_path),
+                all_save_as,
+                pybtex.database.BibliographyData(entries=entries).to_string("bibtex"),
+            )
+
+    def _write_bibliography_fragments(self):
+        """Write static bibliography fragments, skipping unchanged ones.
+
+        Fragments written on previous builds that are no longer referenced are
+        removed, so that fragments named after old digests do not pile up.
+        """
+
+        manifest = output.Manifest(
+            pathlib.Path(self.settings["CACHE_PATH"])
+            / "pybtex"
+            / "bibliography_fragments.json"
+        )
+        for name in sorted(set(manifest.digests) - set(self.bibliography_fragments)):
+            path = pathlib.Path(
+                pelican.utils.sanitised_join(str(self.output_path), name)
+            )
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+                logger.info(f"Removed unreferenced `{path}`")
+
+        manifest.digests = {}
+        for name, html in self.bibliography_fragments.items():
+            output.write_if_changed(pathlib.Path(self.output_path), name, html)
+            manifest.update(name, output.digest(html))
+        manifest.save()
+
+    def _write_search_index(self):
+        """Write the search index over global entries, if enabled."""
+
+        save_as = self.settings.get("PYBTEX_SEARCH_INDEX_SAVE_AS", "")
+        if not save_as or not self.bibdata:
+            return
+
+        cache = search.TokenCache(
+            pathlib.Path(self.settings["CACHE_PATH"]) / "pybtex" / "search-tokens.json"
+        )
+        urls = None
+        if self.settings.get("PUBLICATION_SAVE_AS", ""):
+            urls = [
+                typing.cast(str, self._permalink(k.key)) for k in self.labels.entries
+            ]
+        index = search.build_index(self.labels.entries, cache, urls)
+        cache.save()
+
+        output.write_if_changed(
+            pathlib.Path(self.output_path),
+            save_as,
+            json.dumps(index, ensure_ascii=False, separators=(",", ":")),
+        )
+        logger.info(
+            f"Indexed {len(index['terms'])} search terms over "
+            f"{len(index['entries'])} entries ({cache.misses} tokenized, "
+            f"{cache.hits} from cache)"
+        )
+
+    def _write_stylesheet(self):
+        """Write the pygments stylesheet for highlighted BibTeX sources."""
+
+        options = self.html_formatter_options()
+        formatter = pygments.formatters.HtmlFormatter(**options)
+        output.write_if_changed(
+            pathlib.Path(self.output_path),
+            typing.cast(str, self.stylesheet_url()),
+            formatter.get_style_defs(f".{options.get('cssclass', 'highlight')}") + "\n",
+        )
+
+    def template_digest(self, name: str) -> str:
+        """Compute a digest of a template, and of all templates it references.
+
+        Digests are computed once per build.
+
+        Parameters
+        ----------
+        name
+            The name of the template (without extension).
+
+        Returns
+        -------
+            A digest that changes if the template, or any (statically) referenced
+            template changes.
+        """
+
+        if name in self._template_digests:
+            return self._template_digests[name]
+
+        sources: list[str] = []
+        pending = [self.get_template(name).name]
+        seen: set[str] = set()
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            try:
+                source, _, _ = self.env.loader.get_source(self.env, current)
+            except jinja2.TemplateNotFound:
+                continue
+            sources.append(source)
+            pending.extend(
+                k
+                for k in jinja2.meta.find_referenced_templates(self.env.parse(source))
+                if k is not None
+            )
+
+        self._template_digests[name] = output.digest("\0".join(sources))
+        return self._template_digests[name]
+
+    def _context_digest(self) -> str:
+        """Compute a digest of the site-wide context templates may depend on.
+
+        Pages rendered by this plugin typically extend the theme's ``base.html``,
+        which may list pages, categories, tags or authors, and use any setting (e.g.
+        ``MENUITEMS``).  Settings that cannot be serialized to JSON are ignored.
+
+        Returns
+        -------
+            A digest that changes if the URL or title of any page, category, tag or
+            author changes, or if any (JSON-serializable) setting changes.
+        """
+
+        def _links(name: str) -> list[tuple[str, str]]:
+            items = (
+                k[0] if isinstance(k, tuple) else k for k in self.context.get(name, [])
+            )
+            return [
+                (str(getattr(k, "url", "")), str(getattr(k, "title", k))) for k in items
+            ]
+
+        values = [
+            json.dumps(_links(k))
+            for k in ("pages", "hidden_pages", "categories", "tags", "authors")
+        ]
+        for key, value in sorted(self.settings.items()):
+            try:
+                values.append(f"{key}={json.dumps(value, sort_keys=True)}")
+            except (TypeError, ValueError):  # not JSON-serializable
+                continue
+
+        return output.digest("\0".join(values))
+
+    def _render_page(
+        self,
+        template: jinja2.Template,
+        save_as: str,
+        url: str,
+        extra: dict[str, typing.Any],
+    ) -> str:
+        """Render (and possibly minify) a page, as Pelican's writer would.
+
+        Parameters
+        ----------
+        template
+            The template to render the page with.
+        save_as
+            The output file name of the page.
+        url
+            The URL of the page.
+        extra
+            Extra context variables of the page.
+
+        Returns
+        -------
+            The rendered page.
+        """
+
+        context = self.context.copy()
+        context.update(extra)
+        context["output_file"] = save_as
+        context["page_name"] = pathlib.Path(save_as).stem
+        context["url"] = url
+        if self.settings["RELATIVE_URLS"]:
+            context["SITEURL"] = pelican.utils.path_to_url(
+                pelican.utils.get_relative_path(save_as)
+            )
+            context["localsiteurl"] = context["SITEURL"]
+        return self.minify(save_as, template.render(context))
+
+    def _render_pages(
+        self,
+        template_name: str,
+        pages: typing.Iterable[tuple[str, str, dict[str, typing.Any]]],
+        manifest_name: str,
+    ):
+        """Render pages, skipping those whose inputs did not change.
+
+        Parameters
+        ----------
+        template_name
+            The name of the template to render pages with.
+        pages
+            An iterable of tuples, each containing the output file name, URL and extra
+            context variables (must be JSON-serializable, or have a meaningful string
+            representation) of each page.  Pages are consumed one at a time, so they
+            may be produced lazily.
+        manifest_name
+            The name of the manifest (under ``CACHE_PATH``) keeping the digests of
+            rendered pages.
+        """
+
+        manifest = output.Manifest(
+            pathlib.Path(self.settings["CACHE_PATH"])
+            / "pybtex"
+            / f"{manifest_name}.json"
+        )
+        template = self.get_template(template_name)
+        common = output.digest(
+            "\0".join(
+                (
+                    self.template_digest(template_name),
+                    self._context_digest(),
+                )
+            )
+        )
+
+        rendered = total = 0
+        for save_as, url, extra in pages:
+            total += 1
+            digest = output.digest(
+                common + json.dumps(extra, sort_keys=True, default=str)
+            )
+            if not manifest.changed(pathlib.Path(self.output_path), save_as, digest):
+                continue
+            try:
+                output.write_if_changed(
+                    pathlib.Path(self.output_path),
+                    save_as,
+                    self._render_page(template, save_as, url, extra),
+                )
+                manifest.update(save_as, digest)
+                rendered += 1
+            except Exception:
+                logger.exception(f"Failed to render `{save_as}`")
+
+        logger.info(
+            f"Rendered {rendered} out of {total} `{template_name}` page(s) "
+            f"(others did not change)"
+        )
+        manifest.save()
+
+    def _write_publication_pages(self):
+        """Write one page per entry of the global bibliography, if enabled.
+
+        Entries are formatted (or retrieved from the cache) one page at a time, so
+        that formatted entries are not all kept in memory together.
+        """
+
+        save_as = self.settings.get("PUBLICATION_SAVE_AS", "")
+        if not save_as or not self.bibdata:
+            return
+
+        def _pages() -> typing.Iterator[tuple[str, str, dict[str, typing.Any]]]:
+            for item in self.context["publications"]:
+                key = str(item["key"])
+                cited_in = [
+                    {"title": getattr(k, "title", ""), "url": k.url}
+                    for k in self.citations.get(key, [])
+                ]
+                yield (
+                    save_as.format(key=key, slug=utils.key_slug(key)),
+                    str(item["permalink"]),
+                    {"publication": item, "cited_in": cited_in},
+                )
+
+        self._render_pages("publication", _pages(), "publication")
+
+    def _groups(self, kind: str) -> list[tuple[str, str, str, str, list[int]]]:
+        """List groups of publications of a kind, as indexed.
+
+        Parameters
+        ----------
+        kind
+            One of ``author``, ``type`` or ``tag``.
+
+        Returns
+        -------
+            A list of tuples, sorted by slug, each containing the group slug, name,
+            output file name, URL, and the positions of its entries on the list of
+            publications.  Groups whose names produce the same slug are merged.
+        """
+
+        save_as = self.settings.get(f"PUBLICATIONS_{kind.upper()}_SAVE_AS", "")
+        url = self.settings.get(f"PUBLICATIONS_{kind.upper()}_URL", save_as)
+        bucket = _GROUP_KINDS[kind]
+
+        groups: dict[str, tuple[str, set[int]]] = {}
+        for value, positions in self.index.buckets[bucket].items():
+            name = self.index.names[bucket][value]
+            slug = pelican.utils.slugify(
+                name, regex_subs=self.settings.get("SLUG_REGEX_SUBSTITUTIONS", [])
+            )
+            groups.setdefault(slug, (name, set()))[1].update(positions)
+
+        return [
+            (
+                slug,
+                name,
+                save_as.format(slug=slug),
+                url.format(slug=slug),
+                sorted(positions),
+            )
+            for slug, (name, positions) in sorted(groups.items())
+        ]
+
+    def _select_template(self, *names: str) -> str:
+        """Return the first template name that can be loaded.
+
+        Parameters
+        ----------
+        *names
+            Template names (without extension), by order of preference.
+
+        Returns
+        -------
+            The first template name that can be loaded, or the last one.
+        """
+
+        for name in names[:-1]:
+            try:
+                self.get_template(name)
+            except pelican.generators.PelicanTemplateNotFound:
+                continue
+            return name
+        return names[-1]
+
+    def _write_group_pages(self):
+        """Write one page per author, entry type and/or tag, if enabled.
+
+        Entries of each group are formatted (or retrieved from the cache) when its
+        page is rendered, so that formatted entries of all groups are not kept in
+        memory together.
+        """
+
+        if not self.bibdata:
+            return
+
+        publications = self.context["publications"]
+        for kind in _GROUP_KINDS:
+            if not self.settings.get(f"PUBLICATIONS_{kind.upper()}_SAVE_AS", ""):
+                continue
+
+            pages = (
+                (
+                    save_as,
+                    url,
+                    {
+                        "publications_group": {
+                            "kind": kind,
+                            "name": name,
+                            "slug": slug,
+                        },
+                        "group_publications": [publications[k] for k in positions],
+                    },
+                )
+                for slug, name, save_as, url, positions in self._groups(kind)
+            )
+            self._render_pages(
+                self._select_template(f"publications_{kind}", "publications_group"),
+                pages,
+                f"publications_{kind}",
+            )
 
     def generate_output(self, writer):
         """Generate a publication list on the website.
 
+        Parameters
+        ----------
+        writer
+            The pelican writer to use.
+        """
+
+        self._write_bibtex_files()
+        self._write_bibliography_fragments()
+        self._write_search_index()
+        self._write_publication_pages()
+        self._write_group_pages()
+
+        if self.settings.get("PYBTEX_MINIFY_HTML", False):
+            self._write_stylesheet()
+
+        self._write_publications_page(writer)
+
+        if self._templates:
+            logger.info(
+                f"Loaded `pybtex` templates in {1000 * self.template_load_time:.1f} ms "
+                f"(bytecode cache: {self.bytecode_cache.hits} hit(s), saving "
+                f"{1000 * self.bytecode_cache.saved_time:.1f} ms of compilation, "
+                f"{self.bytecode_cache.misses} miss(es), compiled in "
+                f"{1000 * self.bytecode_cache.compile_time:.1f} ms)"
+            )
+
+        if self.memory_cache is not None:
+            self.memory_cache.log_stats()
+
+    def _write_publications_page(self, writer):
+        """Write the publications page.
+
         This method mimics Pelican's
         :py:func:`pelican.generators.Generator.generate_direct_templates`.
 
@@ -132,6 +1100,24 @@ class PybtexGenerator(pelican.generators.Generator):
         save_as = self.settings.get(f"{template.upper()}_SAVE_AS", f"{template}.html")
         url = self.settings.get(f"{template.upper()}_URL", f"{template}.html")
 
+        if not save_as:
+            logger.info(f"Not generating `{template}.html` (disabled)")
+            return
+
+        if self.settings.get("PYBTEX_MINIFY_HTML", False):
+            # rendered, minified and written once, as other pages of this plugin
+            output.write_if_changed(
+                pathlib.Path(self.output_path),
+                save_as,
+                self._render_page(
+                    self.get_template(template),
+                    save_as,
+                    url,
+                    {"template_name": template},
+                ),
+            )
+            return
+
         writer.write_file(
             save_as,
             self.get_template(template),
@@ -2,15 +2,21 @@
 # SPDX-License-Identifier: MIT
 """Add references to a parsed content page."""
 
+import collections.abc
+import json
 import logging
 import pathlib
 import re
+import threading
+import time
+import typing
+import weakref
 
 import pelican
 import pelican.contents
 import pybtex.database
 
-from . import utils
+from . import signals, utils
 from .generator import PybtexGenerator
 
 logger = logging.getLogger(__name__)
@@ -20,12 +26,219 @@ logger = logging.getLogger(__name__)
 BIBTEX_KEY_RE = r"[!\"\$&'\(\)\*\+\-\.\/:;\<\=\>\?@\[\]\^\`\|\w]+"
 CITE_RE = re.compile(rf"\[(@|&#64;)(@|&#64;)?\s*({BIBTEX_KEY_RE})\s*\]")
 
+# grouped citations, such as ``[@a; @b]``, where keys cannot contain ``;``, ``[`` or
+# ``]``.  Single citations fall back to CITE_RE, where keys may contain those.
+_MARKER_RE = r"(?:@|&#64;)(?:@|&#64;)?\s*"
+_GROUP_KEY_RE = r"[!\"\$&'\(\)\*\+\-\.\/:\<\=\>\?@\^\`\|\w]+"
+_GROUP_KEYS_RE = re.compile(rf"{_MARKER_RE}({_GROUP_KEY_RE})")
+_TOKEN_RE = re.compile(
+    rf"\[{_MARKER_RE}({_GROUP_KEY_RE})\s*"
+    rf"((?:;\s*{_MARKER_RE}{_GROUP_KEY_RE}\s*)*)\]|{CITE_RE.pattern}"
+)
+
+
+def tokenize(text: str) -> list[typing.Union[str, list[str]]]:
+    """Split a text into plain text and citations, in a single pass.
+
+    Citations are marked as ``[@key]``, ``[@@key]``, or grouped as ``[@a; @b]``.
+    Single citations follow :py:data:`CITE_RE`, so that keys may contain any
+    character acceptable in BibTeX keys.
+
+    Parameters
+    ----------
+    text
+        The text to tokenize.
+
+    Returns
+    -------
+        A list of tokens, either strings (plain text) or lists of cited keys.
+    """
+
+    # split() interleaves plain text with the groups of _TOKEN_RE: the first and
+    # remaining keys of a grouped citation, then the markers and key of a single
+    # citation (not matching the grouped syntax)
+    parts = _TOKEN_RE.split(text)
+    tokens: list[typing.Union[str, list[str]]] = [parts[0]] if parts[0] else []
+    for k in range(1, len(parts), 6):
+        first, rest, plain = parts[k], parts[k + 1], parts[k + 5]
+        if first is None:
+            tokens.append([parts[k + 4]])
+        elif rest:
+            tokens.append([first, *_GROUP_KEYS_RE.findall(rest)])
+        else:
+            tokens.append([first])
+        if plain:
+            tokens.append(plain)
+
+    return tokens
+
+
+def _link(key: str, label: str, text: typing.Optional[str] = None) -> str:
+    """Return a link to the bibliography entry of a citation.
+
+    The link shows ``text``, if set, or otherwise the label of the entry.
+    """
+    return (
+        f'<a title="click to jump to reference [{label}]" href="#pybtex-{key}">'
+        f"{label if text is None else text}</a>"
+    )
+
+
+def format_citation(keys: list[str], labels: dict[str, tuple[int, str]]) -> str:
+    """Format a (possibly grouped) citation as links to the bibliography.
+
+    Cited entries are sorted by their label if all labels are numeric, or otherwise by
+    their position on the bibliography.  Runs of three or more consecutive numeric
+    labels are compressed into ranges (e.g. ``[1&ndash;3, 7]``).
+
+    Parameters
+    ----------
+    keys
+        The cited keys.
+    labels
+        A dictionary mapping keys to their position on the bibliography, and their
+        label.
+
+    Returns
+    -------
+        The HTML representation of the citation.
+    """
+
+    if len(keys) == 1:
+        key = keys[0]
+        if key in labels:
+            label = labels[key][1]
+            return _link(key, label, f"[{label}]")
+        return f'<span title="cannot find citation {key}">[{key}?]</span>'
+
+    # cited entries in label (or bibliography) order, without repetitions
+    found = sorted({labels[k][0]: k for k in keys if k in labels}.items())
+    if all(labels[k][1].isdigit() for _, k in found):
+        found = [(int(labels[k][1]), k) for _, k in found]
+        found.sort()
+
+    parts: list[str] = []
+    first = 0
+    for i, (_, key) in enumerate(found):
+        label = labels[key][1]
+        following = found[i + 1] if i + 1 < len(found) else None
+        if (
+            following is not None
+            and label.isdigit()
+            and labels[following[1]][1].isdigit()
+            and int(labels[following[1]][1]) == int(label) + 1
+        ):
+            continue  # extends the current run of consecutive numeric labels
+
+        if i - first >= 2:  # noqa: PLR2004
+            start = found[first][1]
+            parts.append(f"{_link(start, labels[start][1])}&ndash;{_link(key, label)}")
+        else:
+            parts.extend(_link(k, labels[k][1]) for _, k in found[first : i + 1])
+        first = i + 1
+
+    missing = dict.fromkeys(k for k in keys if k not in labels)
+    parts.extend(f'<span title="cannot find citation {k}">{k}?</span>' for k in missing)
+
+    return "[" + ", ".join(parts) + "]"
+
+
+def _translation_group(content: pelican.contents.Content) -> typing.Optional[tuple]:
+    """Identify the group of translations a content object belongs to.
+
+    Translations are grouped as Pelican does, through the ``ARTICLE_TRANSLATION_ID``
+    (or ``PAGE_TRANSLATION_ID``, for pages) setting, that defaults to ``slug``.
+
+    Parameters
+    ----------
+    content
+        The Pelican content object being processed.
+
+    Returns
+    -------
+        A tuple identifying the translation group, or ``None``, if translations are
+        not grouped.
+    """
+
+    kind = "PAGE" if isinstance(content, pelican.contents.Page) else "ARTICLE"
+    attributes = getattr(content, "settings", {}).get(f"{kind}_TRANSLATION_ID", "slug")
+    if not attributes:
+        return None
+    if isinstance(attributes, str):
+        attributes = [attributes]
+    return (kind, *(getattr(content, k, None) for k in attributes))
+
+
+def _bibliography_cache(generator: PybtexGenerator) -> utils.ProcessCache:
+    """Return the cache for bibliographies rendered for a generator.
+
+    Parameters
+    ----------
+    generator
+        The generator responsible for the rendered contents.
+
+    Returns
+    -------
+        The (budgeted) memory cache of the generator, if set, or the process cache.
+    """
+
+    return (
+        generator.memory_cache
+        if generator.memory_cache is not None
+        else utils.process_cache
+    )
+
+
+class _DatabaseEntries(collections.abc.Mapping):
+    """A read-only view of the entries of multiple databases, without copies.
+
+    In case of repeated keys, entries from the last database take precedence.
+
+    Parameters
+    ----------
+    bibdata
+        The bibliography databases.
+    """
+
+    def __init__(self, bibdata: typing.Sequence[pybtex.database.BibliographyData]):
+        self._bibdata = bibdata
+
+    def __getitem__(self, key: str) -> pybtex.database.Entry:
+        for database in reversed(self._bibdata):
+            entry = database.entries.get(key)
+            # database keys are case-insensitive, but citations are not
+            if entry is not None and entry.key == key:
+                return entry
+        raise KeyError(key)
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(dict.fromkeys(k for db in self._bibdata for k in db.entries))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
 
 class PybtexInjector:
-    """Injects bibliography on content objects."""
+    """Injects bibliography on content objects.
+
+    A single injector may serve multiple generators (e.g. when multiple Pelican
+    instances are built in the same process, for translated sub-sites).  Content
+    objects are matched to the generator sharing the same settings.
+    """
 
     def __init__(self):
-        pass
+        self._lock = threading.Lock()
+        self._generators: weakref.WeakValueDictionary[int, PybtexGenerator] = (
+            weakref.WeakValueDictionary()
+        )
+        self._main_entries: weakref.WeakKeyDictionary[
+            PybtexGenerator, typing.Mapping[str, pybtex.database.Entry]
+        ] = weakref.WeakKeyDictionary()
+        # number of contents seen on each group of translations
+        self._translation_members: weakref.WeakKeyDictionary[
+            PybtexGenerator, dict[tuple, int]
+        ] = weakref.WeakKeyDictionary()
+        self._latest: typing.Optional[weakref.ReferenceType[PybtexGenerator]] = None
 
     def init(self, generator: PybtexGenerator):
         """Initialize this injector.
@@ -36,10 +249,296 @@ class PybtexInjector:
             Plugin generator, already loaded and pre-configured with available global
             bibliography entries.
         """
-        self.generator = generator
-        self.main_entries: dict[str, pybtex.database.Entry] = {
-            k: v for database in generator.bibdata for k, v in database.entries.items()
-        }
+        main_entries: typing.Mapping[str, pybtex.database.Entry]
+        if generator.memory_cache is not None:
+            # on a memory budget, avoids keeping a copy of all entries
+            main_entries = _DatabaseEntries(generator.bibdata)
+        else:
+            main_entries = {
+                k: v
+                for database in generator.bibdata
+                for k, v in database.entries.items()
+            }
+        with self._lock:
+            self._generators[id(generator.settings)] = generator
+            self._main_entries[generator] = main_entries
+            self._translation_members[generator] = {}
+            self._latest = weakref.ref(generator)
+
+    def finalize(self, settings: dict[str, typing.Any]):
+        """Release resources of the generator with the given settings.
+
+        Called once a build is finished, after all content objects were processed.
+
+        Parameters
+        ----------
+        settings
+            The settings of the finished build.
+        """
+
+        with self._lock:
+            generator = self._generators.pop(id(settings), None)
+            if generator is not None:
+                self._main_entries.pop(generator, None)
+                self._translation_members.pop(generator, None)
+        if generator is not None:
+            generator.close()
+
+    def discard_untranslated(self, generator: PybtexGenerator):
+        """Discard cached bibliographies of contents without translations.
+
+        Called once all content objects were read, so that bibliographies that will
+        not be reused do not stay in memory.
+
+        Parameters
+        ----------
+        generator
+            The generator whose content objects were all read.
+        """
+
+        with self._lock:
+            counts = self._translation_members.get(generator, {})
+            singles = [k for k, v in counts.items() if v == 1]
+            counts.clear()
+
+        cache = _bibliography_cache(generator)
+        for slot in singles:
+            cache.discard(slot)
+        if singles:
+            logger.debug(
+                f"Discarded {len(singles)} cached bibliographies of contents "
+                f"without translations"
+            )
+
+    def _select(
+        self, content: pelican.contents.Content
+    ) -> typing.Optional[
+        tuple[PybtexGenerator, typing.Mapping[str, pybtex.database.Entry]]
+    ]:
+        """Select the generator responsible for a content object.
+
+        Parameters
+        ----------
+        content
+            The Pelican content object being processed.
+
+        Returns
+        -------
+            The generator sharing settings with ``content`` (or the last initialized
+            generator, if none matches), and its global entries.  ``None`` if this
+            injector was not initialized.
+        """
+
+        with self._lock:
+            generator = self._generators.get(id(getattr(content, "settings", None)))
+            if generator is None and self._latest is not None:
+                generator = self._latest()
+            if generator is None:
+                return None
+            return generator, self._main_entries[generator]
+
+    def _load_local_entries(
+        self,
+        generator: PybtexGenerator,
+        content: pelican.contents.Content,
+        keys: list[str],
+    ) -> dict[str, pybtex.database.Entry]:
+        """Load entries from databases declared on the content metadata.
+
+        Parameters
+        ----------
+        generator
+            The generator responsible for ``content``.
+        content
+            The Pelican content object being processed.
+        keys
+            Keys cited in the content (used to select entries from SQLite stores).
+
+        Returns
+        -------
+            A dictionary mapping keys to entries loaded from ``pybtex_sources``.
+        """
+
+        if "pybtex_sources" not in content.metadata:
+            return {}
+
+        sources = [k.strip() for k in content.metadata.pop("pybtex_sources").split(",")]
+        if content.source_path is not None:
+            search_paths = [
+                pathlib.Path(content.source_path).parent,
+            ]
+        else:
+            search_paths = []
+        search_paths.append(pathlib.Path(generator.settings["PATH"]))
+        bibdata = utils.load(
+            sources,
+            search_paths,
+            generator.resolver,
+            {"keys": keys},
+            generator.memory_cache,
+        )
+        return {k: v for db in bibdata for k, v in db.entries.items()}
+
+    def _resolve_entries(
+        self,
+        generator: PybtexGenerator,
+        main_entries: typing.Mapping[str, pybtex.database.Entry],
+        keys: list[str],
+        local_entries: dict[str, pybtex.database.Entry],
+    ) -> dict[str, pybtex.database.Entry]:
+        """Resolve cited keys into entries.
+
+        Parameters
+        ----------
+        generator
+            The generator responsible for the content being processed.
+        main_entries
+            Global entries, loaded by ``generator``.
+        keys
+            Keys cited in the content.
+        local_entries
+            Entries loaded from databases declared on the content metadata.  These
+            have preference over global ones.
+
+        Returns
+        -------
+            A dictionary mapping the cited keys that could be resolved to entries.
+        """
+
+        retval: dict[str, pybtex.database.Entry] = {}
+        for key in keys:
+            if key in local_entries:
+                retval[key] = local_entries[key]
+            elif key in main_entries:
+                retval[key] = main_entries[key]
+
+        # fetch missing citations from SQLite stores, using the key index
+        missing = {k for k in keys if k not in retval}
+        for db in generator.stores:
+            if not missing:
+                break
+            found = db.fetch(missing)
+            retval.update(found)
+            missing.difference_update(found)
+
+        return retval
+
+    def _render_bibliography(
+        self,
+        generator: PybtexGenerator,
+        content: pelican.contents.Content,
+        content_entries: dict[str, pybtex.database.Entry],
+    ) -> tuple[str, dict[str, tuple[int, str]]]:
+        """Render the bibliography section of a content object.
+
+        Translations citing the same entries share the same bibliography section,
+        which is only rendered once.  Sections are cached (and charged to the memory
+        budget, if set) until all contents are read, and then only kept for groups
+        with more than one member (see :py:meth:`discard_untranslated`).
+
+        Parameters
+        ----------
+        generator
+            The generator responsible for ``content``.
+        content
+            The Pelican content object being processed.
+        content_entries
+            The cited entries, by key, in order of citation.
+
+        Returns
+        -------
+            The rendered bibliography, and a dictionary mapping keys to their
+            position on the bibliography, and their label.
+        """
+
+        style = generator.settings.get("PYBTEX_FORMAT_STYLE", "plain")
+        if "pybtex_format_style" in content.metadata:
+            style = content.metadata.pop("pybtex_format_style").strip() or style
+
+        add_entry_fields = generator.settings.get("PYBTEX_ADD_ENTRY_FIELDS", [])
+        if "pybtex_add_entry_fields" in content.metadata:
+            add_entry_fields = (
+                content.metadata.pop("pybtex_add_entry_fields").strip()
+                or add_entry_fields
+            )
+
+        max_authors = generator.settings.get("PYBTEX_MAX_AUTHORS")
+        if "pybtex_max_authors" in content.metadata:
+            value = str(content.metadata.pop("pybtex_max_authors")).strip()
+            if value.isdigit():
+                max_authors = int(value)
+            elif value:
+                logger.error(
+                    f"Ignoring invalid `pybtex_max_authors` ({value!r}) on "
+                    f"`{content.source_path}` (must be a non-negative integer)"
+                )
+
+        # the bibliography only depends on the entries, on formatting parameters, and
+        # on global labels (which also depend on other sources, if numbered globally)
+        labels = None
+        if generator.citation_numbering == "global":
+            labels = generator.labels.labels(content_entries, style, "global")
+        template_name = "bibliography"
+        cache = _bibliography_cache(generator)
+        group = _translation_group(content)
+        slot = ("bibliography", *group) if group is not None else None
+        if slot is not None:
+            counts = self._translation_members.setdefault(generator, {})
+            counts[slot] = counts.get(slot, 0) + 1
+        version = (
+            tuple((k, id(v)) for k, v in content_entries.items()),
+            json.dumps(
+                [
+                    style,
+                    add_entry_fields,
+                    max_authors,
+                    generator.citation_numbering,
+                    labels,
+                    generator.html_formatter_options(),
+                    generator.bibtex_url(),
+                    generator.stylesheet_url(),
+                    generator.settings.get("SITEURL", ""),
+                    generator.settings.get("PYBTEX_MINIFY_HTML", False),
+                    generator.template_digest(template_name),
+                ],
+                sort_keys=True,
+                default=str,
+            ),
+        )
+
+        cached = cache.get(slot, version) if slot is not None else None
+        if cached is None:
+            publications = utils.generate_context(
+                [pybtex.database.BibliographyData(entries=content_entries)],
+                style,
+                add_entry_fields,
+                generator.html_formatter_options(),
+                generator.bibtex_url(),
+                labels=labels
+                or generator.labels.labels(
+                    content_entries, style, generator.citation_numbering
+                ),
+                max_authors=max_authors,
+            )
+            context = {
+                "SITEURL": generator.settings.get("SITEURL", ""),
+                "pybtex_stylesheet_url": generator.stylesheet_url(),
+                "publications": publications,
+            }
+            bibliography = generator.minify(
+                content.source_path,
+                generator.get_template(template_name).render(context),
+            )
+            positions = {k["key"]: (i, k["label"]) for i, k in enumerate(publications)}
+            # entries are kept, so their identifiers (on version) are not reused
+            cached = (list(content_entries.values()), bibliography, positions)
+            if slot is not None:
+                cache.put(slot, version, cached)
+        else:
+            logger.debug(
+                f"Reusing bibliography of a translation of `{content.source_path}`"
+            )
+        return cached[1], cached[2]
 
     def resolve_bibliography(self, content: pelican.contents.Content):
         """Resolve bibliography citations.
@@ -54,39 +553,47 @@ class PybtexInjector:
             # protect against spurious content being parsed
             return
 
+        start = time.perf_counter()
+
         # 1. grab all citations
-        citations = CITE_RE.findall(content._content)  # noqa: SLF001
-        if not citations:
+        tokens = tokenize(content._content)  # noqa: SLF001
+        keys = [k for token in tokens if isinstance(token, list) for k in token]
+        if not keys:
             # nothing to be done
             return
 
+        selected = self._select(content)
+        if selected is None:
+            logger.error("`pybtex` injector was not initialized by a generator")
+            return
+        generator, main_entries = selected
+
         # 2. load locally declared pybtex databases
-        local_entries: dict[str, pybtex.database.Entry] = {}
-        if "pybtex_sources" in content.metadata:
-            sources = [
-                k.strip() for k in content.metadata.pop("pybtex_sources").split(",")
+        local_entries = self._load_local_entries(generator, content, keys)
+
+        # cite canonical entries instead of merged duplicates (see utils.deduplicate)
+        aliases = {
+            k: generator.aliases[k]
+            for k in keys
+            if k in generator.aliases and k not in local_entries
+        }
+        if aliases:
+            tokens = [
+                [aliases.get(k, k) for k in token] if isinstance(token, list) else token
+                for token in tokens
             ]
-            if content.source_path is not None:
-                search_paths = [
-                    pathlib.Path(content.source_path).parent,
-                ]
-            else:
-                search_paths = []
-            search_paths.append(pathlib.Path(self.generator.settings["PATH"]))
-            bibdata = utils.load(sources, search_paths)
-            local_entries.update(
-                {k: v for db in bibdata for k, v in db.entries.items()}
-            )
+            keys = [k for token in tokens if isinstance(token, list) for k in token]
 
-        # 3. create an addressable dictionary with all citations
-        all_entries = dict(self.main_entries.items())
-        all_entries.update(local_entries)  # will have preference
+        # 3. resolve citations on local databases (which have preference), then
+        # global ones, and finally on SQLite stores
+        all_entries = self._resolve_entries(
+            generator, main_entries, keys, local_entries
+        )
 
         # 4. check all citations exist on one of the databases (global) or local
         # Resolve the ones we can by selecting those entries
         content_entries: dict[str, pybtex.database.Entry] = {}
-        for citation in citations:
-            key = citation[-1]
+        for key in keys:
             if key in all_entries:
                 content_entries[key] = all_entries[key]
             else:
@@ -101,42 +608,38 @@ class PybtexInjector:
             logger.info("Not generating content bibliography (no matching entries)")
             return
 
-        template_name = "bibliography"
-        template = self.generator.get_template(template_name)
-        database = pybtex.database.BibliographyData(entries=content_entries)
+        generator.add_bibtex_files(content_entries.values())
+        generator.add_citations(content, content_entries.keys())
+        bibliography, labels = self._render_bibliography(
+            generator, content, content_entries
+        )
 
-        style = self.generator.settings.get("PYBTEX_FORMAT_STYLE", "plain")
-        if "pybtex_format_style" in content.metadata:
-            style = content.metadata.pop("pybtex_format_style").strip() or style
-
-        add_entry_fields = self.generator.settings.get("PYBTEX_ADD_ENTRY_FIELDS", [])
-        if "pybtex_add_entry_fields" in content.metadata:
-            add_entry_fields = (
-                content.metadata.pop("pybtex_add_entry_fields").strip()
-                or add_entry_fields
-            )
-
-        context = {
-            "publications": utils.generate_context(
-                [database],
-                style,
-                add_entry_fields,
-                self.generator.settings.get("PYGMENTS_RST_OPTIONS", {}),
+        # large bibliographies may be written apart, and loaded on demand
+        fragment_url = generator.add_bibliography_fragment(bibliography)
+        if fragment_url is not None:
+            context = {
+                "SITEURL": generator.settings.get("SITEURL", ""),
+                "fragment_url": fragment_url,
+                "fragment_entries": len(labels),
+            }
+            bibliography = generator.minify(
+                content.source_path,
+                generator.get_template("bibliography_fragment").render(context),
             )
-        }
-        content._content += template.render(context)  # noqa: SLF001
 
         # 6. replace each citation with a styled marker that links to the bibliography
-        # section that was created on step 5.
-        lk = {k["key"]: k["label"] for k in context["publications"]}
-
-        def _re_repl(matchobj):
-            key = matchobj.groups()[-1]
-            if key in lk:
-                return (
-                    f'<a title="click to jump to reference [{lk[key]}]"'
-                    f'href="#pybtex-{key}">[{lk[key]}]</a>'
-                )
-            return f'<span title="cannot find citation {key}">[{key}?]</span>'
+        # section that was created on step 5, and append that section.
+        content._content = (  # noqa: SLF001
+            "".join(
+                k if isinstance(k, str) else format_citation(k, labels) for k in tokens
+            )
+            + bibliography
+        )
 
-        content._content = CITE_RE.sub(_re_repl, content._content)  # noqa: SLF001
+        signals.pybtex_bibliography_injected.send(
+            content,
+            generator=generator,
+            citations=len(keys),
+            entries=len(labels),
+            elapsed=time.perf_counter() - start,
+        )
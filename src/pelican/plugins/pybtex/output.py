@@ -0,0 +1,173 @@
+# SPDX-FileCopyrightText: Copyright © 2024 André Anjos <andre.dos.anjos@gmail.com>
+# SPDX-License-Identifier: MIT
+"""Helpers to write generated files into the output directory."""
+
+import hashlib
+import json
+import logging
+import pathlib
+import re
+
+import pelican.utils
+
+logger = logging.getLogger(__name__)
+
+
+def digest(content: str) -> str:
+    """Compute the content hash of a text.
+
+    Parameters
+    ----------
+    content
+        The text to hash.
+
+    Returns
+    -------
+        The hexadecimal SHA-256 digest of the (UTF-8 encoded) text.
+    """
+
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+# elements whose contents must be preserved verbatim
+_VERBATIM_RE = re.compile(
+    r"(<(pre|textarea|script|style)\b.*?</\2\s*>)", re.DOTALL | re.IGNORECASE
+)
+
+_COMMENT_RE = re.compile(r"<!--(?!\[if).*?-->", re.DOTALL)
+
+# whitespace around these tags is never significant for rendering
+_BLOCK_TAG_RE = re.compile(
+    r"\s*(</?(?:article|body|br|dd|details|div|dl|dt|footer|h[1-6]|head|header|hr|"
+    r"html|li|link|meta|nav|ol|p|section|summary|table|tbody|td|th|thead|title|tr|ul)"
+    r"\b[^>]*>)\s*",
+    re.IGNORECASE,
+)
+
+
+def minify_html(html: str) -> str:
+    """Remove insignificant whitespace and comments from an HTML document.
+
+    Runs of whitespace are collapsed into a single space, and whitespace around
+    block-level tags is removed.  The contents of ``<pre>``, ``<textarea>``,
+    ``<script>`` and ``<style>`` elements are preserved verbatim.
+
+    Parameters
+    ----------
+    html
+        The HTML document (or fragment) to minify.
+
+    Returns
+    -------
+        The minified HTML.
+    """
+
+    parts = _VERBATIM_RE.split(html)
+
+    # split() returns text, then (element, tag name) for each verbatim element
+    retval = []
+    for k in range(0, len(parts), 3):
+        text = _COMMENT_RE.sub("", parts[k])
+        text = _BLOCK_TAG_RE.sub(r"\1", re.sub(r"\s+", " ", text))
+        retval.append(text)
+        if k + 1 < len(parts):
+            retval.append(parts[k + 1])
+
+    return "".join(retval).strip()
+
+
+def write_if_changed(output_path: pathlib.Path, name: str, content: str) -> bool:
+    """Write a file into the output directory, only if its contents changed.
+
+    Parameters
+    ----------
+    output_path
+        The output directory of the site.
+    name
+        The name of the file to write, relative to ``output_path``.
+    content
+        The contents of the file.
+
+    Returns
+    -------
+        ``True`` if the file was (re-)written, ``False`` if it already existed with
+        the same contents.
+    """
+
+    path = pathlib.Path(pelican.utils.sanitised_join(str(output_path), name))
+
+    if path.exists() and path.read_text(encoding="utf-8") == content:
+        logger.debug(f"Skipping unchanged `{path}`")
+        return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    logger.info(f"Writing `{path}`")
+    return True
+
+
+class Manifest:
+    """Content digests of files written on previous builds.
+
+    A manifest is persisted as a JSON file (typically under ``CACHE_PATH``), and
+    allows skipping the (expensive) rendering of output files whose inputs did not
+    change since they were last written.
+
+    Parameters
+    ----------
+    path
+        The path of the JSON file where the manifest is persisted.
+    """
+
+    def __init__(self, path: pathlib.Path):
+        self.path = path
+        self.digests: dict[str, str] = {}
+        if path.exists():
+            try:
+                self.digests = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError:
+                logger.warning(f"Ignoring corrupted manifest `{path}`")
+
+    def changed(self, output_path: pathlib.Path, name: str, digest: str) -> bool:
+        """Check if a file must be (re-)written.
+
+        Parameters
+        ----------
+        output_path
+            The output directory of the site.
+        name
+            The name of the file, relative to ``output_path``.
+        digest
+            A digest of all inputs used to render the file.
+
+        Returns
+        -------
+            ``True`` if the digest changed since the file was last written, or if the
+            file does not exist.
+        """
+
+        return (
+            self.digests.get(name) != digest
+            or not pathlib.Path(
+                pelican.utils.sanitised_join(str(output_path), name)
+            ).exists()
+        )
+
+    def update(self, name: str, digest: str) -> None:
+        """Record the digest of the inputs used to render a file.
+
+        Parameters
+        ----------
+        name
+            The name of the file, relative to the output directory.
+        digest
+            A digest of all inputs used to render the file.
+        """
+
+        self.digests[name] = digest
+
+    def save(self) -> None:
+        """Persist this manifest."""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.digests, indent=1), encoding="utf-8")
@@ -0,0 +1,249 @@
+# SPDX-FileCopyrightText: Copyright © 2024 André Anjos <andre.dos.anjos@gmail.com>
+# SPDX-License-Identifier: MIT
+"""Indexed queries over formatted publications, for use in templates."""
+
+import logging
+import re
+import typing
+
+import pybtex.database
+
+from . import utils
+
+logger = logging.getLogger(__name__)
+
+_KEYWORD_SEPARATOR_RE = re.compile(r"[,;]")
+
+Publication = dict[str, typing.Union[str, int]]
+"""A formatted entry (see :py:func:`.utils.generate_context`)."""
+
+
+def normalize(value: typing.Any) -> str:
+    """Normalize a value for indexing and lookups.
+
+    Parameters
+    ----------
+    value
+        The value to normalize.
+
+    Returns
+    -------
+        The value converted to a string, without (LaTeX) braces and surrounding
+        whitespace, and case-folded.
+    """
+
+    return str(value).replace("{", "").replace("}", "").strip().casefold()
+
+
+def _display(value: str) -> str:
+    """Return a value as displayed on pages, without (LaTeX) braces."""
+    return value.replace("{", "").replace("}", "").strip()
+
+
+class PublicationIndex:
+    """Indexes over formatted publications.
+
+    Formatted entries are bucketed by year, entry type, author last name, keyword,
+    and by the value of each field listed in ``PYBTEX_ADD_ENTRY_FIELDS``.  Buckets
+    keep positions on the list of publications, in declared order, so that queries
+    only need to intersect (small) buckets, instead of iterating over all entries.
+
+    Parameters
+    ----------
+    publications
+        Formatted entries, in declared order.
+    entries
+        The bibliography entries that were formatted, in the same order as
+        ``publications``.
+    extra_fields
+        Names of extra fields to index.
+    """
+
+    def __init__(
+        self,
+        publications: typing.Sequence[Publication],
+        entries: typing.Sequence[pybtex.database.Entry],
+        extra_fields: typing.Sequence[str] = (),
+    ):
+        self.publications = publications
+        self.buckets: dict[str, dict[str, list[int]]] = {
+            k: {} for k in ("year", "type", "author", "keyword", *extra_fields)
+        }
+        self.names: dict[str, dict[str, str]] = {k: {} for k in self.buckets}
+        self._memo: dict[tuple, tuple[int, ...]] = {}
+
+        # entries are indexed from their fields, so that (lazily) formatted entries
+        # are only formatted when selected by a query
+        for position, entry in enumerate(entries):
+            assert entry.fields is not None
+            assert entry.persons is not None
+
+            self._add("year", entry.fields.get("year", "0"), position)
+            self._add("type", entry.type, position)
+            for person in entry.persons.get("author", []):
+                self._add("author", " ".join(person.last_names), position)
+            for keyword in _KEYWORD_SEPARATOR_RE.split(
+                entry.fields.get("keywords", "")
+            ):
+                if keyword.strip():
+                    self._add("keyword", keyword, position)
+            for field in extra_fields:
+                if field in entry.fields:
+                    self._add(field, entry.fields[field], position)
+
+        # positions sorted from the newest to the oldest entry (stable)
+        dates = [
+            (
+                int(entry.fields.get("year", 0)),
+                utils.get_month_number(entry.fields.get("month", "unk")),
+            )
+            for entry in entries
+        ]
+        self._newest_first = sorted(
+            range(len(dates)), key=dates.__getitem__, reverse=True
+        )
+        self._rank = {k: i for i, k in enumerate(self._newest_first)}
+
+    def _add(self, kind: str, value: str, position: int) -> None:
+        """Add a position to a bucket."""
+        key = normalize(value)
+        positions = self.buckets[kind].setdefault(key, [])
+        # the same value may appear multiple times on an entry
+        if not positions or positions[-1] != position:
+            positions.append(position)
+        self.names[kind].setdefault(key, _display(value))
+
+    def _lookup(self, kind: str, values: typing.Any) -> set[int]:
+        """Return the positions of entries matching any of the given values."""
+
+        if isinstance(values, (str, int)):
+            values = [values]
+        retval: set[int] = set()
+        for value in values:
+            retval.update(self.buckets[kind].get(normalize(value), []))
+        return retval
+
+    def positions(  # noqa: PLR0913
+        self,
+        *,
+        year: typing.Any = None,
+        since: typing.Optional[int] = None,
+        until: typing.Optional[int] = None,
+        entry_type: typing.Any = None,
+        author: typing.Any = None,
+        keyword: typing.Any = None,
+        newest_first: bool = False,
+        **fields: typing.Any,
+    ) -> tuple[int, ...]:
+        """Return the positions of publications matching all criteria.
+
+        See :py:meth:`query` for a description of parameters.
+
+        Returns
+        -------
+            Positions on the list of publications.
+        """
+
+        unknown = [k for k in fields if k not in self.buckets]
+        if unknown:
+            logger.warning(
+                f"Cannot query publications by {', '.join(unknown)} (only fields "
+                f"listed in `PYBTEX_ADD_ENTRY_FIELDS` are indexed)"
+            )
+            return ()
+
+        memo_key = (
+            repr((year, since, until, entry_type, author, keyword, newest_first)),
+            repr(sorted(fields.items())),
+        )
+        if memo_key in self._memo:
+            return self._memo[memo_key]
+
+        selected: typing.Optional[set[int]] = None
+        criteria = [("year", year), ("type", entry_type), ("author", author)]
+        criteria += [("keyword", keyword), *fields.items()]
+        for kind, values in criteria:
+            if values is None:
+                continue
+            matches = self._lookup(kind, values)
+            selected = matches if selected is None else selected & matches
+
+        if since is not None or until is not None:
+            low = -1 if since is None else int(since)
+            high = 10**6 if until is None else int(until)
+            years = {
+                position
+                for value, positions in self.buckets["year"].items()
+                if value.isdigit() and low <= int(value) <= high
+                for position in positions
+            }
+            selected = years if selected is None else selected & years
+
+        if selected is None:
+            selected = set(range(len(self.publications)))
+
+        retval = tuple(
+            sorted(selected, key=self._rank.__getitem__)
+            if newest_first
+            else sorted(selected)
+        )
+        self._memo[memo_key] = retval
+        return retval
+
+    def query(  # noqa: PLR0913
+        self,
+        *,
+        year: typing.Any = None,
+        since: typing.Optional[int] = None,
+        until: typing.Optional[int] = None,
+        entry_type: typing.Any = None,
+        author: typing.Any = None,
+        keyword: typing.Any = None,
+        newest_first: bool = False,
+        limit: typing.Optional[int] = None,
+        **fields: typing.Any,
+    ) -> list[Publication]:
+        """Select publications matching all criteria.
+
+        Each criterion may be a single value, or a list of values (in which case
+        entries matching any of the values are selected).  Comparisons are
+        case-insensitive, and ignore (LaTeX) braces.
+
+        Parameters
+        ----------
+        year
+            Publication year(s).
+        since
+            First publication year (inclusive).
+        until
+            Last publication year (inclusive).
+        entry_type
+            Entry type(s), e.g. ``article`` or ``inproceedings``.
+        author
+            Author last name(s).
+        keyword
+            Keyword(s), as listed on the ``keywords`` field of entries.
+        newest_first
+            If set, sort results from the newest to the oldest entry, instead of
+            the declared order.
+        limit
+            If set, return at most this number of publications.
+        **fields
+            Values of extra fields listed in ``PYBTEX_ADD_ENTRY_FIELDS``.
+
+        Returns
+        -------
+            The selected publications.
+        """
+
+        positions = self.positions(
+            year=year,
+            since=since,
+            until=until,
+            entry_type=entry_type,
+            author=author,
+            keyword=keyword,
+            newest_first=newest_first,
+            **fields,
+        )
+        return [self.publications[k] for k in positions[:limit]]
@@ -0,0 +1,275 @@
+# SPDX-FileCopyrightText: Copyright © 2024 André Anjos <andre.dos.anjos@gmail.com>
+# SPDX-License-Identifier: MIT
+"""Full-text search index over bibliography entries, for client-side search.
+
+The index is a JSON document with an inverted index, mapping each term to the
+(sorted) positions of entries containing it, and a compact table with metadata of
+each entry, so that search results can be displayed without loading the
+publications page.  Terms are extracted from titles, author and editor names, venues
+and abstracts.  Terms and metadata of each entry are cached under ``CACHE_PATH``, keyed
+by a digest of the entry, so that only new or modified entries are tokenized on each
+build.
+"""
+
+import json
+import logging
+import pathlib
+import re
+import typing
+import unicodedata
+
+import pybtex.database
+import pybtex.richtext
+
+from . import output
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+"""Bumped whenever the structure of the index changes."""
+
+_TEXT_FIELDS = (
+    "title",
+    "booktitle",
+    "journal",
+    "publisher",
+    "school",
+    "institution",
+    "series",
+    "abstract",
+)
+
+_COMMAND_RE = re.compile(r"\\[A-Za-z]+\*?\s*|[$]")
+
+_TERM_RE = re.compile(r"\w{2,}")
+
+
+def plain_text(latex: str) -> str:
+    """Convert a LaTeX-formatted field value into plain text.
+
+    Parameters
+    ----------
+    latex
+        The field value.
+
+    Returns
+    -------
+        The value, with special characters decoded, and without braces and LaTeX
+        commands.
+    """
+
+    text = pybtex.richtext.Text.from_latex(latex).render_as("text")
+    return " ".join(_COMMAND_RE.sub(" ", text).split())
+
+
+def terms(text: str) -> list[str]:
+    """Split a text into search terms.
+
+    Terms are case-folded words of at least two characters, without accents.
+    Client-side search must normalize queries the same way.
+
+    Parameters
+    ----------
+    text
+        The (plain) text to split.
+
+    Returns
+    -------
+        The terms found on the text, in order, possibly repeated.
+    """
+
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(k for k in decomposed if not unicodedata.combining(k))
+    return _TERM_RE.findall(stripped)
+
+
+def _names(entry: pybtex.database.Entry, role: str) -> list[str]:
+    """Return plain-text names of persons on an entry."""
+
+    assert entry.persons is not None
+    return [
+        plain_text(
+            " ".join(
+                person.first_names
+                + person.middle_names
+                + person.prelast_names
+                + person.last_names
+            )
+        )
+        for person in entry.persons.get(role, [])
+    ]
+
+
+def entry_digest(entry: pybtex.database.Entry) -> str:
+    """Compute a digest of the searchable contents of an entry.
+
+    Parameters
+    ----------
+    entry
+        The entry to hash.
+
+    Returns
+    -------
+        A digest that changes if any field or person of the entry changes.
+    """
+
+    assert entry.fields is not None
+    assert entry.persons is not None
+    return output.digest(
+        json.dumps(
+            [
+                entry.type,
+                list(entry.fields.items()),
+                {k: [str(p) for p in v] for k, v in entry.persons.items()},
+            ],
+            ensure_ascii=False,
+        )
+    )
+
+
+def tokenize_entry(entry: pybtex.database.Entry) -> dict[str, typing.Any]:
+    """Extract the search terms and displayed metadata of an entry.
+
+    Parameters
+    ----------
+    entry
+        The entry to tokenize.
+
+    Returns
+    -------
+        A dictionary with the plain-text ``title`` and ``authors`` of the entry, and
+        its sorted (unique) search ``terms``.
+    """
+
+    assert entry.fields is not None
+    authors = _names(entry, "author")
+
+    retval: set[str] = set()
+    for field in _TEXT_FIELDS:
+        if field in entry.fields:
+            retval.update(terms(plain_text(entry.fields[field])))
+    for name in authors + _names(entry, "editor"):
+        retval.update(terms(name))
+
+    return {
+        "title": plain_text(entry.fields.get("title", "")),
+        "authors": ", ".join(authors),
+        "terms": sorted(retval),
+    }
+
+
+class TokenCache:
+    """Entries tokenized on previous builds.
+
+    The cache is persisted as a JSON file (typically under ``CACHE_PATH``), mapping
+    digests of entries (see :py:func:`entry_digest`) to their tokenization (see
+    :py:func:`tokenize_entry`).
+
+    Parameters
+    ----------
+    path
+        The path of the JSON file where the cache is persisted.
+    """
+
+    def __init__(self, path: pathlib.Path):
+        self.path = path
+        self.tokens: dict[str, dict[str, typing.Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        if path.exists():
+            try:
+                self.tokens = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError:
+                logger.warning(f"Ignoring corrupted search token cache `{path}`")
+        self._used: dict[str, dict[str, typing.Any]] = {}
+
+    def get(self, entry: pybtex.database.Entry) -> dict[str, typing.Any]:
+        """Return the tokenization of an entry, tokenizing it if not cached.
+
+        Parameters
+        ----------
+        entry
+            The entry to tokenize.
+
+        Returns
+        -------
+            The tokenization of the entry (see :py:func:`tokenize_entry`).
+        """
+
+        digest = entry_digest(entry)
+        if digest in self.tokens:
+            self.hits += 1
+            retval = self.tokens[digest]
+        else:
+            self.misses += 1
+            retval = tokenize_entry(entry)
+        self._used[digest] = retval
+        return retval
+
+    def save(self) -> None:
+        """Persist tokenizations of entries requested since this cache was loaded."""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(
+            json.dumps(self._used, ensure_ascii=False, separators=(",", ":")),
+            encoding="utf-8",
+        )
+
+
+def build_index(
+    entries: typing.Sequence[pybtex.database.Entry],
+    cache: TokenCache,
+    urls: typing.Optional[typing.Sequence[str]] = None,
+) -> dict[str, typing.Any]:
+    """Build a search index over bibliography entries.
+
+    Parameters
+    ----------
+    entries
+        The entries to index, in declared order.  Entries are identified by their
+        position on this sequence.
+    cache
+        The cache of tokenized entries.
+    urls
+        If set, the URL of the page of each entry.
+
+    Returns
+    -------
+        The search index, as a JSON-serializable dictionary with the keys:
+
+        * ``version``: the version of the index structure
+        * ``fields``: names of the columns of the metadata table (``key``,
+          ``title``, ``authors``, ``year``, and ``url``, if ``urls`` is set)
+        * ``entries``: the metadata table, with one row per entry
+        * ``terms``: a dictionary mapping each term to the sorted positions of
+          entries containing it
+    """
+
+    fields = ["key", "title", "authors", "year"]
+    if urls is not None:
+        fields.append("url")
+
+    rows: list[list[str]] = []
+    index: dict[str, list[int]] = {}
+    for position, entry in enumerate(entries):
+        assert entry.fields is not None
+        tokens = cache.get(entry)
+        row = [
+            entry.key,
+            tokens["title"],
+            tokens["authors"],
+            entry.fields.get("year", ""),
+        ]
+        if urls is not None:
+            row.append(urls[position])
+        rows.append(row)
+
+        for term in tokens["terms"]:
+            index.setdefault(term, []).append(position)
+
+    return {
+        "version": FORMAT_VERSION,
+        "fields": fields,
+        "entries": rows,
+        "terms": dict(sorted(index.items())),
+    }
@@ -0,0 +1,193 @@
+# SPDX-FileCopyrightText: Copyright © 2024 André Anjos <andre.dos.anjos@gmail.com>
+# SPDX-License-Identifier: MIT
+"""Cache parsed and formatted bibliographies across processes on the same host.
+
+This is a cross-process result cache: values are published as pickled files on a
+shared directory, named after a digest of their inputs.  The first process to need a
+value computes and publishes it, while holding an exclusive file lock.  Other
+processes wait on that lock, and then load their own copy of the published value.
+Work (parsing and formatting) is shared, but memory is not.
+
+As pickled files may execute code when loaded, the cache directory must be private:
+it is created with ``0700`` permissions, and it is not used if it can be written by
+other users.  Published files not owned by the current user are never loaded.  Files
+not used for a while are removed, so the directory does not grow forever.
+"""
+
+import logging
+import os
+import pathlib
+import pickle
+import stat
+import time
+import typing
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - e.g. on Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+T = typing.TypeVar("T")
+
+_FORMAT_VERSION = 1
+"""Bumped whenever the structure of cached values changes."""
+
+DEFAULT_MAX_AGE = 7.0
+"""Default number of days after which unused files are removed from the cache."""
+
+
+def _owned(info: os.stat_result) -> bool:
+    """Check if a file is owned by the current user.
+
+    Parameters
+    ----------
+    info
+        The status of the file.
+
+    Returns
+    -------
+        ``True`` if the file is owned by the current user, or if the platform does not
+        support user identifiers.  ``False`` otherwise.
+    """
+
+    return not hasattr(os, "getuid") or info.st_uid == os.getuid()
+
+
+class SharedCache:
+    """A cache directory shared by multiple processes.
+
+    Parameters
+    ----------
+    path
+        The directory where values are published.  It is created (only accessible by
+        the current user) if it does not exist.
+    max_age
+        Number of days after which files that were not used are removed from the
+        directory.
+    """
+
+    def __init__(self, path: pathlib.Path, max_age: float = DEFAULT_MAX_AGE):
+        self.path = path
+        self.path.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+        info = self.path.stat()
+        self.enabled = _owned(info) and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+        if not self.enabled:
+            logger.warning(
+                f"Shared `pybtex` cache directory `{path}` may be written by other "
+                f"users - not using it (choose a directory only you can write to)"
+            )
+            return
+
+        if fcntl is None:
+            logger.warning(
+                "File locking is not available on this platform - processes sharing "
+                "the `pybtex` cache may compute the same values concurrently"
+            )
+
+        self.prune(max_age)
+
+    def prune(self, max_age: float) -> None:
+        """Remove files not used for a while from the cache directory.
+
+        A removed lock file may, at worst, let two processes compute the same value
+        concurrently.  Published values are replaced atomically, so that is harmless.
+
+        Parameters
+        ----------
+        max_age
+            Number of days after which files that were not used are removed.
+        """
+
+        oldest = time.time() - max_age * 24 * 60 * 60
+        for k in self.path.iterdir():
+            if k.suffix not in (".pickle", ".lock", ".tmp"):
+                continue
+            try:
+                if k.stat().st_mtime < oldest:
+                    k.unlink()
+                    logger.debug(f"Removed unused shared `pybtex` cache `{k}`")
+            except OSError:  # e.g. concurrently removed by another process
+                continue
+
+    def _load(self, path: pathlib.Path) -> tuple[bool, typing.Any]:
+        """Load a published value.
+
+        Parameters
+        ----------
+        path
+            The path of the published value.
+
+        Returns
+        -------
+            A tuple indicating if the value was loaded, and the value itself.  Values
+            are not loaded if they were not published yet, or if they were not
+            published by the current user.
+        """
+
+        try:
+            f = path.open("rb")
+        except FileNotFoundError:
+            return False, None
+
+        with f:
+            if not _owned(os.fstat(f.fileno())):
+                logger.warning(
+                    f"Shared `pybtex` cache `{path}` is owned by another user - "
+                    f"ignoring it"
+                )
+                return False, None
+            logger.debug(f"Loading shared `pybtex` cache `{path}`")
+            value = pickle.load(f)
+
+        # marks the value as recently used, so it is not pruned
+        path.touch()
+        return True, value
+
+    def get_or_compute(self, key: str, compute: typing.Callable[[], T]) -> T:
+        """Retrieve a value from the cache, computing and publishing it if needed.
+
+        Parameters
+        ----------
+        key
+            A digest of all inputs used to compute the value.
+        compute
+            A callable computing the value, if it is not yet published.  The value
+            must be picklable.
+
+        Returns
+        -------
+            The (possibly cached) value.
+        """
+
+        if not self.enabled:
+            return compute()
+
+        data = self.path / f"{key}-v{_FORMAT_VERSION}.pickle"
+
+        # fast path: values are published atomically, so no locking is required
+        loaded, value = self._load(data)
+        if loaded:
+            return value
+
+        with (self.path / f"{key}.lock").open("a+b") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                # another process may have published the value while we waited
+                loaded, value = self._load(data)
+                if loaded:
+                    return value
+
+                value = compute()
+                temporary = data.with_name(f"{data.name}.{os.getpid()}.tmp")
+                with temporary.open("wb") as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                temporary.replace(data)
+                logger.debug(f"Published shared `pybtex` cache `{data}`")
+                return value
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
@@ -1,7 +1,63 @@
 # SPDX-FileCopyrightText: Copyright © 2024 André Anjos <andre.dos.anjos@gmail.com>
 # SPDX-License-Identifier: MIT
-"""Signals produced by this plugin."""
+"""Signals produced by this plugin.
+
+Besides :py:data:`pybtex_generator_init`, signals are sent around each phase of the
+plugin pipeline, so that other plugins may record metrics, or extend the pipeline.
+Signals carrying an ``elapsed`` keyword argument report the duration of the phase,
+in seconds.
+"""
 
 import pelican.plugins.signals
 
 pybtex_generator_init = pelican.plugins.signals.signal("pybtex_generator_init")
+"""Sent (with the generator) once the generator is initialized."""
+
+pybtex_sources_loaded = pelican.plugins.signals.signal("pybtex_sources_loaded")
+"""Sent (with the generator) once global sources are loaded.
+
+Keyword arguments: ``bibdata`` (the loaded databases), ``sources`` and ``entries``
+(number of loaded databases and entries), and ``elapsed``.
+"""
+
+pybtex_labels_computed = pelican.plugins.signals.signal("pybtex_labels_computed")
+"""Sent (with the :py:class:`.utils.LabelService`) once global labels are computed.
+
+Keyword arguments: ``style`` (the formatting style), ``labels`` (the number of
+computed labels), and ``elapsed``.
+"""
+
+pybtex_entries_formatting = pelican.plugins.signals.signal("pybtex_entries_formatting")
+"""Sent before entries are formatted.
+
+Keyword arguments: ``entries`` (the entries to format), ``labels`` (their labels),
+``style`` (the formatting style), ``extra_fields``, ``html_formatter_options``,
+``bibtex_url`` and ``max_authors`` (see :py:func:`.utils.generate_context`).  A
+receiver may return a list of formatted entries (one for each entry, in order), that
+is used instead of formatting entries.
+"""
+
+pybtex_entries_formatted = pelican.plugins.signals.signal("pybtex_entries_formatted")
+"""Sent once entries are formatted.
+
+Keyword arguments: ``publications`` (the formatted entries), ``entries`` (the number
+of formatted entries), ``replaced`` (``True`` if formatted entries were returned by a
+receiver of :py:data:`pybtex_entries_formatting`), and ``elapsed``.
+"""
+
+pybtex_context_ready = pelican.plugins.signals.signal("pybtex_context_ready")
+"""Sent (with the generator) once the generator context is populated.
+
+Keyword arguments: ``context`` (the generator context), ``entries`` (the number of
+global entries), and ``elapsed``.
+"""
+
+pybtex_bibliography_injected = pelican.plugins.signals.signal(
+    "pybtex_bibliography_injected"
+)
+"""Sent (with the content object) once its bibliography is injected.
+
+Keyword arguments: ``generator`` (the generator responsible for the content),
+``citations`` (the number of citations), ``entries`` (the number of entries on the
+bibliography), and ``elapsed``.
+"""
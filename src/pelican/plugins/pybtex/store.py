@@ -0,0 +1,313 @@
+# SPDX-FileCopyrightText: Copyright © 2024 André Anjos <andre.dos.anjos@gmail.com>
+# SPDX-License-Identifier: MIT
+"""SQLite-backed bibliography store for very large databases.
+
+A store keeps one row per bibliography entry, with its key, type, fields, persons
+and a content hash.  Entries are indexed by key, year and author last names, so that
+only a small subset of a very large database needs to be loaded at build time.
+"""
+
+import hashlib
+import json
+import logging
+import pathlib
+import sqlite3
+import typing
+
+import pybtex.database
+
+logger = logging.getLogger(__name__)
+
+SCHEME = "sqlite:"
+"""Prefix identifying SQLite stores on ``PYBTEX_SOURCES``."""
+
+_NAME_PARTS = (
+    "first_names",
+    "middle_names",
+    "prelast_names",
+    "last_names",
+    "lineage_names",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    position INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    type TEXT NOT NULL,
+    year INTEGER,
+    fields TEXT NOT NULL,
+    persons TEXT NOT NULL,
+    hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_year ON entries (year);
+CREATE TABLE IF NOT EXISTS authors (
+    key TEXT NOT NULL COLLATE NOCASE,
+    last_name TEXT NOT NULL COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS authors_last_name ON authors (last_name);
+CREATE INDEX IF NOT EXISTS authors_key ON authors (key);
+"""
+
+
+def _encode(entry: pybtex.database.Entry) -> tuple[str, str, str]:
+    """Encode the fields and persons of an entry for storage.
+
+    Parameters
+    ----------
+    entry
+        The entry to encode.
+
+    Returns
+    -------
+        A tuple containing the JSON-encoded fields, persons, and a content hash.
+    """
+
+    assert entry.fields is not None
+    assert entry.persons is not None
+
+    fields = json.dumps(list(entry.fields.items()), ensure_ascii=False)
+    persons = json.dumps(
+        {
+            role: [[getattr(p, k) for k in _NAME_PARTS] for p in people]
+            for role, people in entry.persons.items()
+        },
+        ensure_ascii=False,
+    )
+    digest = hashlib.sha256(
+        "\0".join((entry.type, fields, persons)).encode("utf-8")
+    ).hexdigest()
+
+    return fields, persons, digest
+
+
+def _decode(key: str, type_: str, fields: str, persons: str) -> pybtex.database.Entry:
+    """Rebuild an entry from its stored representation.
+
+    Parameters
+    ----------
+    key
+        The entry key.
+    type_
+        The entry type.
+    fields
+        The JSON-encoded entry fields.
+    persons
+        The JSON-encoded entry persons.
+
+    Returns
+    -------
+        The rebuilt entry.
+    """
+
+    people: dict[str, list[pybtex.database.Person]] = {}
+    for role, names in json.loads(persons).items():
+        people[role] = []
+        for parts in names:
+            person = pybtex.database.Person()
+            for attribute, value in zip(_NAME_PARTS, parts):
+                setattr(person, attribute, value)
+            people[role].append(person)
+
+    retval = pybtex.database.Entry(type_, fields=json.loads(fields), persons=people)
+    # pybtex only sets keys when adding entries to a database
+    retval.key = key
+    return retval
+
+
+def _year(entry: pybtex.database.Entry) -> typing.Optional[int]:
+    """Extract the (numeric) year of an entry, if available.
+
+    Parameters
+    ----------
+    entry
+        The entry to inspect.
+
+    Returns
+    -------
+        The year of the entry, or ``None``, if not available or not numeric.
+    """
+
+    assert entry.fields is not None
+    try:
+        return int(entry.fields.get("year", ""))
+    except ValueError:
+        return None
+
+
+def _last_name(person: pybtex.database.Person) -> str:
+    """Return the searchable last name of a person.
+
+    Parameters
+    ----------
+    person
+        The person to inspect.
+
+    Returns
+    -------
+        The last name parts of the person, joined by spaces, without braces.
+    """
+
+    return " ".join(person.last_names).replace("{", "").replace("}", "")
+
+
+def import_bibdata(
+    path: pathlib.Path, bibdata: pybtex.database.BibliographyData
+) -> int:
+    """Import (or update) entries from a bibliography database into a store.
+
+    Entries are identified by their key.  Entries with unchanged contents are not
+    rewritten.  New entries are appended after existing ones, preserving the declared
+    order.
+
+    Parameters
+    ----------
+    path
+        The path of the SQLite store.  It is created if it does not exist.
+    bibdata
+        The bibliography database to import.
+
+    Returns
+    -------
+        The number of entries inserted or updated.
+    """
+
+    connection = sqlite3.connect(path)
+    try:
+        with connection:
+            connection.executescript(_SCHEMA)
+            hashes = dict(connection.execute("SELECT key, hash FROM entries"))
+            changed = 0
+            for key, entry in bibdata.entries.items():
+                fields, persons, digest = _encode(entry)
+                if hashes.get(key) == digest:
+                    continue
+                connection.execute(
+                    "INSERT INTO entries (key, type, year, fields, persons, hash) "
+                    "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                    "type = excluded.type, year = excluded.year, "
+                    "fields = excluded.fields, persons = excluded.persons, "
+                    "hash = excluded.hash",
+                    (key, entry.type, _year(entry), fields, persons, digest),
+                )
+                connection.execute("DELETE FROM authors WHERE key = ?", (key,))
+                connection.executemany(
+                    "INSERT INTO authors (key, last_name) VALUES (?, ?)",
+                    [(key, _last_name(p)) for p in entry.persons.get("author", [])],
+                )
+                changed += 1
+    finally:
+        connection.close()
+
+    return changed
+
+
+class SqliteStore:
+    """Read-only access to a SQLite bibliography store.
+
+    Parameters
+    ----------
+    path
+        The path of the SQLite store.
+    """
+
+    def __init__(self, path: pathlib.Path):
+        self.path = path
+        self._connection = sqlite3.connect(
+            f"{path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False
+        )
+
+    def close(self) -> None:
+        """Close the connection to the store."""
+        self._connection.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def select(
+        self,
+        keys: typing.Optional[typing.Sequence[str]] = None,
+        authors: typing.Optional[typing.Sequence[str]] = None,
+        years: typing.Optional[tuple[int, int]] = None,
+    ) -> pybtex.database.BibliographyData:
+        """Select a subset of the entries in this store.
+
+        All criteria that are set must match for an entry to be selected.  If no
+        criteria is set, then all entries are selected.
+
+        Parameters
+        ----------
+        keys
+            Keys of entries to select.
+        authors
+            Last names of authors.  Entries with at least one author in this list are
+            selected.
+        years
+            A tuple with the first and last years (inclusive) of entries to select.
+
+        Returns
+        -------
+            A bibliography database with the selected entries, in declared order.
+        """
+
+        where: list[str] = []
+        parameters: list[typing.Union[str, int]] = []
+
+        if keys is not None:
+            where.append("key IN (SELECT value FROM json_each(?))")
+            parameters.append(json.dumps(list(keys)))
+
+        if authors is not None:
+            where.append(
+                "key IN (SELECT key FROM authors WHERE last_name IN "
+                "(SELECT value FROM json_each(?)))"
+            )
+            parameters.append(json.dumps(list(authors)))
+
+        if years is not None:
+            where.append("year BETWEEN ? AND ?")
+            parameters.extend(years)
+
+        query = "SELECT key, type, fields, persons FROM entries"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY position"
+
+        return pybtex.database.BibliographyData(
+            entries={
+                key: _decode(key, type_, fields, persons)
+                for key, type_, fields, persons in self._connection.execute(
+                    query, parameters
+                )
+            }
+        )
+
+    def fetch(self, keys: typing.Iterable[str]) -> dict[str, pybtex.database.Entry]:
+        """Fetch entries by key, using the key index.
+
+        Parameters
+        ----------
+        keys
+            Keys of the entries to fetch.
+
+        Returns
+        -------
+            A dictionary mapping keys to entries.  Keys are matched ignoring case (as
+            by BibTeX), and the output is keyed by the requested spelling.  Keys that
+            cannot be found in this store are not present on the output.
+        """
+
+        # keys are indexed ignoring case, and cited keys may differ in case
+        requested: dict[str, list[str]] = {}
+        for key in keys:
+            requested.setdefault(key.lower(), []).append(key)
+
+        retval: dict[str, pybtex.database.Entry] = {}
+        for key, type_, fields, persons in self._connection.execute(
+            "SELECT key, type, fields, persons FROM entries "
+            "WHERE key IN (SELECT value FROM json_each(?))",
+            (json.dumps([k for v in requested.values() for k in v]),),
+        ):
+            entry = _decode(key, type_, fields, persons)
+            for spelling in requested.get(key.lower(), []):
+                retval[spelling] = entry
+        return retval
@@ -7,7 +7,16 @@ types.
 import pybtex.database
 from pybtex.style.formatting import toplevel
 import pybtex.style.formatting.unsrt
-from pybtex.style.template import field, node, optional, sentence, tag, words
+from pybtex.style.template import (
+    FieldIsMissing,
+    field,
+    join,
+    node,
+    optional,
+    sentence,
+    tag,
+    words,
+)
 
 # format month by converting integers to month name
 _MONTH_NAMES = {
@@ -46,6 +55,40 @@ def _month_field(children, data):
 pybtex.style.formatting.unsrt.date = words[_month_field(), field("year")]
 
 
+class EtAl(pybtex.database.Person):
+    """Marks a list of persons truncated before formatting (see
+    :py:func:`.utils.truncate_persons`).
+    """
+
+    def __init__(self):
+        super().__init__(last="others")
+
+
+@node
+def _names(children, context, role, **kwargs):
+    """Format names, rendering a truncated list of persons with "et al."."""
+    assert not children
+
+    try:
+        persons = context["entry"].persons[role]
+    except KeyError:
+        raise FieldIsMissing(role, context["entry"]) from None
+
+    if not persons or not isinstance(persons[-1], EtAl):
+        return _original_names(role, **kwargs).format_data(context)
+
+    style = context["style"]
+    formatted_names = [
+        style.format_name(person, style.abbreviate_names) for person in persons[:-1]
+    ]
+    return words[join(sep=", ")[formatted_names], "et al."].format_data(context)
+
+
+# Ensures truncated lists of persons end with "et al."
+_original_names = pybtex.style.formatting.unsrt.names
+pybtex.style.formatting.unsrt.names = _names
+
+
 def _monkeypatch_method(cls):
     def decorator(func):
         setattr(cls, func.__name__, func)
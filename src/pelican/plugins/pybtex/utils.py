@@ -2,23 +2,57 @@
 # SPDX-License-Identifier: MIT
 """Common utilities to load and format bibliography entries."""
 
+import bz2
+import collections
+import collections.abc
+import contextlib
+import copy
+import datetime
+import functools
+import gzip
+import hashlib
 import importlib
+import inspect
+import itertools
+import json
+import locale
 import logging
+import lzma
 import pathlib
+import re
+import sqlite3
+import sys
+import threading
+import time
 import typing
 
 import pygments.formatters
 import pygments.lexers
+import yaml
 
 import pybtex.backends.html
 import pybtex.database
 import pybtex.database.input.bibtex
+import pybtex.database.input.bibyaml
 import pybtex.style.formatting
+import pybtex.style.labels.number
+
+from . import compiled, csljson, signals, store
+
+try:
+    import babel
+    import babel.dates
+except ImportError:  # pragma: no cover - babel is an optional dependency
+    babel = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
 
-def _resolve(name: pathlib.Path, paths: typing.Sequence[pathlib.Path]) -> pathlib.Path:
+def _resolve(
+    name: pathlib.Path,
+    paths: typing.Sequence[pathlib.Path],
+    exists: typing.Callable[[pathlib.Path], bool] = pathlib.Path.exists,
+) -> pathlib.Path:
     """Search for a file named ``name`` and returns the first occurence.
 
     Parameters
@@ -28,6 +62,8 @@ def _resolve(name: pathlib.Path, paths: typing.Sequence[pathlib.Path]) -> pathli
         the path is returned as is.
     paths
         All paths to consider when searching.
+    exists
+        A callable that checks if a given path exists.
 
     Returns
     -------
@@ -38,50 +74,876 @@ def _resolve(name: pathlib.Path, paths: typing.Sequence[pathlib.Path]) -> pathli
         return name
 
     for p in paths:
-        if (p / name).exists():
+        if exists(p / name):
             return p / name
 
     return name
 
 
+class SourceResolver:
+    """Build-scoped cache for bibliography source lookups.
+
+    Each directory visited while searching for sources is listed once, and its
+    contents kept for the lifetime of this object, so that missing names never touch
+    the filesystem again.  Names found on a listing are still checked with
+    :py:meth:`pathlib.Path.exists`, as they may differ in case (on case-insensitive
+    filesystems), or be broken symbolic links.  Resolved names are also memoized, so
+    that repeated lookups of the same source (e.g. from multiple articles) never touch
+    the filesystem twice.  Create a new object per build to pick-up changes on the
+    filesystem.
+    """
+
+    def __init__(self):
+        self._listings: dict[pathlib.Path, frozenset[str]] = {}
+        self._resolved: dict[
+            tuple[pathlib.Path, tuple[pathlib.Path, ...]], pathlib.Path
+        ] = {}
+
+    def _listing(self, directory: pathlib.Path) -> frozenset[str]:
+        """Return a (cached) snapshot of the names inside a directory.
+
+        Parameters
+        ----------
+        directory
+            The directory to list.
+
+        Returns
+        -------
+            Case-folded names of all files and directories inside ``directory``, or
+            an empty set, if it cannot be listed.
+        """
+
+        if directory not in self._listings:
+            try:
+                self._listings[directory] = frozenset(
+                    [k.name.casefold() for k in directory.iterdir()]
+                )
+            except OSError:
+                self._listings[directory] = frozenset()
+        return self._listings[directory]
+
+    def exists(self, path: pathlib.Path) -> bool:
+        """Check if a path exists, using cached directory listings.
+
+        Parameters
+        ----------
+        path
+            The path to check.
+
+        Returns
+        -------
+            ``True`` if the path is on its parent directory snapshot (ignoring case),
+            and it exists (e.g. it is not a broken symbolic link).
+        """
+
+        return path.name.casefold() in self._listing(path.parent) and path.exists()
+
+    def resolve(
+        self, name: pathlib.Path, paths: typing.Sequence[pathlib.Path]
+    ) -> pathlib.Path:
+        """Search for a file named ``name`` and returns the first occurence.
+
+        Parameters
+        ----------
+        name
+            The name to search for - may contain folder separators.  If it is
+            absolute, then the path is returned as is.
+        paths
+            All paths to consider when searching.
+
+        Returns
+        -------
+            The path to a file that exists, or ``name`` itself, if a match cannot be
+            found.
+        """
+
+        key = (name, tuple(paths))
+        if key not in self._resolved:
+            self._resolved[key] = _resolve(name, paths, self.exists)
+        return self._resolved[key]
+
+
+_SIZE_SUFFIXES = {"": 1, "k": 2**10, "m": 2**20, "g": 2**30}
+
+
+def parse_size(value: typing.Union[int, str]) -> int:
+    """Parse a size in bytes, optionally with a ``K``, ``M`` or ``G`` suffix.
+
+    Parameters
+    ----------
+    value
+        The size to parse (e.g. ``1048576``, or ``"512M"``).
+
+    Returns
+    -------
+        The size, in bytes.
+
+    Raises
+    ------
+    ValueError
+        If the size cannot be parsed.
+    """
+
+    if isinstance(value, int):
+        return value
+
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([kmg]?)i?b?\s*", value.lower())
+    if match is None:
+        raise ValueError(value)
+    return int(float(match.group(1)) * _SIZE_SUFFIXES[match.group(2)])
+
+
+def deep_sizeof(value: typing.Any) -> int:
+    """Estimate the memory used by an object, and all objects it refers to.
+
+    Parameters
+    ----------
+    value
+        The object to measure (e.g. a formatted entry, or a bibliography database).
+
+    Returns
+    -------
+        The estimated size, in bytes.
+    """
+
+    retval = 0
+    seen: set[int] = set()
+    pending = [value]
+    while pending:
+        current = pending.pop()
+        if id(current) in seen or isinstance(current, type):
+            continue
+        seen.add(id(current))
+        retval += sys.getsizeof(current)
+        if isinstance(current, (str, bytes, int, float, bool)) or current is None:
+            continue
+        if isinstance(current, dict):
+            pending.extend(current.keys())
+            pending.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            pending.extend(current)
+        if hasattr(current, "__dict__"):
+            pending.append(vars(current))
+
+    return retval
+
+
+class ProcessCache:
+    """A thread-safe, process-wide cache with versioned slots.
+
+    Each slot (identified by a name) holds a single value, tagged with a version
+    (e.g. the modification time and size of a file).  Storing a new version on a slot
+    replaces the previous one, so that stale values do not accumulate in long-running
+    processes (e.g. while Pelican auto-reloads, or builds multiple sites).
+
+    If a budget is set, the total (estimated) size of cached values is bounded, and
+    the least recently used slots are evicted to make room for new values.
+
+    Parameters
+    ----------
+    budget
+        The maximum size of cached values, in bytes.  If not set, the cache is not
+        bounded.
+    name
+        The name of this cache, for reporting.
+    """
+
+    def __init__(self, budget: typing.Optional[int] = None, name: str = "process"):
+        self._slots: collections.OrderedDict[
+            typing.Hashable, tuple[typing.Hashable, typing.Any, int]
+        ] = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.budget = budget
+        self.name = name
+        self.size = 0
+        self.peak = 0
+        self.evictions = 0
+
+    def get(self, name: typing.Hashable, version: typing.Hashable) -> typing.Any:
+        """Retrieve a value from the cache.
+
+        Parameters
+        ----------
+        name
+            The name of the slot.
+        version
+            The expected version of the value.
+
+        Returns
+        -------
+            The cached value, or ``None``, if the slot is empty, or holds a
+            different version.
+        """
+
+        with self._lock:
+            if name not in self._slots:
+                return None
+            cached_version, value, _ = self._slots[name]
+            if cached_version != version:
+                return None
+            if self.budget is not None:
+                self._slots.move_to_end(name)
+            return value
+
+    def put(self, name: typing.Hashable, version: typing.Hashable, value: typing.Any):
+        """Store a value on the cache, replacing any previous version.
+
+        Parameters
+        ----------
+        name
+            The name of the slot.
+        version
+            The version of the value.
+        value
+            The value to store.
+        """
+
+        size = deep_sizeof(value) if self.budget is not None else 0
+
+        with self._lock:
+            if name in self._slots:
+                self.size -= self._slots.pop(name)[2]
+
+            if self.budget is not None and size > self.budget:
+                logger.debug(
+                    f"Not caching `{name}` ({size} bytes) on the `{self.name}` cache, "
+                    f"as it exceeds the budget of {self.budget} bytes"
+                )
+                return
+
+            self._slots[name] = (version, value, size)
+            self.size += size
+
+            while self.budget is not None and self.size > self.budget:
+                evicted, (_, _, evicted_size) = self._slots.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+                logger.debug(
+                    f"Evicted `{evicted}` ({evicted_size} bytes) from the "
+                    f"`{self.name}` cache"
+                )
+
+            self.peak = max(self.peak, self.size)
+
+    def discard(self, name: typing.Hashable):
+        """Remove a value from the cache, if present.
+
+        Parameters
+        ----------
+        name
+            The name of the slot.
+        """
+
+        with self._lock:
+            if name in self._slots:
+                self.size -= self._slots.pop(name)[2]
+
+    def clear(self):
+        """Remove all values from the cache."""
+
+        with self._lock:
+            self._slots.clear()
+            self.size = 0
+
+    def log_stats(self):
+        """Report the peak memory usage and number of evictions of this cache."""
+
+        logger.info(
+            f"`{self.name}` cache: peak usage of {self.peak} bytes (budget: "
+            f"{self.budget} bytes), {self.evictions} eviction(s)"
+        )
+
+
+process_cache = ProcessCache()
+"""Cache shared by all generators in this process (see :py:class:`ProcessCache`)."""
+
+
+def _version(path: pathlib.Path) -> tuple[int, ...]:
+    """Compute the version of a file, for caching purposes.
+
+    Parameters
+    ----------
+    path
+        The path of the file.
+
+    Returns
+    -------
+        The modification time and size of the file.  For compiled databases, the
+        modification time and size of their source is also included, as it may be
+        parsed instead.
+    """
+
+    stat = path.stat()
+    retval: tuple[int, ...] = (stat.st_mtime_ns, stat.st_size)
+    if path.suffix == compiled.SUFFIX:
+        with contextlib.suppress(compiled.CompiledFormatError):
+            source = compiled.source(path)
+            if source.is_file():
+                stat = source.stat()
+                retval += (stat.st_mtime_ns, stat.st_size)
+    return retval
+
+
+COMPRESSED_SUFFIXES: dict[str, typing.Callable[..., typing.IO]] = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+}
+"""File name suffixes of compressed sources, and functions to open them."""
+
+
+def _read_text(path: pathlib.Path) -> str:
+    """Read the (UTF-8 encoded) contents of a source.
+
+    Compressed sources (see :py:data:`COMPRESSED_SUFFIXES`) are decompressed while
+    reading, without creating temporary files.  As parsers require the whole text,
+    the decoded contents of a source are kept in memory while it is parsed.
+
+    Parameters
+    ----------
+    path
+        The path of the file to read.
+
+    Returns
+    -------
+        The contents of the file.
+
+    Raises
+    ------
+    pybtex.database.PybtexError
+        If the file cannot be decompressed or decoded.
+    """
+
+    try:
+        if path.suffix in COMPRESSED_SUFFIXES:
+            with COMPRESSED_SUFFIXES[path.suffix](
+                path, "rt", encoding="utf-8-sig"
+            ) as f:
+                return f.read()
+
+        return path.read_text(encoding="utf-8-sig")
+    except (OSError, EOFError, lzma.LZMAError, UnicodeDecodeError) as e:
+        raise pybtex.database.PybtexError(str(e), filename=str(path)) from e
+
+
+SOURCE_FORMATS: dict[str, tuple[str, ...]] = {
+    "bibtex": (".bib", ".bibtex"),
+    "yaml": (".yaml", ".yml", ".bibyaml"),
+    "csljson": (".json",),
+}
+"""Formats of (text) sources, and file name suffixes detected as each format."""
+
+
+def split_source(source: str) -> tuple[str, str]:
+    """Split a source declaration into its format and file name.
+
+    Sources may be prefixed by their format (e.g. ``csljson:refs.txt``), or by
+    ``sqlite:``, for SQLite stores (see :py:mod:`.store`).
+
+    Parameters
+    ----------
+    source
+        The source, as declared on ``PYBTEX_SOURCES`` (or ``pybtex_sources``).
+
+    Returns
+    -------
+        The format of the source (``sqlite``, one of :py:data:`SOURCE_FORMATS`, or an
+        empty string, if not declared), and its file name.
+    """
+
+    prefix, separator, filename = source.partition(":")
+    if separator and (prefix in SOURCE_FORMATS or source.startswith(store.SCHEME)):
+        return prefix, filename
+    return "", source
+
+
+def _source_format(path: pathlib.Path) -> str:
+    """Detect the format of a source from its file name suffix.
+
+    Suffixes of compressed sources (see :py:data:`COMPRESSED_SUFFIXES`) are ignored.
+    Sources with unknown suffixes are considered BibTeX.
+    """
+
+    suffixes = [k.lower() for k in path.suffixes]
+    if suffixes and suffixes[-1] in COMPRESSED_SUFFIXES:
+        suffixes.pop()
+    for name, known in SOURCE_FORMATS.items():
+        if suffixes and suffixes[-1] in known:
+            return name
+    return "bibtex"
+
+
+def _parse(path: pathlib.Path, fmt: str = "") -> pybtex.database.BibliographyData:
+    """Parse a single bibliography database from file.
+
+    Compiled databases (see :py:mod:`.compiled`) are loaded directly, unless their
+    original source changed after compilation, or they are corrupted, in which case
+    the source is parsed instead.  Any other file is parsed according to its format
+    (possibly compressed, see :py:func:`_read_text`): BibTeX, pybtex's YAML format,
+    or CSL-JSON (see :py:mod:`.csljson`).
+
+    Parameters
+    ----------
+    path
+        The path of the file to parse.
+    fmt
+        The format of the file (one of :py:data:`SOURCE_FORMATS`).  If not set, it
+        is detected from the file name.
+
+    Returns
+    -------
+        The parsed bibliography database.
+    """
+
+    if path.suffix == compiled.SUFFIX:
+        try:
+            source = compiled.stale_source(path)
+            if source is None:
+                return compiled.load(path)
+            logger.warning(
+                f"Source `{source}` of compiled `pybtex` file `{path}` changed - "
+                f"parsing source instead (re-compile it to speed-up loading)"
+            )
+        except compiled.CompiledFormatError as e:
+            # fails too if the header, holding the source path, is corrupted
+            source = compiled.source(path)
+            if not source.is_file():
+                raise
+            logger.warning(
+                f"Compiled `pybtex` file `{path}` is corrupted ({e}) - parsing its "
+                f"source `{source}` instead (re-compile it to speed-up loading)"
+            )
+        path = source
+        fmt = ""
+
+    fmt = fmt or _source_format(path)
+    text = _read_text(path)
+
+    if fmt == "csljson":
+        return csljson.parse_string(text)
+
+    if fmt == "yaml":
+        try:
+            return pybtex.database.input.bibyaml.Parser().parse_stream(text)
+        except (yaml.YAMLError, KeyError, TypeError, AttributeError) as e:
+            raise pybtex.database.PybtexError(repr(e), filename=str(path)) from e
+
+    parser = pybtex.database.input.bibtex.Parser()
+    parser.filename = str(path)
+    return parser.parse_string(text)
+
+
+_SELECT_PARAMETERS = frozenset(
+    list(inspect.signature(store.SqliteStore.select).parameters)[1:]
+)
+"""Criteria supported by :py:meth:`.store.SqliteStore.select`."""
+
+
+def _select_store(
+    path: pathlib.Path, source: str, select: typing.Optional[dict[str, typing.Any]]
+) -> typing.Optional[pybtex.database.BibliographyData]:
+    """Select entries from a SQLite store, logging errors.
+
+    Parameters
+    ----------
+    path
+        The path of the store.
+    source
+        The source, as declared.
+    select
+        Criteria to select a subset of entries (see
+        :py:meth:`.store.SqliteStore.select`).  If not set, all entries are loaded.
+
+    Returns
+    -------
+        The selected entries, or ``None``, if the criteria are not supported, or if
+        the store cannot be read.
+    """
+
+    unknown = sorted(set(select or {}) - _SELECT_PARAMETERS)
+    if unknown:
+        logger.error(
+            f"`pybtex` plugin cannot select entries of store `{source}` by "
+            f"{', '.join(unknown)} (supported criteria are "
+            f"{', '.join(sorted(_SELECT_PARAMETERS))})"
+        )
+        return None
+
+    try:
+        with contextlib.closing(store.SqliteStore(path)) as db:
+            retval = db.select(**(select or {}))
+    except sqlite3.Error:
+        logger.exception(f"`pybtex` plugin failed to read store `{source}`")
+        return None
+
+    logger.debug(f"Loaded {len(retval.entries)} entries from pybtex store `{path}`")
+    return retval
+
+
 def load(
-    databases: list[str], paths: typing.Sequence[pathlib.Path]
+    databases: list[str],
+    paths: typing.Sequence[pathlib.Path],
+    resolver: typing.Optional[SourceResolver] = None,
+    select: typing.Optional[dict[str, typing.Any]] = None,
+    cache: typing.Optional[ProcessCache] = None,
 ) -> list[pybtex.database.BibliographyData]:
     """Load a list of databases from file.
 
     Parameters
     ----------
     databases
-        List of databases to load.
+        List of databases to load.  Databases prefixed by ``sqlite:`` are loaded from
+        SQLite stores (see :py:mod:`.store`).  The format of other databases is
+        detected from their file name, unless declared by a prefix (see
+        :py:func:`split_source`).
     paths
         All paths to consider when searching.
+    resolver
+        A (build-scoped) resolver to use for searching files.  If not set, then use a
+        new resolver for this call only.
+    select
+        Criteria to select a subset of entries from SQLite stores (see
+        :py:meth:`.store.SqliteStore.select`).  If not set, all entries are loaded.
+    cache
+        The cache to use for loaded databases.  If not set, use
+        :py:data:`process_cache`.
 
     Returns
     -------
-        A list of pybtex entries.
+        A list of pybtex entries.  Databases are cached (by default, process-wide),
+        and shared across calls while the underlying files do not change.  They should
+        not be modified.
     """
 
+    if resolver is None:
+        resolver = SourceResolver()
+
+    if cache is None:
+        cache = process_cache
+
     retval: list[pybtex.database.BibliographyData] = []
 
-    bibtex_parser = pybtex.database.input.bibtex.Parser()
     for k in databases:
-        p = _resolve(pathlib.Path(k), paths)
+        fmt, filename = split_source(k)
+        p = resolver.resolve(pathlib.Path(filename), paths)
 
-        if not p.exists():
+        if not resolver.exists(p):
             logger.error(
                 f"`pybtex` file `{p}` cannot be found on path "
                 f"`{':'.join([str(k) for k in paths])}`"
             )
+            continue
+
+        # a single slot per file: a different selection replaces the previous one
+        slot = ("load", str(p.resolve()), fmt)
+
+        try:
+            version: tuple[typing.Any, ...] = _version(p)
+        except (OSError, pybtex.database.PybtexError):
+            logger.exception(f"`pybtex` plugin failed to inspect file `{k}`")
+            continue
+
+        if fmt == "sqlite":
+            version += (json.dumps(select, sort_keys=True),)
+
+        cached = cache.get(slot, version)
+        if cached is not None:
+            retval.append(cached)
+            logger.debug(f"Reusing already loaded pybtex file `{p}`")
+            continue
+
+        if fmt == "sqlite":
+            selected = _select_store(p, k, select)
+            if selected is None:
+                continue
+            retval.append(selected)
         else:
             try:
-                retval.append(bibtex_parser.parse_file(p))
+                retval.append(_parse(p, fmt))
                 logger.debug(f"Loaded pybtex file `{p}`")
             except pybtex.database.PybtexError:
                 logger.exception(f"`pybtex` plugin failed to parse file `{k}`")
+                continue
+
+        cache.put(slot, version, retval[-1])
+
+    return retval
+
+
+_DOI_PREFIX_RE = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:)", re.IGNORECASE)
+
+_LATEX_COMMAND_RE = re.compile(r"\\[A-Za-z]+")
+
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+
+def _normalize_text(value: str) -> str:
+    """Normalize a field value for duplicate detection."""
+    return _NON_WORD_RE.sub("", _LATEX_COMMAND_RE.sub("", value).casefold())
+
+
+def _fingerprints(entry: pybtex.database.Entry) -> list[str]:
+    """Compute the fingerprints identifying the work described by an entry.
+
+    Parameters
+    ----------
+    entry
+        The entry to fingerprint.
+
+    Returns
+    -------
+        Digests of the (normalized) DOI of the entry, and of its normalized title,
+        author (or editor) last names and year, if available.  Entries without
+        authors or editors (e.g. editorials, or errata) are only identified by their
+        DOI, as their titles are often shared by different works.
+    """
+
+    assert entry.fields is not None
+    assert entry.persons is not None
+
+    retval: list[str] = []
+
+    doi = _DOI_PREFIX_RE.sub("", entry.fields.get("doi", "").strip()).casefold()
+    if doi:
+        retval.append(hashlib.sha256(f"doi\0{doi}".encode()).hexdigest())
+
+    title = _normalize_text(entry.fields.get("title", ""))
+    persons = entry.persons.get("author") or entry.persons.get("editor")
+    if title and persons:
+        authors = "\0".join(_normalize_text(" ".join(p.last_names)) for p in persons)
+        year = entry.fields.get("year", "").strip()
+        retval.append(
+            hashlib.sha256(f"work\0{title}\0{authors}\0{year}".encode()).hexdigest()
+        )
 
     return retval
 
 
+def _duplicate_groups(entries: list[pybtex.database.Entry]) -> list[list[int]]:
+    """Group entries sharing any fingerprint (see :py:func:`_fingerprints`).
+
+    Parameters
+    ----------
+    entries
+        The entries to group.
+
+    Returns
+    -------
+        Groups of (two or more) positions of duplicate entries, in declared order.
+    """
+
+    # union-find over entry positions, joined by a hash index over fingerprints
+    parent = list(range(len(entries)))
+
+    def _root(position: int) -> int:
+        while parent[position] != position:
+            parent[position] = parent[parent[position]]
+            position = parent[position]
+        return position
+
+    index: dict[str, int] = {}
+    for position, entry in enumerate(entries):
+        for fingerprint in _fingerprints(entry):
+            if fingerprint in index:
+                first, other = sorted((_root(index[fingerprint]), _root(position)))
+                parent[other] = first
+            else:
+                index[fingerprint] = position
+
+    groups: dict[int, list[int]] = {}
+    for position in range(len(entries)):
+        groups.setdefault(_root(position), []).append(position)
+
+    return [k for k in groups.values() if len(k) > 1]
+
+
+def deduplicate(
+    bibdata: typing.Sequence[pybtex.database.BibliographyData],
+) -> tuple[list[pybtex.database.BibliographyData], dict[str, str]]:
+    """Merge entries describing the same work under different keys.
+
+    Entries are indexed by a hash of their DOI, and by a hash of their normalized
+    title, author last names and year.  Entries sharing any of those are considered
+    duplicates.  Of each group of duplicates, the entry with the most fields (the
+    first one declared, in case of ties) is kept as the canonical entry.
+
+    Parameters
+    ----------
+    bibdata
+        A sequence of bibliography databases, each containing multiple entries.
+        Databases and entries are not modified, so they may be cached.
+
+    Returns
+    -------
+        New databases, without duplicate entries (the remaining ones are shared with
+        the input databases), and a dictionary mapping the keys of removed entries
+        to the key of their canonical entry.
+    """
+
+    entries = [(k, e) for db in bibdata for k, e in db.entries.items()]
+
+    removed: set[int] = set()
+    aliases: dict[str, str] = {}
+    for members in _duplicate_groups([e for _, e in entries]):
+        keys = {entries[k][0] for k in members}
+        if len(keys) == 1:
+            continue  # the same key on multiple databases: last one wins, as usual
+        canonical = max(members, key=lambda k: (len(entries[k][1].fields), -k))
+        canonical_key = entries[canonical][0]
+        for k in members:
+            if entries[k][0] != canonical_key:
+                removed.add(k)
+                aliases[entries[k][0]] = canonical_key
+        logger.info(
+            f"Merged duplicate entries "
+            f"{', '.join(f'`{k}`' for k in sorted(keys - {canonical_key}))} "
+            f"into `{canonical_key}`"
+        )
+
+    if not removed:
+        return list(bibdata), aliases
+
+    retval: list[pybtex.database.BibliographyData] = []
+    position = 0
+    for db in bibdata:
+        kept: dict[str, pybtex.database.Entry] = {}
+        for key, entry in db.entries.items():
+            if position not in removed:
+                kept[key] = entry
+            position += 1
+        retval.append(
+            pybtex.database.BibliographyData(entries=kept, preamble=db.preamble_list)
+        )
+
+    logger.info(
+        f"Merged {len(removed)} duplicate entries into {len(set(aliases.values()))} "
+        f"canonical entries"
+    )
+    return retval, aliases
+
+
+def sources_digest(
+    databases: list[str],
+    paths: typing.Sequence[pathlib.Path],
+    resolver: typing.Optional[SourceResolver] = None,
+    select: typing.Optional[dict[str, typing.Any]] = None,
+) -> str:
+    """Compute a digest of the contents of a list of databases.
+
+    The digest identifies the result of :py:func:`load` on the same inputs, and is
+    independent of file locations and modification times, so that it can be shared
+    across processes and checkouts.  Compiled databases also include the contents of
+    their source only if it changed after compilation (or if they are corrupted), as
+    it is then parsed instead.  SQLite stores are identified by their size and
+    modification time instead, as they may be very large.
+
+    Parameters
+    ----------
+    databases
+        List of databases to load.
+    paths
+        All paths to consider when searching.
+    resolver
+        A (build-scoped) resolver to use for searching files.  If not set, then use a
+        new resolver for this call only.
+    select
+        Criteria to select a subset of entries from SQLite stores.
+
+    Returns
+    -------
+        A hexadecimal digest.
+    """
+
+    if resolver is None:
+        resolver = SourceResolver()
+
+    retval = hashlib.sha256()
+
+    def _update(path: pathlib.Path) -> None:
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(2**20), b""):
+                retval.update(chunk)
+
+    for k in databases:
+        fmt, filename = split_source(k)
+        p = resolver.resolve(pathlib.Path(filename), paths)
+        retval.update(f"\0{k}\0".encode())
+        if not resolver.exists(p):
+            retval.update(b"missing")
+        elif fmt == "sqlite":
+            retval.update(json.dumps([_version(p), select], sort_keys=True).encode())
+        else:
+            _update(p)
+            if p.suffix == compiled.SUFFIX:
+                try:
+                    source = compiled.stale_source(p)
+                except compiled.CompiledFormatError:
+                    source = None
+                    with contextlib.suppress(compiled.CompiledFormatError):
+                        source = compiled.source(p)
+                if source is not None and source.is_file():
+                    retval.update(b"\0source\0")
+                    _update(source)
+
+    return retval.hexdigest()
+
+
+def open_stores(
+    databases: list[str],
+    paths: typing.Sequence[pathlib.Path],
+    resolver: typing.Optional[SourceResolver] = None,
+) -> list[store.SqliteStore]:
+    """Open all SQLite stores from a list of databases.
+
+    Parameters
+    ----------
+    databases
+        List of databases.  Only those prefixed by ``sqlite:`` are considered.
+    paths
+        All paths to consider when searching.
+    resolver
+        A (build-scoped) resolver to use for searching files.  If not set, then use a
+        new resolver for this call only.
+
+    Returns
+    -------
+        A list of opened stores, that can be queried for entries.
+    """
+
+    if resolver is None:
+        resolver = SourceResolver()
+
+    retval: list[store.SqliteStore] = []
+    for k in databases:
+        if not k.startswith(store.SCHEME):
+            continue
+        p = resolver.resolve(pathlib.Path(k[len(store.SCHEME) :]), paths)
+        if resolver.exists(p):
+            try:
+                retval.append(store.SqliteStore(p))
+            except sqlite3.Error:
+                logger.exception(f"`pybtex` plugin failed to open store `{k}`")
+
+    return retval
+
+
+def key_slug(key: str) -> str:
+    """Make a BibTeX key safe to be used on file names and URLs.
+
+    Parameters
+    ----------
+    key
+        The BibTeX key.
+
+    Returns
+    -------
+        The key, with any characters other than letters, digits, ``.``, ``_`` and
+        ``-`` replaced by ``-``.
+    """
+
+    return re.sub(r"[^\w.-]+", "-", key, flags=re.ASCII)
+
+
 def format_bibtex(entry: pybtex.database.Entry) -> str:
     """Format a pybtex database entry into a BibTeX representation.
 
@@ -155,7 +1017,7 @@ _MONTH_NUMBERS: dict[str, int] = {
 }
 
 
-def _get_month_number(m: str) -> int:
+def get_month_number(m: str) -> int:
     """Get the month number or 0, if that is not known.
 
     Parameters
@@ -170,11 +1032,154 @@ def _get_month_number(m: str) -> int:
     return _MONTH_NUMBERS[m.lower()[:3].strip()]
 
 
-def generate_context(
+def _babel_names(locale_string: str) -> dict[str, list[str]]:
+    """Return the names of months, weekdays and AM/PM on a locale, from babel.
+
+    Parameters
+    ----------
+    locale_string
+        The locale to use (e.g. ``fr_FR.UTF-8``).  Encodings and modifiers are
+        ignored.
+
+    Returns
+    -------
+        A dictionary mapping the ``%A``, ``%a``, ``%B``, ``%b`` and ``%p`` directives
+        to names, indexed by weekday (Monday is zero), month (January is zero), or
+        AM/PM.
+
+    Raises
+    ------
+    ValueError
+        If the locale is not valid.
+    babel.UnknownLocaleError
+        If the locale is not known to babel.
+    """
+
+    name = re.split(r"[.@]", locale_string, maxsplit=1)[0]
+    loc = babel.Locale.parse("en_US_POSIX" if name in ("C", "POSIX") else name)
+
+    days = babel.dates.get_day_names("wide", locale=loc)
+    short_days = babel.dates.get_day_names("abbreviated", locale=loc)
+    months = babel.dates.get_month_names("wide", locale=loc)
+    short_months = babel.dates.get_month_names("abbreviated", locale=loc)
+    periods = babel.dates.get_period_names("abbreviated", "format", locale=loc)
+    return {
+        "%A": [days[k] for k in range(7)],
+        "%a": [short_days[k] for k in range(7)],
+        "%B": [months[k + 1] for k in range(12)],
+        "%b": [short_months[k + 1] for k in range(12)],
+        "%p": [periods["am"], periods["pm"]],
+    }
+
+
+# date and time names per locale, by strftime() directive
+_LOCALE_NAMES: dict[str, typing.Optional[dict[str, list[str]]]] = {}
+_LOCALE_NAMES_LOCK = threading.Lock()
+
+_NAME_DIRECTIVE_RE = re.compile(r"%[%AaBbp]")
+
+
+def _locale_names(locale_string: str) -> typing.Optional[dict[str, list[str]]]:
+    """Return the names of months, weekdays and AM/PM on a given locale.
+
+    Names are taken from `babel <https://babel.pocoo.org>`_, if installed.  The
+    process locale is never changed.  Names are cached for the lifetime of the
+    process.
+
+    Parameters
+    ----------
+    locale_string
+        The locale to use (e.g. ``fr_FR.UTF-8``).
+
+    Returns
+    -------
+        A dictionary mapping the ``%A``, ``%a``, ``%B``, ``%b`` and ``%p`` directives
+        to names, indexed by weekday (Monday is zero), month (January is zero), or
+        AM/PM, or ``None``, if the locale is not available.
+    """
+
+    with _LOCALE_NAMES_LOCK:
+        if locale_string not in _LOCALE_NAMES:
+            names: typing.Optional[dict[str, list[str]]] = None
+            if babel is None:
+                logger.warning(
+                    f"Cannot format dates on locale `{locale_string}` without "
+                    f"`babel` (install it to support other locales), formatting "
+                    f"dates with the current locale"
+                )
+            else:
+                try:
+                    names = _babel_names(locale_string)
+                except (ValueError, babel.UnknownLocaleError):
+                    logger.warning(
+                        f"Locale `{locale_string}` is not available, formatting "
+                        f"dates with the current locale"
+                    )
+            _LOCALE_NAMES[locale_string] = names
+
+        return _LOCALE_NAMES[locale_string]
+
+
+def format_date(
+    date: datetime.datetime,
+    date_format: str,
+    locale_string: typing.Optional[str] = None,
+) -> str:
+    """Format a date on a given locale, without changing the process locale.
+
+    If no locale is requested, or if it is the current locale, the date is formatted
+    with :py:meth:`datetime.datetime.strftime`.  Otherwise, names of months, weekdays
+    and AM/PM (the ``%A``, ``%a``, ``%B``, ``%b`` and ``%p`` directives) are taken
+    from the requested locale (see :py:func:`_locale_names`), while other directives
+    are formatted with the current locale.
+
+    Parameters
+    ----------
+    date
+        The date to format.
+    date_format
+        A format string, as supported by :py:meth:`datetime.datetime.strftime`.
+    locale_string
+        The locale to use.  If not set, use the current locale.
+
+    Returns
+    -------
+        The formatted date.
+    """
+
+    if not locale_string or locale_string == locale.setlocale(locale.LC_TIME):
+        return date.strftime(date_format)
+
+    names = _locale_names(locale_string)
+    if names is None:
+        return date.strftime(date_format)
+
+    index = {
+        "%A": date.weekday(),
+        "%a": date.weekday(),
+        "%B": date.month - 1,
+        "%b": date.month - 1,
+        "%p": int(date.hour >= 12),  # noqa: PLR2004
+    }
+
+    def _repl(matchobj: re.Match) -> str:
+        directive = matchobj.group()
+        if directive == "%%":
+            return directive
+        return names[directive][index[directive]].replace("%", "%%")
+
+    return date.strftime(_NAME_DIRECTIVE_RE.sub(_repl, date_format))
+
+
+def generate_context(  # noqa: PLR0913
     bibdata: typing.Sequence[pybtex.database.BibliographyData],
     style_name: str,
     extra_fields: typing.Sequence[str],
     html_formatter_options: dict[str, typing.Any],
+    bibtex_url: typing.Optional[str] = None,
+    *,
+    labels: typing.Optional[typing.Sequence[str]] = None,
+    max_authors: typing.Optional[int] = None,
 ) -> list[dict[str, typing.Union[str, int]]]:
     """Generate a list of dictionaries given a set of bibliography databases.
 
@@ -190,6 +1195,17 @@ def generate_context(
     html_formatter_options
         A dictionary containing HTML formatting options supported by
         :py:class:`pygments.formatters.HtmlFormatter`.
+    bibtex_url
+        If set, a pattern (with ``{key}`` and ``{slug}`` placeholders) for the URL
+        of static BibTeX files of each entry.  In this case, a ``bibtex_url`` key
+        replaces the ``bibtex`` key on the output.
+    labels
+        If set, precomputed labels of all entries, in order (see
+        :py:class:`LabelService`).  Otherwise, labels are computed by the formatting
+        style.
+    max_authors
+        If set, lists of persons longer than this are truncated before formatting
+        (see :py:func:`truncate_persons`).
 
     Returns
     -------
@@ -203,55 +1219,489 @@ def generate_context(
             * ``month``: A string-fied version of the month number (int)
             * ``html``: An HTML-formatted version of the entry (str)
             * ``bibtex``: An HTML-ready (pygments-highlighted) BibTeX-formatted version of
-              the entry (str)
+              the entry (str), or ``bibtex_url``: the URL of a static BibTeX file with
+              the entry (str), if ``bibtex_url`` is set
 
         More keys as defined by ``extra_fiedls`` may also be present in case they are
         found in the original database entry.  These fields are copied verbatim to this
         dictionary.
     """
-    # just to avoid pyright warnings as the name of this plugin matches the name of the
-    # library we are using
-    import pybtex.backends.html
-    import pybtex.database
+    # format all entries in a single shot for speed and meaningful labels
+    all_entries = [e for k in bibdata for e in k.entries.values()]
+    if labels is None:
+        labels = list(_get_style(style_name).format_labels(all_entries))
+
+    return format_entries(
+        all_entries,
+        labels,
+        style_name,
+        extra_fields,
+        html_formatter_options,
+        bibtex_url,
+        max_authors=max_authors,
+    )
+
+
+def format_entries(  # noqa: PLR0913, PLR0917
+    entries: typing.Sequence[pybtex.database.Entry],
+    labels: typing.Sequence[str],
+    style_name: str,
+    extra_fields: typing.Sequence[str],
+    html_formatter_options: dict[str, typing.Any],
+    bibtex_url: typing.Optional[str] = None,
+    *,
+    max_authors: typing.Optional[int] = None,
+) -> list[dict[str, typing.Union[str, int]]]:
+    """Format entries with precomputed labels.
+
+    Receivers of :py:data:`.signals.pybtex_entries_formatting` may replace the
+    formatted entries, and :py:data:`.signals.pybtex_entries_formatted` is sent once
+    entries are formatted.
+
+    Parameters
+    ----------
+    entries
+        The entries to format.
+    labels
+        The labels of each entry, in order.
+    style_name
+        One of the biobliography formatting styles supported by pybtex.
+    extra_fields
+        Extra fields to be preserved (verbatim) from each entry, if present.
+    html_formatter_options
+        A dictionary containing HTML formatting options supported by
+        :py:class:`pygments.formatters.HtmlFormatter`.
+    bibtex_url
+        If set, a pattern for the URL of static BibTeX files of each entry.
+    max_authors
+        If set, lists of persons longer than this are truncated before formatting
+        (see :py:func:`truncate_persons`).
+
+    Returns
+    -------
+        A list of formatted entries (see :py:func:`generate_context`).
+    """
+
+    start = time.perf_counter()
+
+    retval: typing.Optional[list[dict[str, typing.Union[str, int]]]] = None
+    for _, value in signals.pybtex_entries_formatting.send(
+        None,
+        entries=entries,
+        labels=labels,
+        style=style_name,
+        extra_fields=extra_fields,
+        html_formatter_options=html_formatter_options,
+        bibtex_url=bibtex_url,
+        max_authors=max_authors,
+    ):
+        if value is not None:
+            retval = value
+    replaced = retval is not None
+
+    if retval is None:
+        style = _get_style(style_name)
+        # overrides pybtex.style.formatting.Style.format_entries to avoid sorting
+        retval = [
+            _to_publication(
+                entry,
+                style.format_entry(label, truncate_persons(entry, max_authors)),
+                extra_fields,
+                html_formatter_options,
+                bibtex_url,
+            )
+            for label, entry in zip(labels, entries)
+        ]
+
+    signals.pybtex_entries_formatted.send(
+        None,
+        publications=retval,
+        entries=len(retval),
+        replaced=replaced,
+        elapsed=time.perf_counter() - start,
+    )
+    return retval
+
+
+def truncate_persons(
+    entry: pybtex.database.Entry, max_persons: typing.Optional[int]
+) -> pybtex.database.Entry:
+    """Truncate long lists of persons of an entry, for formatting.
+
+    Formatting thousands of names (e.g. of large collaborations) is slow, and yields
+    huge pages.  Truncated lists end with a marker, formatted as "et al." (see
+    :py:class:`.style.EtAl`).
+
+    Parameters
+    ----------
+    entry
+        The entry to truncate.  It is not modified, so it may be cached.
+    max_persons
+        The maximum number of persons to keep, for each role (e.g. authors or
+        editors).  If not set (or zero), persons are not truncated.
+
+    Returns
+    -------
+        The input entry, if no list of persons is longer than ``max_persons``, or
+        otherwise a shallow copy of the entry, with truncated lists of persons.
+    """
+
+    assert entry.persons is not None
+
+    if not max_persons or all(len(k) <= max_persons for k in entry.persons.values()):
+        return entry
+
+    from .style import EtAl
+
+    retval = copy.copy(entry)
+    retval.persons = type(entry.persons)(
+        (role, [*people[:max_persons], EtAl()] if len(people) > max_persons else people)
+        for role, people in entry.persons.items()
+    )
+    return retval
+
+
+@functools.lru_cache
+def _get_style(style_name: str) -> pybtex.style.formatting.BaseStyle:
+    """Instantiate a bibliography formatting style (once per style).
+
+    Parameters
+    ----------
+    style_name
+        One of the biobliography formatting styles supported by pybtex (currently
+        "plain", "alpha", "unsrt", and "unsrtalpha").  Defaults to "plain" if the
+        style is not supported.
+
+    Returns
+    -------
+        The formatting style.
+    """
 
     if style_name in ("plain", "alpha", "unsrt", "unsrtalpha"):
         formatter = importlib.import_module(f"pybtex.style.formatting.{style_name}")
-        style = formatter.Style()
-    else:
-        logger.error(
-            f"Unsupported formatting style `{style_name}`, defaulting to `plain`"
-        )
-        import pybtex.style.formatting.plain
+        return formatter.Style()
 
-        style = pybtex.style.formatting.plain.Style()
+    logger.error(f"Unsupported formatting style `{style_name}`, defaulting to `plain`")
+    import pybtex.style.formatting.plain
 
-    # format all entries in a single shot for speed and meaningful labels
-    all_entries = [e for k in bibdata for e in k.entries.values()]
+    return pybtex.style.formatting.plain.Style()
 
-    # overrides pybtex.style.formatting.Style.format_entries to avoid sorting
-    formatted_entries = [
-        style.format_entry(k, e)
-        for k, e in zip(style.format_labels(all_entries), all_entries)
-    ]
 
-    backend = pybtex.backends.html.Backend()
-    retval: list[dict[str, str | int]] = []
-    for entry, formatted_entry in zip(all_entries, formatted_entries):
-        # make entry text, and then pass it through pygments for highlighting
-        assert entry.fields is not None
+def _to_publication(
+    entry: pybtex.database.Entry,
+    formatted_entry: typing.Any,
+    extra_fields: typing.Sequence[str],
+    html_formatter_options: dict[str, typing.Any],
+    bibtex_url: typing.Optional[str],
+) -> dict[str, typing.Union[str, int]]:
+    """Convert a formatted entry into a dictionary, for use in templates.
 
-        retval.append(
-            {
-                "label": typing.cast(str, formatted_entry.label),
-                "key": formatted_entry.key,
-                "year": int(entry.fields.get("year", 0)),
-                "month": _get_month_number(entry.fields.get("month", "unk")),
-                "html": formatted_entry.text.render(backend),
-                "bibtex": format_bibtex_pygments(entry, html_formatter_options),
-            }
+    See :py:func:`generate_context` for a description of parameters and keys.
+
+    Returns
+    -------
+        A dictionary representing the entry.
+    """
+
+    # make entry text, and then pass it through pygments for highlighting
+    assert entry.fields is not None
+
+    retval: dict[str, typing.Union[str, int]] = {
+        "label": typing.cast(str, formatted_entry.label),
+        "key": formatted_entry.key,
+        "year": int(entry.fields.get("year", 0)),
+        "month": get_month_number(entry.fields.get("month", "unk")),
+        "html": formatted_entry.text.render(pybtex.backends.html.Backend()),
+    }
+
+    if bibtex_url:
+        retval["bibtex_url"] = bibtex_url.format(
+            key=entry.key, slug=key_slug(entry.key)
         )
+    else:
+        retval["bibtex"] = format_bibtex_pygments(entry, html_formatter_options)
 
-        # updates entry with extra fields
-        retval[-1].update({k: v for k, v in entry.fields.items() if k in extra_fields})
+    # updates entry with extra fields
+    retval.update({k: v for k, v in entry.fields.items() if k in extra_fields})
 
     return retval
+
+
+# unique identifiers of publication lists, for caching formatted entries
+_PUBLICATION_LIST_IDS = itertools.count()
+
+
+CITATION_NUMBERINGS = ("local", "global")
+"""Supported values for ``PYBTEX_CITATION_NUMBERING``."""
+
+
+class LabelService:
+    """Bibliography labels, computed once per formatting style.
+
+    Labels of global entries depend on all other entries (e.g. to disambiguate
+    ``alpha`` labels), so they are computed once for the whole database, and reused
+    for the publications list and for bibliographies of articles and pages.
+
+    Parameters
+    ----------
+    bibdata
+        A sequence of (global) bibliography databases, each containing multiple
+        entries.
+    """
+
+    def __init__(self, bibdata: typing.Sequence[pybtex.database.BibliographyData]):
+        self.entries = [e for k in bibdata for e in k.entries.values()]
+        self._keys = [key for k in bibdata for key in k.entries]
+        self._labels: dict[str, list[str]] = {}
+        self._by_key: dict[str, dict[str, tuple[pybtex.database.Entry, str]]] = {}
+        self._lock = threading.Lock()
+
+    def global_labels(self, style_name: str) -> list[str]:
+        """Return labels of all global entries.
+
+        Parameters
+        ----------
+        style_name
+            One of the biobliography formatting styles supported by pybtex.
+
+        Returns
+        -------
+            Labels of all global entries, in declared order.
+        """
+
+        with self._lock:
+            if style_name not in self._labels:
+                start = time.perf_counter()
+                self._labels[style_name] = list(
+                    _get_style(style_name).format_labels(self.entries)
+                )
+                elapsed = time.perf_counter() - start
+                logger.debug(
+                    f"Computed {len(self.entries)} `{style_name}` labels in "
+                    f"{1000 * elapsed:.1f} ms"
+                )
+                signals.pybtex_labels_computed.send(
+                    self, style=style_name, labels=len(self.entries), elapsed=elapsed
+                )
+            return self._labels[style_name]
+
+    def _global_entries(
+        self, style_name: str
+    ) -> dict[str, tuple[pybtex.database.Entry, str]]:
+        """Return global entries and their labels, by key."""
+
+        labels = self.global_labels(style_name)
+        with self._lock:
+            if style_name not in self._by_key:
+                # databases may repeat keys, in which case the last entry wins
+                self._by_key[style_name] = {
+                    key: (entry, label)
+                    for key, entry, label in zip(self._keys, self.entries, labels)
+                }
+            return self._by_key[style_name]
+
+    def labels(
+        self,
+        entries: typing.Mapping[str, pybtex.database.Entry],
+        style_name: str,
+        numbering: str = "local",
+    ) -> list[str]:
+        """Return labels for a bibliography (e.g. of an article or page).
+
+        Parameters
+        ----------
+        entries
+            The entries on the bibliography, by key, in order.
+        style_name
+            One of the biobliography formatting styles supported by pybtex.
+        numbering
+            If ``local``, entries are labelled as if the bibliography was the whole
+            database (e.g. numbered from 1).  If ``global``, entries that are also
+            part of the global database reuse their global label, while others are
+            labelled after global entries.
+
+        Returns
+        -------
+            Labels of the entries, in order.
+        """
+
+        style = _get_style(style_name)
+        numeric = isinstance(style.label_style, pybtex.style.labels.number.LabelStyle)
+
+        if numbering != "global":
+            if numeric:  # no need to look at entries
+                return [str(k + 1) for k in range(len(entries))]
+            return list(style.format_labels(list(entries.values())))
+
+        known = self._global_entries(style_name)
+        # local entries may override global ones with the same key
+        others = [
+            k for k, v in entries.items() if k not in known or known[k][0] is not v
+        ]
+        if numeric:
+            extra = [str(len(self.entries) + k + 1) for k in range(len(others))]
+        else:
+            # disambiguates from global labels on the same bibliography, with the
+            # same letter suffixes pybtex uses for entries sharing a label
+            used = {known[k][1] for k in entries if k not in others}
+            format_label = getattr(style.label_style, "format_label", None)
+            bases = set()
+            if format_label is not None:
+                bases = {format_label(known[k][0]) for k in entries if k not in others}
+            extra = []
+            for key, label in zip(
+                others, style.format_labels([entries[k] for k in others])
+            ):
+                unique = label
+                base = label if format_label is None else format_label(entries[key])
+                if unique in used or base in bases:
+                    for suffix in itertools.count():
+                        unique = base + chr(ord("a") + suffix)
+                        if unique not in used:
+                            break
+                used.add(unique)
+                extra.append(unique)
+        labels = dict(zip(others, extra))
+
+        return [labels[k] if k in labels else known[k][1] for k in entries]
+
+
+class PublicationList(collections.abc.Sequence):
+    """A list of publications, formatted on demand.
+
+    Entries are only formatted when accessed, and formatted entries are kept on a
+    (possibly bounded) cache, so they may be formatted again if evicted.  Accessing
+    an entry returns a new dictionary (see :py:func:`generate_context` for its keys),
+    that may be modified by the caller.
+
+    Parameters
+    ----------
+    bibdata
+        A sequence of bibliography databases, each containing multiple entries.
+    style_name
+        One of the biobliography formatting styles supported by pybtex.
+    extra_fields
+        Extra fields to be preserved (verbatim) from each entry, if present.
+    html_formatter_options
+        A dictionary containing HTML formatting options supported by
+        :py:class:`pygments.formatters.HtmlFormatter`.
+    bibtex_url
+        If set, a pattern for the URL of static BibTeX files of each entry.
+    cache
+        The cache for formatted entries.  If not set, formatted entries are kept
+        for the lifetime of this list.
+    transform
+        If set, a function called to update each entry (e.g., to add more keys),
+        after it is retrieved from the cache.
+    labels
+        The service computing labels of entries.  It must have been created for the
+        same databases.  If not set, a new one is created.
+    max_authors
+        If set, lists of persons longer than this are truncated before formatting
+        (see :py:func:`truncate_persons`).
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        bibdata: typing.Sequence[pybtex.database.BibliographyData],
+        style_name: str,
+        extra_fields: typing.Sequence[str],
+        html_formatter_options: dict[str, typing.Any],
+        bibtex_url: typing.Optional[str] = None,
+        *,
+        cache: typing.Optional[ProcessCache] = None,
+        transform: typing.Optional[
+            typing.Callable[[dict[str, typing.Union[str, int]]], None]
+        ] = None,
+        labels: typing.Optional[LabelService] = None,
+        max_authors: typing.Optional[int] = None,
+    ):
+        self.labels = labels if labels is not None else LabelService(bibdata)
+        self.entries = self.labels.entries
+        self._style_name = style_name
+        self._extra_fields = extra_fields
+        self._html_formatter_options = html_formatter_options
+        self._bibtex_url = bibtex_url
+        self._max_authors = max_authors
+        self._cache = cache if cache is not None else ProcessCache()
+        self._transform = transform
+        self._id = next(_PUBLICATION_LIST_IDS)
+
+    def with_transform(
+        self,
+        transform: typing.Optional[
+            typing.Callable[[dict[str, typing.Union[str, int]]], None]
+        ],
+    ) -> "PublicationList":
+        """Return a view of this list, that applies a different transform.
+
+        The view shares entries, labels and formatted entries with this list, so
+        that entries formatted through any of them are not formatted again.
+
+        Parameters
+        ----------
+        transform
+            If set, a function called to update each entry (e.g., to add more
+            keys), after it is retrieved from the cache.
+
+        Returns
+        -------
+            A new list of publications.
+        """
+
+        retval = copy.copy(self)
+        retval._transform = transform  # noqa: SLF001
+        return retval
+
+    def _format(self, index: int) -> dict[str, typing.Union[str, int]]:
+        """Format a single entry.
+
+        Parameters
+        ----------
+        index
+            The position of the entry on this list.
+
+        Returns
+        -------
+            The formatted entry.
+        """
+
+        # labels depend on all entries, and are computed once
+        return format_entries(
+            [self.entries[index]],
+            [self.labels.global_labels(self._style_name)[index]],
+            self._style_name,
+            self._extra_fields,
+            self._html_formatter_options,
+            self._bibtex_url,
+            max_authors=self._max_authors,
+        )[0]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @typing.overload
+    def __getitem__(self, index: int) -> dict[str, typing.Union[str, int]]: ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> list[dict[str, typing.Union[str, int]]]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[k] for k in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+
+        slot = ("publication", self._id, index)
+        cached = self._cache.get(slot, None)
+        if cached is None:
+            cached = self._format(index)
+            self._cache.put(slot, None, cached)
+
+        retval = dict(cached)
+        if self._transform is not None:
+            self._transform(retval)
+        return retval
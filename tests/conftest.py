@@ -31,12 +31,16 @@ def data_path(request, subdir: str) -> pathlib.Path:
 
 
 @pytest.fixture
-def setup_pelican(
+def build_pelican(
     caplog,
     tmp_path,
     data_path,
-) -> tuple[list[logging.LogRecord], pathlib.Path]:
-    """Set up and teardown of pelican instance for tests.
+) -> typing.Callable[..., pathlib.Path]:
+    """Return a function that builds the test site with Pelican.
+
+    The returned function accepts settings overriding the defaults used by tests (and
+    those on ``pelicanconf.py``, if the data path has one), as keyword arguments.  It
+    may be called multiple times, e.g. to test incremental builds.
 
     Parameters
     ----------
@@ -50,29 +54,13 @@ def setup_pelican(
 
     Returns
     -------
-        A tuple containing the captured log records during setup and build of Pelican,
-        and the output path containing the built website.
+        A function that builds the site, and returns its output path.
     """
 
     from pelican import Pelican
     from pelican.log import FatalLogger
     from pelican.settings import read_settings
 
-    settings = {
-        "SITEURL": "https://example.com",
-        "TIMEZONE": "UTC",
-        "THEME": "simple",
-        "OUTPUT_PATH": tmp_path,
-        # disables generation of all indexes except the main one
-        "DIRECT_TEMPLATES": ["index"],
-        # disables feed generation
-        "FEED_ALL_ATOM": None,
-        "CATEGORY_FEED_ATOM": None,
-        "TRANSLATION_FEED_ATOM": None,
-        "AUTHOR_FEED_ATOM": None,
-        "AUTHOR_FEED_RSS": None,
-    }
-
     caplog.set_level(logging.DEBUG)
 
     # pelican overrides the default logging class to `pelican.log.FatalLogger`, which
@@ -83,12 +71,55 @@ def setup_pelican(
             FatalLogger, logging.getLogger(f"pelican.plugins.pybtex.{mod}")
         ).disable_filter()
 
-    if (data_path / "pelicanconf.py").exists():
-        pelican = Pelican(
-            settings=read_settings(data_path / "pelicanconf.py", override=settings)
-        )
-    else:
-        pelican = Pelican(settings=read_settings(override=settings))
-    pelican.run()
+    def _build(**overrides: typing.Any) -> pathlib.Path:
+        settings = {
+            "THEME": "simple",
+            "OUTPUT_PATH": tmp_path / "output",
+            "CACHE_PATH": tmp_path / "cache",
+            # disables generation of all indexes except the main one
+            "DIRECT_TEMPLATES": ["index"],
+            # disables feed generation
+            "FEED_ALL_ATOM": None,
+            "CATEGORY_FEED_ATOM": None,
+            "TRANSLATION_FEED_ATOM": None,
+            "AUTHOR_FEED_ATOM": None,
+            "AUTHOR_FEED_RSS": None,
+            **overrides,
+        }
+
+        if (data_path / "pelicanconf.py").exists():
+            pelican = Pelican(
+                settings=read_settings(data_path / "pelicanconf.py", override=settings)
+            )
+        else:
+            pelican = Pelican(settings=read_settings(override=settings))
+        pelican.run()
+
+        return settings["OUTPUT_PATH"]
+
+    return _build
+
+
+@pytest.fixture
+def setup_pelican(
+    caplog,
+    build_pelican,
+) -> tuple[list[logging.LogRecord], pathlib.Path]:
+    """Set up and teardown of pelican instance for tests.
+
+    Parameters
+    ----------
+    caplog
+        Pytest :std:fixture:`caplog` fixture.
+    build_pelican
+        A fixture building the test site.  See :py:func:`build_pelican` for
+        details.
+
+    Returns
+    -------
+        A tuple containing the captured log records during setup and build of Pelican,
+        and the output path containing the built website.
+    """
 
-    return caplog.records, tmp_path
+    output = build_pelican(SITEURL="https://example.com", TIMEZONE="UTC")
+    return caplog.records, output
@@ -0,0 +1,6 @@
+# SPDX-FileCopyrightText: Copyright © 2024 André Anjos <andre.dos.anjos@gmail.com>
+# SPDX-License-Identifier: MIT
+PATH = "content"
+PYBTEX_SOURCES = ["publications.bib"]
+PYBTEX_BIBTEX_SAVE_AS = "publications/bib/{slug}.bib"
+PYBTEX_BIBTEX_ALL_SAVE_AS = "publications/bib/publications.bib"
@@ -0,0 +1,5 @@
+# SPDX-FileCopyrightText: Copyright © 2024 André Anjos <andre.dos.anjos@gmail.com>
+# SPDX-License-Identifier: MIT
+PATH = "content"
+PYBTEX_SOURCES = ["group1.bib", "group2.bib"]
+PYBTEX_DEDUPLICATE = True
@@ -0,0 +1,4 @@
+# SPDX-FileCopyrightText: Copyright © 2024 André Anjos <andre.dos.anjos@gmail.com>
+# SPDX-License-Identifier: MIT
+PATH = "content"
+PYBTEX_SOURCES = ["publications.json", "publications.yaml"]
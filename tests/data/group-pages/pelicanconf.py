@@ -0,0 +1,12 @@
+# SPDX-FileCopyrightText: Copyright © 2024 André Anjos <andre.dos.anjos@gmail.com>
+# SPDX-License-Identifier: MIT
+PATH = "content"
+PYBTEX_SOURCES = ["publications.bib"]
+PUBLICATION_SAVE_AS = "publications/{slug}/index.html"
+PUBLICATION_URL = "publications/{slug}/"
+PUBLICATIONS_AUTHOR_SAVE_AS = "publications/author/{slug}/index.html"
+PUBLICATIONS_AUTHOR_URL = "publications/author/{slug}/"
+PUBLICATIONS_TYPE_SAVE_AS = "publications/type/{slug}/index.html"
+PUBLICATIONS_TYPE_URL = "publications/type/{slug}/"
+PUBLICATIONS_TAG_SAVE_AS = "publications/tag/{slug}/index.html"
+PUBLICATIONS_TAG_URL = "publications/tag/{slug}/"
@@ -0,0 +1,5 @@
+# SPDX-FileCopyrightText: Copyright © 2024 André Anjos <andre.dos.anjos@gmail.com>
+# SPDX-License-Identifier: MIT
+PATH = "content"
+PYBTEX_SOURCES = ["collaboration.bib"]
+PYBTEX_MAX_AUTHORS = 2
@@ -0,0 +1,6 @@
+# SPDX-FileCopyrightText: Copyright © 2024 André Anjos <andre.dos.anjos@gmail.com>
+# SPDX-License-Identifier: MIT
+PATH = "content"
+PYBTEX_SOURCES = ["publications.bib"]
+PYBTEX_MINIFY_HTML = True
+PYGMENTS_RST_OPTIONS = {"noclasses": True}
@@ -0,0 +1,6 @@
+# SPDX-FileCopyrightText: Copyright © 2024 André Anjos <andre.dos.anjos@gmail.com>
+# SPDX-License-Identifier: MIT
+PATH = "content"
+PYBTEX_SOURCES = ["publications.bib"]
+PUBLICATION_SAVE_AS = "publications/{slug}/index.html"
+PUBLICATION_URL = "publications/{slug}/"
@@ -1,8 +1,13 @@
 # SPDX-FileCopyrightText: Copyright © 2024 André Anjos <andre.dos.anjos@gmail.com>
 # SPDX-License-Identifier: MIT
 
+import json
 import logging
+import os
 import pathlib
+import shutil
+import stat
+import time
 
 from bs4 import BeautifulSoup
 import pytest
@@ -719,3 +724,1566 @@ def test_biblio_override(setup_pelican: tuple[list[logging.LogRecord], pathlib.P
     _assert_log_contains(
         records, message="plugin detected no entries", level=logging.INFO, count=1
     )
+
+
+def test_source_resolver_caches_listings(tmp_path, monkeypatch):
+    from pelican.plugins.pybtex import utils
+
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    (tmp_path / "b" / "refs.bib").write_text("")
+
+    listed: list[pathlib.Path] = []
+    original_iterdir = pathlib.Path.iterdir
+
+    def _iterdir(self):
+        listed.append(self)
+        return original_iterdir(self)
+
+    monkeypatch.setattr(pathlib.Path, "iterdir", _iterdir)
+
+    resolver = utils.SourceResolver()
+    paths = [tmp_path / "a", tmp_path / "b"]
+    for _ in range(3):
+        p = resolver.resolve(pathlib.Path("refs.bib"), paths)
+        assert p == tmp_path / "b" / "refs.bib"
+        assert resolver.exists(p)
+
+    assert resolver.resolve(pathlib.Path("missing.bib"), paths) == pathlib.Path(
+        "missing.bib"
+    )
+    assert sorted(listed) == sorted(paths)
+
+    # broken symbolic links are not considered
+    (tmp_path / "a" / "dangling.bib").symlink_to(tmp_path / "a" / "nowhere.bib")
+    (tmp_path / "b" / "dangling.bib").write_text("")
+    resolver = utils.SourceResolver()
+    assert not resolver.exists(tmp_path / "a" / "dangling.bib")
+    assert resolver.resolve(pathlib.Path("dangling.bib"), paths) == (
+        tmp_path / "b" / "dangling.bib"
+    )
+
+    # names differing in case match only if the filesystem ignores case
+    upper = tmp_path / "b" / "REFS.bib"
+    assert resolver.exists(upper) == upper.exists()
+
+
+def test_compiled_roundtrip(tmp_path):
+    from pelican.plugins.pybtex import cli, compiled, utils
+
+    source = pathlib.Path(__file__).parent / "data" / "simple" / "content"
+    source = source / "publications.bib"
+    output = tmp_path / "publications.pybtexc"
+
+    assert cli.main(["compile", str(source), "-o", str(output)]) == 0
+    assert output.exists()
+    assert compiled.stale_source(output) is None
+
+    expected = utils.load([str(source)], [])
+    loaded = utils.load([str(output)], [])
+    assert len(loaded) == 1
+    assert loaded[0] == expected[0]
+    assert list(loaded[0].entries.keys()) == list(expected[0].entries.keys())
+
+
+def test_load_compressed(caplog, tmp_path):
+    import bz2
+    import gzip
+    import lzma
+
+    from pelican.plugins.pybtex import utils
+
+    source = pathlib.Path(__file__).parent / "data" / "simple" / "content"
+    source = source / "publications.bib"
+    expected = utils.load([str(source)], [])[0]
+
+    for suffix, compress in ((".gz", gzip), (".bz2", bz2), (".xz", lzma)):
+        compressed = tmp_path / f"publications.bib{suffix}"
+        compressed.write_bytes(compress.compress(source.read_bytes()))
+        loaded = utils.load([str(compressed)], [])
+        assert len(loaded) == 1
+        assert loaded[0] == expected
+
+    # empty (uncompressed) files are loaded too
+    empty = tmp_path / "empty.bib"
+    empty.touch()
+    assert not utils.load([str(empty)], [])[0].entries
+
+    corrupted = tmp_path / "corrupted.bib.xz"
+    corrupted.write_bytes(b"not compressed")
+    assert utils.load([str(corrupted)], []) == []
+    _assert_log_contains(
+        caplog.records,
+        message=f"`pybtex` plugin failed to parse file `{corrupted}`",
+        level=logging.ERROR,
+        count=1,
+    )
+
+
+def test_csljson():
+    from pelican.plugins.pybtex import csljson
+
+    key, entry = csljson.to_entry(
+        {
+            "id": "item-1",
+            "citation-key": "doe2020",
+            "type": "paper-conference",
+            "title": "On $x$ & {y}",
+            "container-title": "Proceedings",
+            "author": [{"family": "Doe", "given": "John", "suffix": "Jr."}],
+            "editor": [{"literal": "The Committee"}],
+            "issued": {"date-parts": [[2020]]},
+            "page": "5-7",
+        }
+    )
+    assert key == "doe2020"
+    assert entry.type == "inproceedings"
+    assert dict(entry.fields) == {
+        "title": r"{On \$x\$ \& \{y\}}",
+        "booktitle": "Proceedings",
+        "pages": "5--7",
+        "year": "2020",
+    }
+    assert str(entry.persons["author"][0]) == "Doe, Jr., John"
+    assert entry.persons["editor"][0].last_names == ["{The Committee}"]
+
+    assert csljson.to_entry({"id": 3, "type": "dataset"})[0] == "3"
+    assert csljson.to_entry({"id": 3, "type": "dataset"})[1].type == "misc"
+
+    with pytest.raises(csljson.CslJsonError):
+        csljson.parse_string('{"id": "a"}')
+    with pytest.raises(csljson.CslJsonError):
+        csljson.parse_string('[{"type": "book"}]')
+
+
+def test_load_formats(caplog, tmp_path):
+    import gzip
+
+    from pelican.plugins.pybtex import utils
+
+    assert utils.split_source("refs.json") == ("", "refs.json")
+    assert utils.split_source("csljson:refs.txt") == ("csljson", "refs.txt")
+    assert utils.split_source("sqlite:refs.db") == ("sqlite", "refs.db")
+    assert utils.split_source("other:refs.bib") == ("", "other:refs.bib")
+
+    content = pathlib.Path(__file__).parent / "data" / "formats" / "content"
+    (tmp_path / "refs.txt").write_bytes((content / "publications.json").read_bytes())
+    (tmp_path / "refs.yml.gz").write_bytes(
+        gzip.compress((content / "publications.yaml").read_bytes())
+    )
+
+    loaded = utils.load(["csljson:refs.txt", "refs.yml.gz"], [tmp_path])
+    assert [list(k.entries) for k in loaded] == [["doe2020", "acme2021"], ["roe2019"]]
+
+    # without a prefix, unknown suffixes are parsed as BibTeX
+    assert not utils.load(["refs.txt"], [tmp_path])[0].entries
+
+    (tmp_path / "broken.json").write_text("[")
+    (tmp_path / "broken.yaml").write_text("entries: [")
+    assert utils.load(["broken.json", "broken.yaml"], [tmp_path]) == []
+    for name in ("broken.json", "broken.yaml"):
+        _assert_log_contains(
+            caplog.records,
+            message=f"`pybtex` plugin failed to parse file `{name}`",
+            level=logging.ERROR,
+            count=1,
+        )
+
+
+@pytest.mark.parametrize("subdir", ["formats"])
+def test_formats(setup_pelican: tuple[list[logging.LogRecord], pathlib.Path]):
+    records, pelican_output = setup_pelican
+
+    with (pelican_output / "publications.html").open() as f:
+        soup = BeautifulSoup(f, "html.parser")
+    details = soup.find_all("div", id="pybtex")[0].find_all("details")
+    assert sorted(k.attrs["id"] for k in details) == [
+        "pybtex-acme2021",
+        "pybtex-doe2020",
+        "pybtex-roe2019",
+    ]
+
+    with (pelican_output / "article.html").open() as f:
+        soup = BeautifulSoup(f, "html.parser")
+    details = soup.find_all("div", id="pybtex")[0].find_all("details")
+    assert [k.attrs["id"] for k in details] == [
+        "pybtex-doe2020",
+        "pybtex-acme2021",
+        "pybtex-roe2019",
+    ]
+    assert "Learning with 50% of the DNA" in details[0].summary.text
+    assert "May 2020" in details[0].summary.text
+
+    _assert_log_no_errors(records)
+
+
+def test_compiled_stale(tmp_path):
+    from pelican.plugins.pybtex import cli, compiled, utils
+
+    source = tmp_path / "refs.bib"
+    source.write_text('@article{art1, author = "John Doe", title = "One", year = 2001}')
+    assert cli.main(["compile", str(source)]) == 0
+
+    output = tmp_path / "refs.pybtexc"
+    assert list(utils.load([str(output)], [])[0].entries.keys()) == ["art1"]
+
+    with source.open("a") as f:
+        f.write('\n@article{art2, author = "John Doe", title = "Two", year = 2002}')
+
+    assert compiled.stale_source(output) == source
+    assert list(utils.load([str(output)], [])[0].entries.keys()) == ["art1", "art2"]
+    stale_digest = utils.sources_digest([str(output)], [])
+
+    # sources are compared by contents, not by modification time
+    assert cli.main(["compile", str(source)]) == 0
+    digest = utils.sources_digest([str(output)], [])
+    assert digest != stale_digest
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert compiled.stale_source(output) is None
+    assert utils.sources_digest([str(output)], []) == digest
+
+
+def test_compiled_corrupted(caplog, tmp_path):
+    from pelican.plugins.pybtex import cli, compiled, utils
+
+    source = tmp_path / "refs.bib"
+    source.write_text('@article{art1, author = "John Doe", title = "One", year = 2001}')
+    output = tmp_path / "refs.pybtexc"
+    assert cli.main(["compile", str(source)]) == 0
+    contents = output.read_bytes()
+
+    # cut short in the string blob, records, or header
+    for size in (len(contents) - 3, len(contents) // 2, 40):
+        output.write_bytes(contents[:size])
+        with pytest.raises(compiled.CompiledFormatError):
+            compiled.load(output)
+        utils.process_cache.clear()
+        loaded = utils.load([str(output)], [])
+        if size >= len(contents) // 2:
+            # source path is still readable, so the source is parsed instead
+            assert list(loaded[0].entries.keys()) == ["art1"]
+        else:
+            assert loaded == []
+
+    _assert_log_contains(
+        caplog.records,
+        message=f"Compiled `pybtex` file `{output}` is corrupted",
+        level=logging.WARNING,
+        count=2,
+    )
+    _assert_log_contains(
+        caplog.records,
+        message="`pybtex` plugin failed to parse file",
+        level=logging.ERROR,
+        count=1,
+    )
+
+
+def test_sqlite_store(caplog, tmp_path):
+    from pelican.plugins.pybtex import cli, store, utils
+
+    source = tmp_path / "refs.bib"
+    source.write_text(
+        '@article{art1, author = "John Doe and Jane Roe", title = "One", year = 2001}\n'
+        '@article{art2, author = "Jane Roe", title = "Two", year = 2005}\n'
+        '@article{art3, author = "John Doe", title = "Three", year = 2010}\n'
+    )
+    database = tmp_path / "refs.sqlite"
+    assert cli.main(["import", str(source), "-o", str(database)]) == 0
+
+    # re-importing unchanged entries does not rewrite them
+    bibdata = utils.load([str(source)], [])[0]
+    assert store.import_bibdata(database, bibdata) == 0
+
+    def _keys(**select):
+        loaded = utils.load([f"sqlite:{database}"], [], select=select)
+        return list(loaded[0].entries.keys())
+
+    assert _keys() == ["art1", "art2", "art3"]
+    assert _keys(keys=["art3", "art1"]) == ["art1", "art3"]
+    assert _keys(authors=["Doe"]) == ["art1", "art3"]
+    assert _keys(authors=["Roe"], years=(2002, 2010)) == ["art2"]
+
+    # selections of a store replace each other on the cache
+    slots = [k for k in utils.process_cache._slots if str(database) in k]  # noqa: SLF001
+    assert len(slots) == 1
+
+    caplog.set_level(logging.ERROR)
+    assert not utils.load([f"sqlite:{database}"], [], select={"year": 2001})
+    _assert_log_contains(
+        caplog.records,
+        message="cannot select entries of store",
+        level=logging.ERROR,
+        count=1,
+    )
+
+    stores = utils.open_stores([f"sqlite:{database}", str(source)], [])
+    assert len(stores) == 1
+    entries = stores[0].fetch(["art2", "missing"])
+    assert list(entries.keys()) == ["art2"]
+    assert entries["art2"] == bibdata.entries["art2"]
+    assert entries["art2"].key == "art2"
+
+    # keys are matched ignoring case, and output by their requested spelling
+    entries = stores[0].fetch(["ART3", "art1"])
+    assert sorted(entries.keys()) == ["ART3", "art1"]
+    assert entries["ART3"].key == "art3"
+    stores[0].close()
+
+
+@pytest.mark.parametrize("subdir", ["empty"])
+def test_sqlite_store_build(caplog, monkeypatch, tmp_path, build_pelican):
+    import pybtex.database
+
+    from pelican.plugins.pybtex import store, utils
+
+    content = tmp_path / "content"
+    content.mkdir()
+    (content / "article.rst").write_text(
+        "This is an article\n"
+        "##################\n\n"
+        ":date: 2010-10-03 10:20\n"
+        ":slug: article\n\n"
+        "This cites [@@Art1] and [@@art2].\n"
+    )
+    bibdata = pybtex.database.parse_string(
+        '@article{art1, author = "John Doe", title = "One", journal = "J", year = 2001}'
+        '@article{art2, author = "Jane Roe", title = "Two", journal = "J", year = 2005}',
+        "bibtex",
+    )
+    store.import_bibdata(content / "refs.sqlite", bibdata)
+
+    closed: list[pathlib.Path] = []
+    original = store.SqliteStore.close
+
+    def _close(self):
+        closed.append(self.path)
+        original(self)
+
+    monkeypatch.setattr(store.SqliteStore, "close", _close)
+    utils.process_cache.clear()
+    output = build_pelican(
+        PATH=content,
+        PYBTEX_SOURCES=["sqlite:refs.sqlite"],
+        PYBTEX_SQLITE_SELECT={"keys": []},
+        PYBTEX_BIBTEX_SAVE_AS="bibtex/{slug}.bib",
+    )
+
+    with (output / "article.html").open() as f:
+        soup = BeautifulSoup(f, "html.parser")
+    details = soup.find_all("div", id="pybtex")[0].find_all("details")
+    assert [k.attrs["id"] for k in details] == ["pybtex-Art1", "pybtex-art2"]
+    assert (output / "bibtex" / "art1.bib").exists()
+    assert (output / "bibtex" / "art2.bib").exists()
+    # stores are closed after loading global entries, and once the build is finished
+    assert closed == [content / "refs.sqlite"] * 2
+    _assert_log_no_errors(caplog.records)
+
+
+def test_profile_cli(caplog, monkeypatch, tmp_path):
+    from pelican.plugins.pybtex import cli, utils
+
+    caplog.set_level(logging.INFO)
+    monkeypatch.chdir(tmp_path)  # templates are cached under (relative) CACHE_PATH
+
+    formatted: list[int] = []
+    original = utils.PublicationList._format  # noqa: SLF001
+
+    def _format(self, index):
+        formatted.append(index)
+        return original(self, index)
+
+    monkeypatch.setattr(utils.PublicationList, "_format", _format)
+    utils.process_cache.clear()
+
+    settings = pathlib.Path(__file__).parent / "data" / "biblio-global"
+    settings = settings / "pelicanconf.py"
+    assert cli.main(["profile", "--settings", str(settings), "--tracemalloc"]) == 0
+
+    # all global entries are formatted (on the "format" phase)
+    assert sorted(formatted) == [0, 1]
+
+    for phase in ("load", "context", "format", "inject"):
+        _assert_log_contains(
+            caplog.records, message=f"Phase `{phase}`:", level=logging.INFO, count=1
+        )
+    _assert_log_contains(
+        caplog.records,
+        message="Profiled 2 global entries and 1 content object(s)",
+        level=logging.INFO,
+        count=1,
+    )
+
+
+@pytest.mark.parametrize("subdir", ["bibtex-files"])
+def test_bibtex_files(setup_pelican: tuple[list[logging.LogRecord], pathlib.Path]):
+    records, pelican_output = setup_pelican
+
+    publication_keys = ["art1", "art2"]
+
+    for key in publication_keys:
+        bibtex = pelican_output / "publications" / "bib" / f"{key}.bib"
+        assert bibtex.exists()
+        assert bibtex.read_text().startswith(f"@article{{{key},")
+
+    combined = pelican_output / "publications" / "bib" / "publications.bib"
+    assert combined.exists()
+    assert combined.read_text().count("@article") == len(publication_keys)
+
+    for html in (pelican_output / "publications.html", pelican_output / "article.html"):
+        with html.open() as f:
+            soup = BeautifulSoup(f, "html.parser")
+
+        div = soup.find_all("div", id="pybtex")
+        assert len(div) == 1
+
+        details = div[0].find_all("details")
+        assert len(details) == len(publication_keys)
+        for detail in details:
+            # no inline (pygments-highlighted) BibTeX
+            assert len(detail.find_all("pre")) == 0
+            a = detail.find_all("a", class_="pybtex-bibtex")
+            assert len(a) == 1
+            key = detail.attrs["id"][len("pybtex-") :]
+            assert a[0].attrs["href"].endswith(f"/publications/bib/{key}.bib")
+
+    _assert_log_no_errors(records, level=logging.WARNING)
+
+
+def test_minify_html():
+    from pelican.plugins.pybtex import output
+
+    html = """<!-- comment -->
+<div id="a">
+    <p>Some   <em>inline</em> <b>text</b></p>
+    <pre>keep
+  this</pre>
+</div>
+"""
+    assert output.minify_html(html) == (
+        '<div id="a"><p>Some <em>inline</em> <b>text</b></p><pre>keep\n  this</pre></div>'
+    )
+
+
+@pytest.mark.parametrize("subdir", ["minify"])
+def test_minify(setup_pelican: tuple[list[logging.LogRecord], pathlib.Path]):
+    records, pelican_output = setup_pelican
+
+    stylesheet = pelican_output / "theme" / "css" / "pybtex.css"
+    assert stylesheet.exists()
+    assert ".highlight" in stylesheet.read_text()
+
+    for html in (pelican_output / "publications.html", pelican_output / "article.html"):
+        text = html.read_text()
+        soup = BeautifulSoup(text, "html.parser")
+
+        div = soup.find_all("div", id="pybtex")
+        assert len(div) == 1
+        assert "\n    <details" not in str(div[0])
+        # class-based highlighting, despite PYGMENTS_RST_OPTIONS
+        assert len(div[0].find_all("pre")) > 0
+        assert "style=" not in str(div[0])
+
+        link = soup.find_all("link", href=lambda k: k.endswith("/theme/css/pybtex.css"))
+        assert len(link) == 1
+
+    _assert_log_contains(
+        records, message="Minified `publications.html`", level=logging.INFO
+    )
+    _assert_log_no_errors(records, level=logging.WARNING)
+
+
+def test_tokenize_equivalence():
+    from pelican.plugins.pybtex.injector import CITE_RE, format_citation, tokenize
+
+    # single citations are tokenized and formatted as with the original regex path
+    data_path = pathlib.Path(__file__).parent / "data"
+    text = "".join(
+        k.read_text() for k in sorted(data_path.glob("*/content/**/*.*")) if k.is_file()
+    )
+    text += " [@a] [&#64;&#64;b] [@@ c ] [@a;b] [@missing] [not a citation] [ @a]"
+    labels = {"a": (0, "1"), "b": (1, "2"), "a;b": (2, "3"), "art1": (3, "4")}
+
+    def _re_repl(matchobj):
+        key = matchobj.groups()[-1]
+        if key in labels:
+            return (
+                f'<a title="click to jump to reference [{labels[key][1]}]" '
+                f'href="#pybtex-{key}">[{labels[key][1]}]</a>'
+            )
+        return f'<span title="cannot find citation {key}">[{key}?]</span>'
+
+    tokens = tokenize(text)
+    assert [k for t in tokens if isinstance(t, list) for k in t] == [
+        k[-1] for k in CITE_RE.findall(text)
+    ]
+    assert "".join(
+        k if isinstance(k, str) else format_citation(k, labels) for k in tokens
+    ) == CITE_RE.sub(_re_repl, text)
+
+    # as with CITE_RE, no spaces are accepted before the first marker
+    assert tokenize("see [ @a] or [ @a; @b]") == ["see [ @a] or [ @a; @b]"]
+
+
+def test_grouped_citations():
+    from pelican.plugins.pybtex.injector import format_citation, tokenize
+
+    tokens = tokenize("See [@c; @a;@b ] and [&#64;e ; &#64;&#64;x; @g][@a].")
+    assert tokens == ["See ", ["c", "a", "b"], " and ", ["e", "x", "g"], ["a"], "."]
+
+    labels = {k: (i, str(i + 1)) for i, k in enumerate("abcdefg")}
+    html = format_citation(["c", "a", "b", "g", "x", "e", "a"], labels)
+    soup = BeautifulSoup(html, "html.parser")
+    assert soup.text == "[1\u20133, 5, 7, x?]"
+    assert [k.attrs["href"] for k in soup.find_all("a")] == [
+        "#pybtex-a",
+        "#pybtex-c",
+        "#pybtex-e",
+        "#pybtex-g",
+    ]
+
+    # non-numeric labels are sorted, but not compressed
+    labels = {"a": (0, "Abc20"), "b": (1, "Def21"), "c": (2, "Ghi22")}
+    html = format_citation(["c", "b", "a"], labels)
+    assert BeautifulSoup(html, "html.parser").text == "[Abc20, Def21, Ghi22]"
+
+    # global numbers are sorted by value, and only compressed if consecutive
+    labels = {"a": (0, "7"), "b": (1, "3"), "c": (2, "5"), "d": (3, "4")}
+    html = format_citation(["a", "b", "c", "d"], labels)
+    assert BeautifulSoup(html, "html.parser").text == "[3\u20135, 7]"
+
+
+def test_label_service():
+    import pybtex.database
+
+    from pelican.plugins.pybtex import utils
+
+    bibdata = pybtex.database.parse_string(
+        """
+        @article{a, author = "John Doe", title = "A", year = 2020, journal = "J"}
+        @article{b, author = "John Doe", title = "B", year = 2020, journal = "J"}
+        @article{c, author = "Ann Smith", title = "C", year = 2021, journal = "J"}
+        """,
+        "bibtex",
+    )
+    local = pybtex.database.parse_string(
+        '@article{x, author = "Ann Smith", title = "X", year = 2021, journal = "J"}',
+        "bibtex",
+    )
+    service = utils.LabelService([bibdata])
+
+    assert service.global_labels("alpha") == ["Doe20a", "Doe20b", "Smi21"]
+    assert service.global_labels("alpha") is service.global_labels("alpha")
+
+    cited = {"c": bibdata.entries["c"], "b": bibdata.entries["b"]}
+    cited["x"] = local.entries["x"]
+    assert service.labels(cited, "plain") == ["1", "2", "3"]
+    assert service.labels(cited, "alpha") == ["Smi21a", "Doe20", "Smi21b"]
+    assert service.labels(cited, "plain", "global") == ["3", "2", "4"]
+    assert service.labels(cited, "alpha", "global") == ["Smi21", "Doe20b", "Smi21a"]
+
+    # suffixes skip labels already used on the bibliography
+    cited = {"a": bibdata.entries["a"], "b": bibdata.entries["b"]}
+    cited["y"] = pybtex.database.parse_string(
+        '@article{y, author = "John Doe", title = "Y", year = 2020, journal = "J"}',
+        "bibtex",
+    ).entries["y"]
+    assert service.labels(cited, "alpha", "global") == ["Doe20a", "Doe20b", "Doe20c"]
+
+
+def test_publication_index():
+    import pybtex.database
+
+    from pelican.plugins.pybtex import query, utils
+
+    bibdata = pybtex.database.parse_string(
+        """
+        @article{a, author = "John {D}oe and Ann Smith", title = "A", year = 2019,
+                 journal = "J", keywords = "vision, Learning", foo = "Bar"}
+        @inproceedings{b, author = "Ann Smith", title = "B", year = 2021,
+                       booktitle = "C", keywords = "learning"}
+        @article{c, author = "John Doe", title = "C", year = 2022, journal = "J"}
+        """,
+        "bibtex",
+    )
+    publications = utils.generate_context([bibdata], "plain", ["foo"], {})
+    index = query.PublicationIndex(
+        publications, list(bibdata.entries.values()), ["foo"]
+    )
+
+    def _keys(**kwargs):
+        return [k["key"] for k in index.query(**kwargs)]
+
+    assert _keys() == ["a", "b", "c"]
+    assert _keys(author="doe") == ["a", "c"]
+    assert _keys(author=["Doe", "Smith"], newest_first=True) == ["c", "b", "a"]
+    assert _keys(author="Smith", since=2020) == ["b"]
+    assert _keys(entry_type="article", until=2020) == ["a"]
+    assert _keys(keyword="Learning") == ["a", "b"]
+    assert _keys(year=2022) == ["c"]
+    assert _keys(foo="bar") == ["a"]
+    assert _keys(newest_first=True, limit=1) == ["c"]
+    assert index.names["author"]["doe"] == "Doe"
+
+    # results are memoized
+    assert index.positions(author="doe") is index.positions(author="doe")
+
+
+def test_format_date(caplog, monkeypatch):
+    import datetime
+    import locale
+
+    from pelican.plugins.pybtex import utils
+
+    def _setlocale(category, value=None):
+        assert value is None, "the process locale must not be changed"
+        return original(category)
+
+    original = locale.setlocale
+    monkeypatch.setattr(locale, "setlocale", _setlocale)
+
+    date = datetime.datetime(2024, 3, 5, 14, 30)
+    date_format = "%A %a %d %B %b %Y %I%p %%B"
+
+    assert utils.format_date(date, date_format) == date.strftime(date_format)
+    assert utils.format_date(date, date_format, "C") == date.strftime(date_format)
+    assert utils.format_date(date, date_format, "C") == (
+        "Tuesday Tue 05 March Mar 2024 02PM %B"
+    )
+
+    # the current locale is checked on each call, not when the module is imported,
+    # as Pelican may set another one for each site built by the same process
+    monkeypatch.setattr(
+        locale, "setlocale", lambda category, value=None: "xx_XX.CURRENT"
+    )
+    caplog.set_level(logging.WARNING)
+    assert utils.format_date(date, date_format, "xx_XX.CURRENT") == date.strftime(
+        date_format
+    )
+    assert not caplog.records
+    monkeypatch.setattr(locale, "setlocale", _setlocale)
+
+    assert utils.format_date(date, date_format, "xx_XX.UNKNOWN") == date.strftime(
+        date_format
+    )
+    _assert_log_contains(
+        caplog.records,
+        message="is not available" if utils.babel else "without `babel`",
+        level=logging.WARNING,
+    )
+
+
+def test_format_date_babel():
+    import datetime
+
+    pytest.importorskip("babel")
+
+    from pelican.plugins.pybtex import utils
+
+    date = datetime.datetime(2024, 3, 5, 14, 30)
+    assert utils.format_date(date, "%A %d %B %Y", "fr_FR.UTF-8") == (
+        "mardi 05 mars 2024"
+    )
+
+
+def test_bounded_cache(caplog):
+    from pelican.plugins.pybtex import utils
+
+    kib = 1024
+    assert utils.parse_size(kib) == kib
+    assert utils.parse_size("2K") == 2 * kib
+    assert utils.parse_size("1.5 MiB") == 1536 * kib
+    with pytest.raises(ValueError):
+        utils.parse_size("lots")
+
+    value = "x" * 1000
+    size = utils.deep_sizeof(value)
+    cache = utils.ProcessCache(budget=2 * size, name="test")
+
+    caplog.set_level(logging.DEBUG)
+    cache.put("a", None, value)
+    cache.put("b", None, value)
+    assert cache.get("a", None) == value  # "b" is now the least recently used
+    cache.put("c", None, value)
+
+    assert cache.get("b", None) is None
+    assert cache.get("a", None) == value
+    assert cache.get("c", None) == value
+    assert cache.size == 2 * size
+    assert cache.peak == 2 * size
+    assert cache.evictions == 1
+    _assert_log_contains(
+        caplog.records, message="Evicted `b`", level=logging.DEBUG, count=1
+    )
+
+    # values larger than the budget are not cached
+    cache.put("d", None, value * 3)
+    assert cache.get("d", None) is None
+
+
+def test_publication_list():
+    import pybtex.database
+
+    from pelican.plugins.pybtex import utils
+
+    bibdata = pybtex.database.parse_string(
+        "".join(
+            f'@article{{k{i}, author = "John Doe", title = "T{i}", year = {2000 + i},'
+            f' journal = "J"}}'
+            for i in range(10)
+        ),
+        "bibtex",
+    )
+    expected = utils.generate_context([bibdata], "alpha", [], {})
+
+    cache = utils.ProcessCache(budget=utils.deep_sizeof(expected[0]) * 3, name="test")
+    publications = utils.PublicationList(
+        [bibdata],
+        "alpha",
+        [],
+        {},
+        cache=cache,
+        transform=lambda k: k.update({"extra": 1}),
+    )
+
+    assert len(publications) == len(expected)
+    for _ in range(2):  # entries are formatted again, after eviction
+        assert list(publications) == [dict(k, extra=1) for k in expected]
+    assert publications[-1]["key"] == "k9"
+    assert [k["key"] for k in publications[1:3]] == ["k1", "k2"]
+    assert cache.evictions > 0
+
+
+@pytest.mark.parametrize("subdir", ["publication-pages"])
+def test_memory_budget(caplog, tmp_path, build_pelican):
+    build_pelican(PYBTEX_MEMORY_BUDGET="4K")
+
+    publication_keys = ["art1", "art2"]
+    for html in (
+        tmp_path / "output" / "publications.html",
+        tmp_path / "output" / "article.html",
+    ):
+        with html.open() as f:
+            soup = BeautifulSoup(f, "html.parser")
+        details = soup.find_all("div", id="pybtex")[0].find_all("details")
+        assert len(details) == len(publication_keys)
+
+    assert (tmp_path / "output" / "publications" / "art1" / "index.html").exists()
+    _assert_log_no_errors(caplog.records)
+    _assert_log_contains(
+        caplog.records,
+        message="`pybtex` cache: peak usage of",
+        level=logging.INFO,
+        count=1,
+    )
+
+
+@pytest.mark.parametrize("subdir", ["group-pages"])
+def test_memory_budget_pages(caplog, monkeypatch, tmp_path, build_pelican):
+    from pelican.plugins.pybtex import output, utils
+
+    budget = 4096
+    events: list[str] = []
+    caches: list[utils.ProcessCache] = []
+
+    original_put = utils.ProcessCache.put
+
+    def _put(self, name, version, value):
+        original_put(self, name, version, value)
+        if self.budget is not None:
+            if self not in caches:
+                caches.append(self)
+            assert self.size <= self.budget
+
+    original_format = utils.PublicationList._format  # noqa: SLF001
+
+    def _format(self, index):
+        events.append("format")
+        return original_format(self, index)
+
+    original_write = output.write_if_changed
+
+    def _write(output_path, save_as, content):
+        events.append(save_as)
+        return original_write(output_path, save_as, content)
+
+    monkeypatch.setattr(utils.ProcessCache, "put", _put)
+    monkeypatch.setattr(utils.PublicationList, "_format", _format)
+    monkeypatch.setattr(output, "write_if_changed", _write)
+    utils.process_cache.clear()
+
+    build_pelican(PYBTEX_MEMORY_BUDGET=budget)
+
+    _assert_log_no_errors(caplog.records)
+    assert len(caches) == 1
+    assert 0 < caches[0].peak <= budget
+    assert caches[0].evictions > 0
+
+    # entries are formatted while pages are rendered, not all before the first one
+    for group in ("", "author/", "type/", "tag/"):
+        pages = [
+            k
+            for k, v in enumerate(events)
+            if v.startswith(f"publications/{group}")
+            and v.count("/") == group.count("/") + 2
+        ]
+        assert "format" in events[pages[0] : pages[-1]], group
+
+
+@pytest.mark.parametrize("subdir", ["biblio-global"])
+def test_publications_page_disabled(caplog, monkeypatch, tmp_path, build_pelican):
+    from pelican.plugins.pybtex import utils
+
+    formatted: list[int] = []
+    original = utils.PublicationList._format  # noqa: SLF001
+
+    def _format(self, index):
+        formatted.append(index)
+        return original(self, index)
+
+    monkeypatch.setattr(utils.PublicationList, "_format", _format)
+    utils.process_cache.clear()
+
+    build_pelican(PUBLICATIONS_SAVE_AS="")
+
+    assert not (tmp_path / "output" / "publications.html").exists()
+    assert (tmp_path / "output" / "article.html").exists()
+    assert formatted == []
+    _assert_log_no_errors(caplog.records)
+    _assert_log_contains(
+        caplog.records,
+        message="Not generating `publications.html` (disabled)",
+        level=logging.INFO,
+        count=1,
+    )
+
+
+@pytest.mark.parametrize("subdir", ["simple"])
+def test_bytecode_cache(caplog, tmp_path, build_pelican):
+    def _messages() -> list[str]:
+        return [
+            k.getMessage()
+            for k in caplog.records
+            if k.getMessage().startswith("Loaded `pybtex` templates in")
+        ]
+
+    # follows Pelican's content cache settings, that are disabled by default
+    build_pelican()
+    assert not (tmp_path / "cache" / "pybtex" / "templates").exists()
+    assert "bytecode cache: 0 hit(s)" in _messages()[-1]
+
+    builds = 2
+    for _ in range(builds):
+        build_pelican(CACHE_CONTENT=True, LOAD_CONTENT_CACHE=True)
+
+    assert list((tmp_path / "cache" / "pybtex" / "templates").glob("*.time"))
+    messages = _messages()[-builds:]
+    assert "bytecode cache: 0 hit(s), saving 0.0 ms" in messages[0]
+    assert ", 0 miss(es), compiled in 0.0 ms" not in messages[0]
+    assert "bytecode cache: 0 hit(s)" not in messages[1]
+    assert "saving 0.0 ms" not in messages[1]
+    assert ", 0 miss(es), compiled in 0.0 ms" in messages[1]
+
+    # cached templates are not loaded, unless requested
+    build_pelican(CACHE_CONTENT=True)
+    assert "bytecode cache: 0 hit(s)" in _messages()[-1]
+    _assert_log_no_errors(caplog.records)
+
+
+@pytest.mark.parametrize("subdir", ["translations"])
+@pytest.mark.parametrize("budget", [None, "1M"])
+def test_translations(caplog, monkeypatch, tmp_path, build_pelican, budget):
+    from pelican.plugins.pybtex import utils
+
+    caches: list[utils.ProcessCache] = []
+    original_put = utils.ProcessCache.put
+
+    def _put(self, name, version, value):
+        if isinstance(name, tuple) and name[0] == "bibliography":
+            caches.append(self)
+        original_put(self, name, version, value)
+
+    monkeypatch.setattr(utils.ProcessCache, "put", _put)
+    utils.process_cache.clear()
+
+    build_pelican(PYBTEX_MEMORY_BUDGET=budget)
+
+    # only the group with a translation is kept, on the budgeted cache (if set)
+    assert {k.budget for k in caches} == {
+        None if budget is None else utils.parse_size(budget)
+    }
+    slots = list(caches[0]._slots)  # noqa: SLF001
+    assert [k for k in slots if k[0] == "bibliography"] == [
+        ("bibliography", "ARTICLE", "article")
+    ]
+
+    bibliographies = {}
+    for name in ("article.html", "article-fr.html", "other.html"):
+        with (tmp_path / "output" / name).open() as f:
+            soup = BeautifulSoup(f, "html.parser")
+        bibliographies[name] = soup.find_all("div", id="pybtex")[0]
+
+    assert bibliographies["article.html"] == bibliographies["article-fr.html"]
+    assert bibliographies["article.html"] != bibliographies["other.html"]
+    _assert_log_no_errors(caplog.records)
+    _assert_log_contains(
+        caplog.records,
+        message="Reusing bibliography of a translation",
+        level=logging.DEBUG,
+        count=1,
+    )
+
+
+@pytest.mark.parametrize("subdir", ["translations"])
+def test_translations_global_numbering(caplog, tmp_path, data_path, build_pelican):
+    from pelican.plugins.pybtex import utils
+
+    content = tmp_path / "content"
+    shutil.copytree(data_path / "content", content)
+    extra = content / "extra.bib"
+    entry = (
+        '@article{{{}, author = "A. Abel", title = "T", journal = "J", year = 1900}}'
+    )
+
+    def _labels() -> list[str]:
+        with (tmp_path / "output" / "article.html").open() as f:
+            soup = BeautifulSoup(f, "html.parser")
+        div = soup.find_all("div", id="pybtex")[0]
+        return [k.text[1:].split("]")[0] for k in div.find_all("summary")]
+
+    utils.process_cache.clear()
+    settings = {
+        "PATH": content,
+        "PYBTEX_SOURCES": ["extra.bib", "publications.bib"],
+        "PYBTEX_CITATION_NUMBERING": "global",
+    }
+
+    extra.write_text(entry.format("extra1"))
+    build_pelican(**settings)
+    before = _labels()
+
+    # another source changes global numbering, but not the cited entries
+    extra.write_text(entry.format("extra1") + entry.format("extra2"))
+    os.utime(extra, (time.time() + 10, time.time() + 10))
+    build_pelican(**settings)
+
+    assert before
+    assert _labels() != before
+    _assert_log_no_errors(caplog.records)
+
+
+@pytest.mark.parametrize("subdir", ["biblio-global"])
+def test_bibliography_fragments(caplog, tmp_path, build_pelican):
+    for _ in range(2):
+        build_pelican(PYBTEX_BIBLIOGRAPHY_SAVE_AS="bibliography/{digest}.html")
+
+    with (tmp_path / "output" / "article.html").open() as f:
+        soup = BeautifulSoup(f, "html.parser")
+    assert not soup.find_all("div", id="pybtex")
+    placeholder = soup.find_all("details", class_="pybtex-fragment")[0]
+    assert placeholder.attrs["data-src"].startswith("/bibliography/")
+
+    fragment = tmp_path / "output" / placeholder.attrs["data-src"].lstrip("/")
+    with fragment.open() as f:
+        soup = BeautifulSoup(f, "html.parser")
+    details = soup.find_all("div", id="pybtex")[0].find_all("details")
+    assert [k.attrs["id"] for k in details] == ["pybtex-art2", "pybtex-art1"]
+
+    _assert_log_no_errors(caplog.records)
+    _assert_log_contains(
+        caplog.records,
+        message=f"Skipping unchanged `{fragment}`",
+        level=logging.DEBUG,
+        count=1,
+    )
+
+    # fragments no longer referenced are removed
+    build_pelican(
+        PYBTEX_BIBLIOGRAPHY_SAVE_AS="bibliography/{digest}.html",
+        PYBTEX_FORMAT_STYLE="alpha",
+    )
+    assert not fragment.exists()
+    assert len(list(fragment.parent.iterdir())) == 1
+
+
+def test_search_index(tmp_path):
+    import pybtex.database
+
+    from pelican.plugins.pybtex import search
+
+    bibdata = pybtex.database.parse_string(
+        r"""
+        @article{a, author = "J{\"o}rg M{\"u}ller", title = "Deep {CNN} \emph{tricks}",
+                 journal = "Vision Letters", year = 2020}
+        @book{b, editor = "Ann Smith", title = "Tricks of the trade", year = 2021,
+              publisher = "Vision Press", abstract = "On deep learning."}
+        """,
+        "bibtex",
+    )
+    entries = list(bibdata.entries.values())
+
+    assert search.plain_text(r"Deep {CNN} \emph{tricks}") == "Deep CNN tricks"
+    assert search.terms("Jörg's CNN, a tricky") == ["jorg", "cnn", "tricky"]
+
+    cache = search.TokenCache(tmp_path / "tokens.json")
+    index = search.build_index(entries, cache, ["a.html", "b.html"])
+    assert index["fields"] == ["key", "title", "authors", "year", "url"]
+    assert index["entries"][0] == [
+        "a",
+        "Deep CNN tricks",
+        "J\u00f6rg M\u00fcller",
+        "2020",
+        "a.html",
+    ]
+    assert index["terms"]["tricks"] == [0, 1]
+    assert index["terms"]["deep"] == [0, 1]
+    assert index["terms"]["muller"] == [0]
+    assert index["terms"]["smith"] == [1]
+    assert "emph" not in index["terms"]
+    assert (cache.hits, cache.misses) == (0, 2)
+    cache.save()
+
+    # modified entries are tokenized again
+    entries[1].fields["title"] = "Tricks of the craft"
+    cache = search.TokenCache(tmp_path / "tokens.json")
+    index = search.build_index(entries, cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert index["terms"]["craft"] == [1]
+    assert "trade" not in index["terms"]
+    assert "url" not in index["fields"]
+
+
+@pytest.mark.parametrize("subdir", ["publication-pages"])
+def test_search_index_build(caplog, tmp_path, build_pelican):
+    for _ in range(2):
+        build_pelican(PYBTEX_SEARCH_INDEX_SAVE_AS="publications/search.json")
+
+    index = json.loads(
+        (tmp_path / "output" / "publications" / "search.json").read_text()
+    )
+    assert [k[0] for k in index["entries"]] == ["art1", "art2"]
+    assert [k[-1] for k in index["entries"]] == [
+        "publications/art1/",
+        "publications/art2/",
+    ]
+    assert index["terms"]["incredible"] == [0, 1]
+
+    _assert_log_no_errors(caplog.records)
+    for message in ("(2 tokenized, 0 from cache)", "(0 tokenized, 2 from cache)"):
+        _assert_log_contains(
+            caplog.records, message=message, level=logging.INFO, count=1
+        )
+
+
+@pytest.mark.parametrize("subdir", ["biblio-global"])
+def test_pipeline_signals(tmp_path, build_pelican):
+    from pelican.plugins.pybtex import signals
+
+    received: dict[str, list[dict]] = {}
+
+    def _receiver(name):
+        def _record(sender, **kwargs):
+            del sender
+            received.setdefault(name, []).append(kwargs)
+
+        return _record
+
+    receivers = {
+        name: _receiver(name)
+        for name in (
+            "pybtex_sources_loaded",
+            "pybtex_labels_computed",
+            "pybtex_entries_formatted",
+            "pybtex_context_ready",
+            "pybtex_bibliography_injected",
+        )
+    }
+
+    def _replace(sender, **kwargs):
+        del sender
+        return [
+            {"key": e.key, "label": label, "html": "replaced", "year": 0}
+            for e, label in zip(kwargs["entries"], kwargs["labels"])
+        ]
+
+    for name, receiver in receivers.items():
+        getattr(signals, name).connect(receiver)
+    signals.pybtex_entries_formatting.connect(_replace)
+    try:
+        build_pelican(
+            PYBTEX_FORMAT_STYLE="unsrtalpha",  # not cached by other tests
+        )
+    finally:
+        for name, receiver in receivers.items():
+            getattr(signals, name).disconnect(receiver)
+        signals.pybtex_entries_formatting.disconnect(_replace)
+
+    assert [k["entries"] for k in received["pybtex_sources_loaded"]] == [2]
+    assert [k["labels"] for k in received["pybtex_labels_computed"]] == [2]
+    assert [k["entries"] for k in received["pybtex_context_ready"]] == [2]
+    injected = received["pybtex_bibliography_injected"]
+    assert [(k["citations"], k["entries"]) for k in injected] == [(3, 2)]
+    assert all(k["replaced"] for k in received["pybtex_entries_formatted"])
+    assert all(
+        k["elapsed"] >= 0 for v in received.values() for k in v if "elapsed" in k
+    )
+
+    with (tmp_path / "output" / "publications.html").open() as f:
+        soup = BeautifulSoup(f, "html.parser")
+    assert "replaced" in soup.find_all("div", id="pybtex")[0].text
+
+
+def test_deduplicate_databases():
+    import pybtex.database
+
+    from pelican.plugins.pybtex import utils
+
+    first = pybtex.database.parse_string(
+        """
+        @article{a, author = "John Doe", title = "T", year = 2020, doi = "10.1/X"}
+        @article{b, author = "Ann Smith", title = "{U}", year = 2021}
+        """,
+        "bibtex",
+    )
+    second = pybtex.database.parse_string(
+        """
+        @article{c, author = "J. Doe", title = "Other", year = 2020, journal = "J",
+                 doi = "doi:10.1/x"}
+        @article{d, author = "Ann Smith", title = "u", year = 2021}
+        @article{e, author = "Ann Smith", title = "u", year = 2022}
+        """,
+        "bibtex",
+    )
+
+    bibdata, aliases = utils.deduplicate([first, second])
+    assert aliases == {"a": "c", "d": "b"}
+    assert [list(k.entries) for k in bibdata] == [["b"], ["c", "e"]]
+    assert bibdata[1].entries["c"] is second.entries["c"]
+    # input databases are not modified
+    assert list(first.entries) == ["a", "b"]
+    assert list(second.entries) == ["c", "d", "e"]
+
+    assert utils.deduplicate([second]) == ([second], {})
+
+    # entries without persons are only merged by their DOI
+    anonymous = pybtex.database.parse_string(
+        """
+        @article{f, title = "Editorial", journal = "J", year = 2020}
+        @article{g, title = "Editorial", journal = "K", year = 2020}
+        @article{h, title = "Errata", year = 2020, doi = "10.1/E"}
+        @article{i, title = "Errata", year = 2021, doi = "10.1/e"}
+        """,
+        "bibtex",
+    )
+    bibdata, aliases = utils.deduplicate([anonymous])
+    assert aliases == {"i": "h"}
+    assert list(bibdata[0].entries) == ["f", "g", "h"]
+
+
+@pytest.mark.parametrize("subdir", ["deduplicate"])
+def test_deduplicate(setup_pelican: tuple[list[logging.LogRecord], pathlib.Path]):
+    records, pelican_output = setup_pelican
+
+    with (pelican_output / "publications.html").open() as f:
+        soup = BeautifulSoup(f, "html.parser")
+    details = soup.find_all("div", id="pybtex")[0].find_all("details")
+    assert sorted(k.attrs["id"] for k in details) == [
+        "pybtex-art2",
+        "pybtex-art3",
+        "pybtex-doe1901",
+    ]
+
+    with (pelican_output / "article.html").open() as f:
+        soup = BeautifulSoup(f, "html.parser")
+    details = soup.find_all("div", id="pybtex")[0].find_all("details")
+    assert [k.attrs["id"] for k in details] == [
+        "pybtex-doe1901",
+        "pybtex-art2",
+        "pybtex-art3",
+    ]
+    assert not [k for k in soup.find_all("a") if k.attrs["href"] == "#pybtex-art1"]
+
+    _assert_log_no_errors(records)
+    _assert_log_contains(
+        records,
+        message="Merged duplicate entries `art1` into `doe1901`",
+        level=logging.INFO,
+        count=1,
+    )
+    _assert_log_contains(
+        records,
+        message="Merged duplicate entries `joanna1902` into `art2`",
+        level=logging.INFO,
+        count=1,
+    )
+
+
+@pytest.mark.parametrize("subdir", ["deduplicate"])
+def test_deduplicate_shared_cache(caplog, tmp_path, build_pelican):
+    from pelican.plugins.pybtex import utils
+
+    expected = {True: 3, False: 5}
+    for deduplicate, count in expected.items():
+        # simulates separate processes, that do not share the process cache
+        utils.process_cache.clear()
+        output = build_pelican(
+            OUTPUT_PATH=tmp_path / str(deduplicate),
+            PYBTEX_DEDUPLICATE=deduplicate,
+            PYBTEX_SHARED_CACHE_PATH=tmp_path / "shared",
+            PUBLICATION_SAVE_AS="publications/{slug}/index.html",
+        )
+
+        with (output / "publications.html").open() as f:
+            soup = BeautifulSoup(f, "html.parser")
+        details = soup.find_all("div", id="pybtex")[0].find_all("details")
+        assert len(details) == count
+        assert len(list((output / "publications").iterdir())) == count
+
+    _assert_log_no_errors(caplog.records)
+
+
+def test_truncate_persons():
+    import pybtex.database
+
+    from pelican.plugins.pybtex import utils
+
+    bibdata = pybtex.database.parse_string(
+        """
+        @article{a, author = "John Doe and Ann Smith and Bob Roe", title = "T",
+                 journal = "J", year = 2020}
+        """,
+        "bibtex",
+    )
+    entry = bibdata.entries["a"]
+
+    assert utils.truncate_persons(entry, None) is entry
+    assert utils.truncate_persons(entry, 3) is entry
+
+    truncated = utils.truncate_persons(entry, 2)
+    assert truncated.key == "a"
+    assert [str(k) for k in truncated.persons["author"]] == [
+        "Doe, John",
+        "Smith, Ann",
+        "others",
+    ]
+    # the original entry is not modified
+    assert [str(k) for k in entry.persons["author"]] == [
+        "Doe, John",
+        "Smith, Ann",
+        "Roe, Bob",
+    ]
+
+    publications = utils.generate_context([bibdata], "plain", [], {}, max_authors=1)
+    assert publications[0]["html"].startswith("John Doe et al.")
+    # the BibTeX source of entries is not truncated
+    assert "Roe, Bob" in publications[0]["bibtex"]
+
+
+@pytest.mark.parametrize("subdir", ["max-authors"])
+def test_max_authors(setup_pelican: tuple[list[logging.LogRecord], pathlib.Path]):
+    records, pelican_output = setup_pelican
+
+    with (pelican_output / "publications.html").open() as f:
+        soup = BeautifulSoup(f, "html.parser")
+    details = soup.find_all("div", id="pybtex")[0].find_all("details")
+    text = [k.summary.text for k in details]
+    # the publications page lists the newest entries first
+    assert "John Doe and Joanna Doe." in text[0]
+    assert "John Doe, Joanna Doe et al." in text[1]
+    assert "Mary Major" not in text[1]
+
+    with (pelican_output / "article.html").open() as f:
+        soup = BeautifulSoup(f, "html.parser")
+    details = soup.find_all("div", id="pybtex")[0].find_all("details")
+    text = [k.summary.text for k in details]
+    assert "John Doe et al." in text[0]
+    assert "John Doe et al." in text[1]
+
+    _assert_log_no_errors(records)
+
+
+def test_write_if_changed(tmp_path):
+    from pelican.plugins.pybtex import output
+
+    assert output.write_if_changed(tmp_path, "a/b.txt", "contents")
+    assert (tmp_path / "a" / "b.txt").read_text() == "contents"
+    assert not output.write_if_changed(tmp_path, "a/b.txt", "contents")
+    assert output.write_if_changed(tmp_path, "a/b.txt", "new contents")
+    assert (tmp_path / "a" / "b.txt").read_text() == "new contents"
+
+
+@pytest.mark.parametrize("subdir", ["publication-pages"])
+def test_publication_pages(
+    setup_pelican: tuple[list[logging.LogRecord], pathlib.Path],
+):
+    records, pelican_output = setup_pelican
+
+    with (pelican_output / "publications.html").open() as f:
+        soup = BeautifulSoup(f, "html.parser")
+    publication_keys = ["art1", "art2"]
+    permalinks = soup.find_all("a", class_="pybtex-permalink")
+    assert len(permalinks) == len(publication_keys)
+
+    for key in publication_keys:
+        page = pelican_output / "publications" / key / "index.html"
+        assert page.exists()
+
+        with page.open() as f:
+            soup = BeautifulSoup(f, "html.parser")
+
+        assert len(soup.find_all("p", id=f"pybtex-{key}")) == 1
+
+        # the article cites both entries
+        cited_in = soup.find_all("ul", class_="pybtex-cited-in")
+        assert len(cited_in) == 1
+        a = cited_in[0].find_all("a")
+        assert len(a) == 1
+        assert a[0].attrs["href"].endswith("/article.html")
+
+    _assert_log_no_errors(records)
+    _assert_log_contains(
+        records,
+        message="Rendered 2 out of 2 `publication` page(s)",
+        level=logging.INFO,
+        count=1,
+    )
+
+
+@pytest.mark.parametrize("subdir", ["group-pages"])
+def test_group_pages(setup_pelican: tuple[list[logging.LogRecord], pathlib.Path]):
+    records, pelican_output = setup_pelican
+
+    expected = {
+        "author/doe": ["art1", "art2"],
+        "author/smith": ["art2", "inproc3"],
+        "type/article": ["art1", "art2"],
+        "type/inproceedings": ["inproc3"],
+        "tag/learning": ["art1", "art2"],
+        "tag/vision": ["art1"],
+    }
+
+    for group, keys in expected.items():
+        page = pelican_output / "publications" / group / "index.html"
+        assert page.exists()
+
+        with page.open() as f:
+            soup = BeautifulSoup(f, "html.parser")
+
+        div = soup.find_all("div", id="pybtex")
+        assert len(div) == 1
+        assert sorted(k.attrs["id"] for k in div[0].find_all("details")) == [
+            f"pybtex-{k}" for k in keys
+        ]
+
+    _assert_log_no_errors(records)
+    _assert_log_contains(
+        records,
+        message="Rendered 2 out of 2 `publications_group` page(s)",
+        level=logging.INFO,
+        count=3,
+    )
+
+
+@pytest.mark.parametrize("subdir", ["publication-pages"])
+def test_publication_pages_incremental(caplog, build_pelican):
+    builds = 2
+    for _ in range(builds):
+        build_pelican()
+
+    _assert_log_contains(
+        caplog.records,
+        message="Rendered 2 out of 2 `publication` page(s)",
+        level=logging.INFO,
+        count=1,
+    )
+    _assert_log_contains(
+        caplog.records,
+        message="Rendered 0 out of 2 `publication` page(s)",
+        level=logging.INFO,
+        count=1,
+    )
+
+
+@pytest.mark.parametrize("subdir", ["group-pages"])
+def test_publication_pages_site_changes(caplog, tmp_path, data_path, build_pelican):
+    content = tmp_path / "content"
+    shutil.copytree(data_path / "content", content)
+
+    build_pelican(PATH=content)
+    build_pelican(PATH=content)
+
+    # adds a page, listed on menus of all pages extending `base.html`
+    (content / "pages").mkdir()
+    (content / "pages" / "about.rst").write_text("About Us\n########\n\nHello.\n")
+    output = build_pelican(PATH=content)
+
+    for message, count in (
+        ("Rendered 3 out of 3 `publication` page(s)", 2),
+        ("Rendered 0 out of 3 `publication` page(s)", 1),
+        ("Rendered 2 out of 2 `publications_group` page(s)", 6),
+        ("Rendered 0 out of 2 `publications_group` page(s)", 3),
+    ):
+        _assert_log_contains(
+            caplog.records, message=message, level=logging.INFO, count=count
+        )
+
+    for page in ("publications/art1/index.html", "publications/author/doe/index.html"):
+        assert "About Us" in (output / page).read_text()
+
+
+def test_injector_multiple_generators():
+    from pelican.plugins.pybtex.injector import PybtexInjector
+
+    class _Generator:
+        def __init__(self, settings):
+            self.settings = settings
+            self.bibdata = []
+            self.memory_cache = None
+
+    class _Content:
+        def __init__(self, settings):
+            self.settings = settings
+
+    first = _Generator({"LANG": "en"})
+    second = _Generator({"LANG": "fr"})
+
+    injector = PybtexInjector()
+    assert injector._select(_Content(first.settings)) is None  # noqa: SLF001
+
+    injector.init(first)
+    injector.init(second)
+
+    assert injector._select(_Content(first.settings))[0] is first  # noqa: SLF001
+    assert injector._select(_Content(second.settings))[0] is second  # noqa: SLF001
+    # unknown settings default to the last initialized generator
+    assert injector._select(_Content({}))[0] is second  # noqa: SLF001
+
+
+@pytest.mark.parametrize("subdir", ["biblio-global"])
+def test_process_cache(caplog, tmp_path, build_pelican):
+    from pelican.plugins.pybtex import utils
+
+    utils.process_cache.clear()
+
+    for lang in ("en", "fr"):
+        build_pelican(
+            DEFAULT_LANG=lang,
+            OUTPUT_PATH=tmp_path / lang,
+        )
+
+        with (tmp_path / lang / "article.html").open() as f:
+            soup = BeautifulSoup(f, "html.parser")
+        assert len(soup.find_all("div", id="pybtex")) == 1
+
+    _assert_log_contains(
+        caplog.records,
+        message="Reusing already loaded pybtex file",
+        level=logging.DEBUG,
+        count=1,
+    )
+    _assert_log_contains(
+        caplog.records,
+        message="Reusing formatted entries from another generator",
+        level=logging.DEBUG,
+        count=1,
+    )
+
+
+def test_shared_cache(tmp_path):
+    from pelican.plugins.pybtex import shared
+
+    calls = []
+
+    def _compute():
+        calls.append(1)
+        return {"value": 42}
+
+    first = shared.SharedCache(tmp_path / "shared")
+    second = shared.SharedCache(tmp_path / "shared")
+
+    assert first.get_or_compute("abc", _compute) == {"value": 42}
+    assert second.get_or_compute("abc", _compute) == {"value": 42}
+    assert len(calls) == 1
+    assert not stat.S_IMODE((tmp_path / "shared").stat().st_mode) & (
+        stat.S_IRWXG | stat.S_IRWXO
+    )
+
+    # files not used for a while are pruned
+    (published,) = (tmp_path / "shared").glob("abc-*.pickle")
+    old = time.time() - 2 * 24 * 60 * 60
+    for k in (published, tmp_path / "shared" / "abc.lock"):
+        os.utime(k, (old, old))
+    shared.SharedCache(tmp_path / "shared", max_age=3)
+    assert published.exists()
+    shared.SharedCache(tmp_path / "shared", max_age=1)
+    assert not published.exists()
+    assert not (tmp_path / "shared" / "abc.lock").exists()
+
+
+def test_shared_cache_unsafe(caplog, monkeypatch, tmp_path):
+    from pelican.plugins.pybtex import shared
+
+    calls = []
+
+    def _compute():
+        calls.append(1)
+        return {"value": 42}
+
+    # directories other users may write to are not used
+    unsafe = tmp_path / "unsafe"
+    unsafe.mkdir()
+    unsafe.chmod(0o777)
+    cache = shared.SharedCache(unsafe)
+    assert cache.get_or_compute("abc", _compute) == {"value": 42}
+    assert not list(unsafe.iterdir())
+    _assert_log_contains(
+        caplog.records,
+        message=f"Shared `pybtex` cache directory `{unsafe}` may be written",
+        level=logging.WARNING,
+        count=1,
+    )
+
+    # values published by other users are not loaded
+    cache = shared.SharedCache(tmp_path / "shared")
+    assert cache.get_or_compute("abc", _compute) == {"value": 42}
+    monkeypatch.setattr(os, "getuid", lambda: -1)
+    assert cache.get_or_compute("abc", _compute) == {"value": 42}
+    assert len(calls) == 3  # noqa: PLR2004
+    _assert_log_contains(
+        caplog.records,
+        message="is owned by another user",
+        level=logging.WARNING,
+        count=1,
+    )
+
+
+@pytest.mark.parametrize("subdir", ["biblio-global"])
+def test_shared_cache_build(caplog, tmp_path, build_pelican):
+    from pelican.plugins.pybtex import utils
+
+    for name in ("first", "second"):
+        # simulates separate processes, that do not share the process cache
+        utils.process_cache.clear()
+        build_pelican(
+            OUTPUT_PATH=tmp_path / name,
+            CACHE_PATH=tmp_path / "cache" / name,
+            PYBTEX_SHARED_CACHE_PATH=tmp_path / "shared",
+        )
+
+        with (tmp_path / name / "article.html").open() as f:
+            soup = BeautifulSoup(f, "html.parser")
+        assert len(soup.find_all("div", id="pybtex")) == 1
+
+    _assert_log_contains(
+        caplog.records,
+        message="Published shared `pybtex` cache",
+        level=logging.DEBUG,
+        count=2,
+    )
+    _assert_log_contains(
+        caplog.records,
+        message="Loading shared `pybtex` cache",
+        level=logging.DEBUG,
+        count=2,
+    )